@@ -0,0 +1 @@
+# Micro-benchmarks for Lake Merritt (run from corpbot_agent_evals/lake_merritt)
@@ -0,0 +1,127 @@
+"""
+Benchmark: per-item allocation and CPU of the evaluation item representation.
+
+Compares the Pydantic path the engine used to take (a validated
+EvaluationItem per span, plus a model_copy per pack) with PreparedItem, the
+slotted dataclass used while preparing and scoring, which EvaluationBatch
+holds as-is until it is serialized. Items carry the same fields and metadata
+as span items built by extract_items_from_trace.
+
+Each phase is run on its own so the columns show what it costs per item:
+build (one item per span), copy (a fresh unscored copy for a pack) and
+report (EvaluationBatch plus model_dump, as written to the JSON report). The
+run line adds them up for one trace evaluated by --packs packs: build once,
+copy and report per pack.
+
+Usage (from corpbot_agent_evals/lake_merritt):
+    python -m benchmarks.bench_items                  # 10k and 100k items
+    python -m benchmarks.bench_items --items 50000 --packs 3 --repeat 5
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Tuple
+
+from core.data_models import EvaluationBatch, EvaluationItem, PreparedItem
+
+SHARED_METADATA = {
+    'breaker_review': 'FAILURE SCENARIO 1: empty input crashes the tokenizer',
+    'change_log': 'Change Log v1.1\n- Fixed empty input handling',
+    'reviewer_suggestions': '',
+}
+
+
+def make_fields(count: int) -> List[Dict]:
+    """Keyword arguments for `count` span items, shaped like extract_items_from_trace output."""
+    return [{
+        'id': f"span_{i}",
+        'input': f"[CC] Turn {i}: drafted section {i % 17} and ran the tests.",
+        'metadata': {
+            'span_name': 'drafter.turn',
+            'span_id': f"{i:016x}",
+            'trace_id': 'bench-trace',
+            'attributes': {'agent': 'drafter', 'content': f"Turn {i}", 'turn': i},
+            **SHARED_METADATA,
+        },
+    } for i in range(count)]
+
+
+def pydantic_build(fields):
+    return [EvaluationItem(**kwargs) for kwargs in fields]
+
+
+def pydantic_copy(items):
+    # What PreparedTrace.items_for did per pack before PreparedItem
+    return [item.model_copy(update={'metadata': dict(item.metadata), 'scores': []})
+            for item in items]
+
+
+def prepared_build(fields):
+    return [PreparedItem(**kwargs) for kwargs in fields]
+
+
+def prepared_copy(items):
+    return [item.fresh_copy() for item in items]
+
+
+def report(items):
+    return EvaluationBatch(eval_pack='bench', items=items).model_dump()
+
+
+def measure(func: Callable, arg, count: int, repeat: int) -> Tuple[float, float]:
+    """Best-of-repeat CPU microseconds and allocated bytes per item for func(arg)."""
+    best_cpu = float('inf')
+    for _ in range(repeat):
+        gc.collect()
+        start = time.process_time()
+        result = func(arg)
+        best_cpu = min(best_cpu, time.process_time() - start)
+        del result
+
+    gc.collect()
+    tracemalloc.start()
+    result = func(arg)
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return best_cpu / count * 1e6, allocated / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--items', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--packs', type=int, default=7,
+                        help='Packs per trace for the run totals (default: the 7 example packs)')
+    parser.add_argument('--repeat', type=int, default=3, help='CPU timing runs (best is kept)')
+    args = parser.parse_args()
+
+    print(f"{'items':>7}  {'path':>9}  {'phase':>7}  {'cpu/item':>9}  {'bytes/item':>10}")
+    for count in args.items:
+        fields = make_fields(count)
+        models = pydantic_build(fields)
+        prepared = prepared_build(fields)
+        phases = [
+            ('pydantic', 'build', pydantic_build, fields),
+            ('pydantic', 'copy', pydantic_copy, models),
+            ('pydantic', 'report', report, models),
+            ('prepared', 'build', prepared_build, fields),
+            ('prepared', 'copy', prepared_copy, prepared),
+            ('prepared', 'report', report, prepared),
+        ]
+        totals = {'pydantic': [0.0, 0.0], 'prepared': [0.0, 0.0]}
+        for path, phase, func, arg in phases:
+            cpu, allocated = measure(func, arg, count, args.repeat)
+            runs = 1 if phase == 'build' else args.packs
+            totals[path][0] += cpu * runs
+            totals[path][1] += allocated * runs
+            print(f"{count:>7}  {path:>9}  {phase:>7}  {cpu:7.2f}us  {allocated:10.0f}")
+        for path, (cpu, allocated) in totals.items():
+            print(f"{count:>7}  {path:>9}  {'run':>7}  {cpu:7.2f}us  {allocated:10.0f}")
+        speedup = totals['pydantic'][0] / totals['prepared'][0] if totals['prepared'][0] else 0
+        print(f"{count:>7}  prepared path: {speedup:.1f}x less CPU per item over {args.packs} packs\n")
+
+
+if __name__ == '__main__':
+    main()
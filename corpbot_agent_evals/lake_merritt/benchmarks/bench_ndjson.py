@@ -0,0 +1,101 @@
+"""
+Benchmark: ndjson / concatenated JSON parsing in GenericOtelIngester.
+
+Compares GenericOtelIngester._parse_json_input with the slicing loop it
+replaced, which copied the rest of the input for every decoded object and so
+grew quadratically with file size. Each input holds one OTLP export object per
+span, written either one per line (ndjson) or pretty-printed back to back
+(which skips the line-delimited fast path). The per-span column should stay
+flat as the span count grows.
+
+Usage (from corpbot_agent_evals/lake_merritt):
+    python -m benchmarks.bench_ndjson                      # 10k to 100k spans, legacy up to 10k
+    python -m benchmarks.bench_ndjson --spans 100000 --legacy-max-spans 20000
+"""
+
+import argparse
+import json
+import time
+from typing import List
+
+from core.ingestion.generic_otel_ingester import GenericOtelIngester
+
+
+def legacy_parse(content: str) -> List:
+    """The pre-fix ndjson loop, kept here as the baseline."""
+    content = content.strip()
+    objects = []
+    decoder = json.JSONDecoder()
+    pos = 0
+    while pos < len(content):
+        obj, end_pos = decoder.raw_decode(content[pos:])
+        objects.append(obj)
+        pos += end_pos
+        while pos < len(content) and content[pos].isspace():
+            pos += 1
+    return objects
+
+
+def make_export(i: int) -> dict:
+    """One OTLP export object carrying a single span."""
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": "bench"}}]},
+            "scopeSpans": [{
+                "scope": {"name": "bench"},
+                "spans": [{
+                    "traceId": f"trace-{i // 100}",
+                    "spanId": f"span-{i}",
+                    "name": "agent.turn",
+                    "startTimeUnixNano": str(1700000000000000000 + i),
+                    "attributes": [
+                        {"key": "agent", "value": {"stringValue": "drafter"}},
+                        {"key": "content", "value": {"stringValue": f"Turn {i}: drafted section {i % 17}"}},
+                    ],
+                }],
+            }],
+        }]
+    }
+
+
+def make_input(span_count: int, layout: str) -> str:
+    if layout == 'ndjson':
+        return '\n'.join(json.dumps(make_export(i)) for i in range(span_count))
+    return ''.join(json.dumps(make_export(i), indent=1) for i in range(span_count))
+
+
+def time_call(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--spans', type=int, nargs='+', default=[10000, 25000, 50000, 100000])
+    parser.add_argument('--legacy-max-spans', type=int, default=10000,
+                        help='Skip the legacy loop above this span count (it is quadratic)')
+    args = parser.parse_args()
+
+    ingester = GenericOtelIngester()
+    print(f"{'layout':>13}  {'spans':>7}  {'size':>8}  {'parse':>9}  {'per span':>9}  {'legacy':>9}  match")
+    for layout in ('ndjson', 'concatenated'):
+        for span_count in args.spans:
+            content = make_input(span_count, layout)
+            parse_time, parsed = time_call(ingester._parse_json_input, content)
+            per_span = f"{parse_time / span_count * 1e6:7.2f}us"
+
+            if span_count <= args.legacy_max_spans:
+                legacy_time, legacy = time_call(legacy_parse, content)
+                legacy_col = f"{legacy_time:8.3f}s"
+                match = 'yes' if parsed == legacy else 'NO'
+            else:
+                legacy_col, match = 'skipped', '-'
+
+            size_mb = len(content) / (1024 * 1024)
+            print(f"{layout:>13}  {span_count:>7}  {size_mb:6.1f}MB  {parse_time:8.3f}s  "
+                  f"{per_span:>9}  {legacy_col:>9}  {match}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""
+Benchmark: section extraction on large agent transcripts.
+
+Compares the linear section scanner (core.sections) with the regexes it
+replaced, on synthetic transcripts shaped like joined span content: paragraphs
+separated by single blank lines, with Breaker and Change Log headers sprinkled
+through and no trailing newline. That shape makes every legacy pattern scan to
+the end of the document for every header.
+
+Usage (from corpbot_agent_evals/lake_merritt):
+    python -m benchmarks.bench_sections                 # 10 MB scanner, legacy up to 1 MB
+    python -m benchmarks.bench_sections --sizes-mb 1 10 --legacy-max-mb 2
+"""
+
+import argparse
+import random
+import re
+import time
+from typing import List
+
+from core.sections import extract_sections
+
+# The pre-scanner patterns, kept here as the baseline
+LEGACY_BREAKER_PATTERNS = [
+    r'(?:FAILURE SCENARIO|FAILURE|Failure scenario)[^\n]*\n((?:.*?\n)*?)(?=\n\n|\Z)',
+    r'(?:BREAKER|Breaker)[^\n]*\n((?:.*?\n)*?)(?=\n\n|\Z)',
+    r'(?:\[Codex\].*?BREAKER.*?\n)((?:.*?\n)*?)(?=---|\Z)',
+    r'(?:REQUEST.?CHANGES|Request Changes)[^\n]*\n((?:.*?\n)*?)(?=\n\n|\Z)',
+]
+LEGACY_CHANGE_LOG_PATTERNS = [
+    r'(?:Change Log|CHANGE LOG|Changelog)[^\n]*\n((?:.*?\n)*?)(?=\n\n|\Z)',
+    r'(?:v\d+\.\d+.*?(?:FIXED|Fixed|Addressed|DONE).*?\n)((?:.*?\n)*?)(?=\n\n|\Z)',
+    r'(?:Revision|REVISION)[^\n]*\n((?:.*?\n)*?)(?=\n\n|\Z)',
+    r'(?:Issues? (?:fixed|addressed|resolved))[^\n]*\n((?:.*?\n)*?)(?=\n\n|\Z)',
+]
+
+PARAGRAPHS = [
+    "[CC] Drafting the parser module.\nAdded tokenizer and grammar tables.\nRunning tests now.",
+    "[Gemini] Reviewed the draft.\n1. Add error handling for empty input\n2. Document the grammar",
+    "BREAKER REVIEW\nFAILURE SCENARIO 1: empty input crashes the tokenizer\nFAILURE SCENARIO 2: unicode escapes",
+    "Change Log v1.1\n- Fixed empty input handling\n- Declined unicode escapes (out of scope)",
+    "$ npm test\n  42 passing (1s)\n  0 failing",
+    "[Codex] Looking at the diff again, nothing else to add.",
+]
+
+
+def make_transcript(size_bytes: int, seed: int = 7) -> str:
+    """Build a deterministic transcript of roughly size_bytes characters."""
+    rng = random.Random(seed)
+    parts: List[str] = []
+    total = 0
+    while total < size_bytes:
+        paragraph = rng.choice(PARAGRAPHS)
+        parts.append(paragraph)
+        total += len(paragraph) + 2
+    return '\n\n'.join(parts)
+
+
+def legacy_extract(content: str):
+    """Run the replaced regexes exactly as evaluation.py used to."""
+    reviews, logs = [], []
+    for pattern in LEGACY_BREAKER_PATTERNS:
+        reviews.extend(re.findall(pattern, content, re.IGNORECASE | re.MULTILINE))
+    for pattern in LEGACY_CHANGE_LOG_PATTERNS:
+        logs.extend(re.findall(pattern, content, re.IGNORECASE | re.MULTILINE))
+    return reviews, logs
+
+
+def time_call(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--sizes-mb', type=float, nargs='+', default=[0.25, 0.5, 1, 10])
+    parser.add_argument('--legacy-max-mb', type=float, default=1.0,
+                        help='Skip the legacy regexes above this size (they are quadratic)')
+    args = parser.parse_args()
+
+    print(f"{'size':>8}  {'scanner':>10}  {'legacy':>10}  {'speedup':>8}  match")
+    for size_mb in args.sizes_mb:
+        content = make_transcript(int(size_mb * 1024 * 1024))
+        scan_time, scanned = time_call(extract_sections, content)
+
+        if size_mb <= args.legacy_max_mb:
+            legacy_time, legacy = time_call(legacy_extract, content)
+            speedup = f"{legacy_time / scan_time:7.0f}x"
+            legacy_col = f"{legacy_time:9.3f}s"
+            match = 'yes' if tuple(scanned) == legacy else 'NO'
+        else:
+            speedup, legacy_col, match = '-', 'skipped', '-'
+
+        print(f"{size_mb:6.2f}MB  {scan_time:9.3f}s  {legacy_col:>10}  {speedup:>8}  {match}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,290 @@
+"""
+Benchmark suite: ingestion and evaluation hot paths on synthetic inputs,
+checked against a stored baseline.
+
+Every case runs on files from benchmarks.synthetic (deterministic, so runs
+are comparable) at each --records scale and reports the best-of-repeat wall
+time per record:
+
+    ingest_otlp      GenericOtelIngester.ingest on an OTLP/JSON trace file
+    load_trace       load_trace_index (streamed parse into a SpanIndex)
+    ingest_cast      CastIngester.ingest on an asciicast v2 recording
+    cast_patterns    CastIngester.find_patterns streamed from the recording file
+    ingest_cc_jsonl  CCJSONLIngester.ingest on a Claude Code transcript
+    ingest_ag        AGTelemetryIngester.ingest on an AG telemetry log
+    extract_items    extract_items_from_trace, one item per span
+    trace_item       create_trace_level_item, the whole-trace item
+    redaction        RedactionEngine.redact on every span's content, unmemoized
+    render           judge template render of the whole trace (courier_usage pack)
+
+Times are divided by a fixed calibration workload timed in the same run, so
+a baseline saved on one machine can be checked on another. --check exits
+with status 1 if any case is more than --threshold slower than the baseline
+at the same scale. Nothing touches the network: the judge is only used to
+render templates.
+
+Usage (from corpbot_agent_evals/lake_merritt):
+    python -m benchmarks.bench_suite --check               # 1k and 10k records vs baseline.json
+    python -m benchmarks.bench_suite --records 1000000 --cases ingest_cast load_trace
+    python -m benchmarks.bench_suite --save-baseline       # after an intended change
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks import synthetic
+
+DEFAULT_BASELINE = Path(__file__).with_name('baseline.json')
+DEFAULT_RECORDS = [1000, 10000]
+DEFAULT_THRESHOLD = 0.5  # 50% slower than baseline (per record, calibrated) fails --check
+CALIBRATION_ROUNDS = 5000
+MIN_TIMING_SECONDS = 0.5  # Small scales repeat until they have run at least this long
+MAX_REPEAT = 50
+EVAL_PACK_DIR = Path(__file__).parents[1] / 'examples' / 'eval_packs'
+
+
+@dataclass
+class Case:
+    name: str
+    input_format: str  # synthetic.WRITERS key of the file the case reads
+    # (input path, records) -> the zero-argument call to time
+    setup: Callable[[Path, int], Callable[[], Any]]
+
+
+def _ingest_otlp(path, records):
+    from core.ingestion.generic_otel_ingester import GenericOtelIngester
+    ingester = GenericOtelIngester()
+    config = {'input_field': 'attributes.content', 'output_field': 'attributes.content'}
+    return lambda: ingester.ingest(path, config)
+
+
+def _load_trace(path, records):
+    from core.evaluation import load_trace_index
+    return lambda: load_trace_index(path)
+
+
+def _ingest_cast(path, records):
+    from core.ingestion.cast_ingester import CastIngester
+    return lambda: CastIngester().ingest(path)
+
+
+def _cast_patterns(path, records):
+    from core.ingestion.cast_ingester import CastIngester
+    return lambda: CastIngester().find_patterns(path, list(synthetic.SPINNER))
+
+
+def _ingest_cc_jsonl(path, records):
+    from core.ingestion.cc_jsonl_ingester import CCJSONLIngester
+    return lambda: CCJSONLIngester().ingest(path)
+
+
+def _ingest_ag(path, records):
+    from core.ingestion.ag_telemetry_ingester import AGTelemetryIngester
+    return lambda: AGTelemetryIngester().ingest(path)
+
+
+def _extract_items(path, records):
+    from core.eval_pack.loader import EvalPack, IngestionConfig
+    from core.evaluation import extract_items_from_trace, load_trace_index
+    from core.redaction import default_engine
+
+    index = load_trace_index(path)
+    pack = EvalPack(name='bench', description='', version='1.0',
+                    ingestion=IngestionConfig(type='generic_otel',
+                                              config={'evaluation_mode': 'span'}),
+                    pipeline=[])
+
+    def run():
+        default_engine.clear()  # Every repeat redacts from scratch
+        return extract_items_from_trace(index, pack)
+    return run
+
+
+def _trace_item(path, records):
+    from core.evaluation import create_trace_level_item, load_trace_index
+    from core.redaction import default_engine
+
+    index = load_trace_index(path)
+
+    def run():
+        default_engine.clear()
+        return create_trace_level_item(index)
+    return run
+
+
+def _redaction(path, records):
+    from core.evaluation import load_trace_index
+    from core.redaction import RedactionEngine
+
+    contents = [attrs.get('content', '') for attrs in load_trace_index(path).attributes]
+    engine = RedactionEngine(cache_size=0)
+    return lambda: [engine.redact(content) for content in contents]
+
+
+def _render(path, records):
+    import yaml
+    from core.evaluation import create_trace_level_item, load_trace_index
+    from core.scoring.llm_judge import LLMJudgeScorer
+
+    # The judge client is built but never called
+    os.environ.setdefault('OPENAI_API_KEY', 'sk-offline-benchmark')
+    scorer = LLMJudgeScorer()
+    with open(EVAL_PACK_DIR / 'courier_usage.yaml') as f:
+        template = yaml.safe_load(f)['pipeline'][0]['config']['user_prompt_template']
+    item = create_trace_level_item(load_trace_index(path))
+    return lambda: scorer._render_template(template, item)
+
+
+CASES = [
+    Case('ingest_otlp', 'otlp', _ingest_otlp),
+    Case('load_trace', 'otlp', _load_trace),
+    Case('ingest_cast', 'cast', _ingest_cast),
+    Case('cast_patterns', 'cast', _cast_patterns),
+    Case('ingest_cc_jsonl', 'cc_jsonl', _ingest_cc_jsonl),
+    Case('ingest_ag', 'ag_telemetry', _ingest_ag),
+    Case('extract_items', 'otlp', _extract_items),
+    Case('trace_item', 'otlp', _trace_item),
+    Case('redaction', 'otlp', _redaction),
+    Case('render', 'otlp', _render),
+]
+
+
+def calibrate(repeat: int = 5) -> float:
+    """Best-of-repeat seconds for a fixed parse-and-walk workload, as the machine's yardstick."""
+    payload = json.dumps({'name': 'drafter.turn', 'values': list(range(40)),
+                          'content': 'Drafted the parser and ran the tests. ' * 8})
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(CALIBRATION_ROUNDS):
+            data = json.loads(payload)
+            sum(data['values'])
+            data['content'].lower().count('tests')
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def time_case(run: Callable[[], Any], repeat: int) -> float:
+    """Best time of at least `repeat` runs, repeating short cases for MIN_TIMING_SECONDS."""
+    best, elapsed, runs = float('inf'), 0.0, 0
+    while runs < repeat or (elapsed < MIN_TIMING_SECONDS and runs < MAX_REPEAT):
+        start = time.perf_counter()
+        result = run()
+        seconds = time.perf_counter() - start
+        del result
+        best, elapsed, runs = min(best, seconds), elapsed + seconds, runs + 1
+    return best
+
+
+def run_suite(records: List[int], cases: List[Case], repeat: int = 3, seed: int = 0,
+              calibration: Optional[List[float]] = None) -> Dict[str, Dict[str, float]]:
+    """
+    Seconds per record for each case and scale: {case: {str(records): seconds}}.
+
+    If a `calibration` list is given, the calibration workload is timed again
+    after every case and appended to it, so that min(calibration) reflects the
+    machine's speed over the whole run rather than at its start.
+    """
+    results: Dict[str, Dict[str, float]] = {case.name: {} for case in cases}
+    with tempfile.TemporaryDirectory(prefix='lake_merritt_bench_') as workdir:
+        for count in records:
+            paths = {}
+            for case in cases:
+                if case.input_format not in paths:
+                    path = Path(workdir) / f"{case.input_format}_{count}"
+                    paths[case.input_format] = synthetic.WRITERS[case.input_format](path, count, seed)
+                run = case.setup(paths[case.input_format], count)
+                results[case.name][str(count)] = time_case(run, repeat) / count
+                if calibration is not None:
+                    calibration.append(calibrate(repeat=1))
+            for path in paths.values():
+                path.unlink()
+    return results
+
+
+def compare(results: Dict[str, Dict[str, float]], calibration: float,
+            baseline: Dict[str, Any]) -> Dict[str, Dict[str, Optional[float]]]:
+    """
+    Calibrated ratio of each result to the baseline (None where the baseline
+    has no entry); ratios above 1 + threshold are regressions.
+    """
+    scale = baseline['calibration_seconds'] / calibration
+    ratios: Dict[str, Dict[str, Optional[float]]] = {}
+    for name, by_count in results.items():
+        ratios[name] = {}
+        for count, seconds in by_count.items():
+            base = baseline.get('results', {}).get(name, {}).get(count)
+            ratios[name][count] = seconds * scale / base if base else None
+    return ratios
+
+
+def regressions(ratios: Dict[str, Dict[str, Optional[float]]], threshold: float) -> List[str]:
+    return [f"{name}@{count}" for name, by_count in ratios.items()
+            for count, ratio in by_count.items() if ratio is not None and ratio > 1 + threshold]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--records', type=int, nargs='+', default=DEFAULT_RECORDS,
+                        help='Scales to run (spans, frames or entries per input file)')
+    parser.add_argument('--cases', nargs='+', choices=[case.name for case in CASES],
+                        help='Cases to run (default: all)')
+    parser.add_argument('--repeat', type=int, default=3, help='Timing runs per case (best is kept)')
+    parser.add_argument('--baseline', type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='Allowed slowdown vs baseline before --check fails (0.5 = 50%%)')
+    parser.add_argument('--check', action='store_true', help='Exit 1 on a regression')
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='Write these results as the baseline (merged into an existing one)')
+    args = parser.parse_args()
+
+    cases = [case for case in CASES if not args.cases or case.name in args.cases]
+    calibrations = [calibrate()]
+    results = run_suite(args.records, cases, args.repeat, calibration=calibrations)
+    calibration = min(calibrations)
+
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else None
+    ratios = compare(results, calibration, baseline) if baseline else {}
+
+    print(f"calibration: {calibration * 1000:.1f}ms"
+          + (f" (baseline {baseline['calibration_seconds'] * 1000:.1f}ms)" if baseline else ''))
+    print(f"{'case':>16}  {'records':>8}  {'total':>9}  {'per record':>10}  {'vs baseline':>11}")
+    for name, by_count in results.items():
+        for count, seconds in by_count.items():
+            ratio = ratios.get(name, {}).get(count)
+            flag = '' if ratio is None or ratio <= 1 + args.threshold else '  REGRESSION'
+            print(f"{name:>16}  {count:>8}  {seconds * int(count):8.3f}s  {seconds * 1e6:8.2f}us  "
+                  f"{f'{ratio:.2f}x' if ratio is not None else '-':>11}{flag}")
+
+    if args.save_baseline:
+        saved = baseline or {'calibration_seconds': calibration, 'results': {}}
+        # Merged results are stored in the existing baseline's calibration units
+        scale = saved['calibration_seconds'] / calibration
+        saved['python'] = platform.python_version()
+        for name, by_count in results.items():
+            saved['results'].setdefault(name, {}).update(
+                {count: seconds * scale for count, seconds in by_count.items()})
+        args.baseline.write_text(json.dumps(saved, indent=2, sort_keys=True) + '\n')
+        print(f"\nBaseline written to {args.baseline}")
+
+    if args.check:
+        if baseline is None:
+            print(f"\nNo baseline at {args.baseline}; run with --save-baseline first")
+            sys.exit(2)
+        failed = regressions(ratios, args.threshold)
+        if failed:
+            print(f"\n{len(failed)} regression(s) over {args.threshold:.0%}: {', '.join(failed)}")
+            sys.exit(1)
+        print(f"\nNo regressions over {args.threshold:.0%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,221 @@
+"""
+Synthetic inputs for the benchmarks: deterministic generators for the four
+formats Lake Merritt ingests, at any scale.
+
+- OTLP/JSON skill traces: one trace of drafter / reviewer / breaker turns,
+  with breaker reviews, change logs and the odd secret for redaction to find
+- asciicast v2 recordings: output frames with spinner states and some input
+- Claude Code JSONL transcripts: user / assistant messages, tool use blocks
+  and token usage entries
+- AG telemetry logs: API requests and responses with thought token counts,
+  and tool calls
+
+The same (count, seed) always gives byte-identical output. Records are
+written as they are generated, so files of a million records need no more
+memory than one record.
+
+Usage (from corpbot_agent_evals/lake_merritt):
+    python -m benchmarks.synthetic otlp 100000 /tmp/trace.json
+    python -m benchmarks.synthetic cast 1000000 /tmp/session.cast --seed 7
+"""
+
+import argparse
+import json
+import random
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Union
+
+START_UNIX_NANO = 1705700000000000000
+START_UNIX = START_UNIX_NANO // 10**9
+
+AGENTS = ('drafter', 'reviewer', 'breaker')
+WORDS = ('parser', 'tokenizer', 'grammar', 'schema', 'tests', 'fixture', 'retry', 'cache',
+         'handler', 'report', 'budget', 'template', 'span', 'trace', 'config', 'docs')
+SECRETS = ('api_key = sk-{:024d}', 'password: hunter{}', 'token=ghp_{:020d}abcdef')
+SPINNER = ('Thinking...', 'Channelling...', 'Reading files...', 'Running tests...')
+TOOLS = ('Read', 'Edit', 'Bash', 'Grep', 'Write')
+
+
+def _sentence(rng: random.Random, words: int = 8) -> str:
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize() + '.'
+
+
+def span_content(rng: random.Random, i: int, agent: str) -> str:
+    """Turn text shaped like real span content for the given agent."""
+    lines = [f"[{agent}] Turn {i}: {_sentence(rng)}"]
+    if agent == 'breaker' and rng.random() < 0.5:
+        lines.append("BREAKER REVIEW")
+        lines += [f"FAILURE SCENARIO {n}: {_sentence(rng, 6)}" for n in range(1, rng.randint(2, 4))]
+    elif agent == 'drafter' and rng.random() < 0.3:
+        lines.append(f"Change Log v1.{i}")
+        lines += [f"- Fixed {_sentence(rng, 4)}" for _ in range(rng.randint(1, 3))]
+    elif agent == 'reviewer':
+        lines.append("APPROVE with suggestions:" if rng.random() < 0.7 else "REQUEST CHANGES:")
+        lines += [f"{n}. {_sentence(rng, 5)}" for n in range(1, rng.randint(2, 4))]
+    lines += [_sentence(rng, rng.randint(6, 14)) for _ in range(rng.randint(1, 4))]
+    if rng.random() < 0.02:
+        lines.append(rng.choice(SECRETS).format(i))
+    return '\n'.join(lines) + '\n\n'
+
+
+def _attr(key: str, value) -> Dict:
+    if isinstance(value, bool):
+        return {'key': key, 'value': {'boolValue': value}}
+    if isinstance(value, int):
+        return {'key': key, 'value': {'intValue': str(value)}}
+    return {'key': key, 'value': {'stringValue': value}}
+
+
+def otlp_resource() -> Dict:
+    return {'attributes': [
+        _attr('service.name', 'skill-run'),
+        _attr('metadata.user_prompt', 'Write a parser with tests'),
+        _attr('metadata.all_approved', True),
+    ]}
+
+
+def otlp_spans(count: int, seed: int = 0) -> Iterator[Dict]:
+    """`count` OTLP spans of one skill trace, in start-time order."""
+    rng = random.Random(seed)
+    for i in range(count):
+        agent = AGENTS[i % 3] if rng.random() < 0.8 else rng.choice(AGENTS)
+        start = START_UNIX_NANO + i * 1_000_000_000
+        span = {
+            'traceId': f"{seed:032x}",
+            'spanId': f"{i + 1:016x}",
+            'name': f"{agent}.turn",
+            'startTimeUnixNano': str(start),
+            'endTimeUnixNano': str(start + rng.randint(50, 900) * 1_000_000),
+            'attributes': [
+                _attr('agent', agent),
+                _attr('content', span_content(rng, i, agent)),
+                _attr('turn', i),
+            ],
+        }
+        if i % 3:
+            # Reviewer and breaker turns hang off the drafter turn that opened the round
+            span['parentSpanId'] = f"{i - i % 3 + 1:016x}"
+        yield span
+
+
+def otlp_trace(count: int, seed: int = 0) -> Dict:
+    """The trace as one in-memory OTLP/JSON export."""
+    return {'resourceSpans': [{
+        'resource': otlp_resource(),
+        'scopeSpans': [{'scope': {'name': 'interlateral'}, 'spans': list(otlp_spans(count, seed))}],
+    }]}
+
+
+def write_otlp(path: Union[str, Path], count: int, seed: int = 0) -> Path:
+    """Write the trace as a single OTLP/JSON export object, span by span."""
+    head = json.dumps({'resourceSpans': [{
+        'resource': otlp_resource(), 'scopeSpans': [{'scope': {'name': 'interlateral'}, 'spans': []}],
+    }]})
+    prefix, suffix = head.split('[]', 1)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(prefix + '[')
+        for i, span in enumerate(otlp_spans(count, seed)):
+            f.write((',' if i else '') + json.dumps(span))
+        f.write(']' + suffix)
+    return Path(path)
+
+
+def cast_events(count: int, seed: int = 0) -> Iterator[List]:
+    """`count` asciicast v2 events: mostly output, some spinner states and keystrokes."""
+    rng = random.Random(seed)
+    ts = 0.0
+    for _ in range(count):
+        ts += rng.expovariate(20.0)
+        roll = rng.random()
+        if roll < 0.05:
+            yield [round(ts, 6), 'i', rng.choice('abcdefghij\r')]
+        elif roll < 0.15:
+            yield [round(ts, 6), 'o', f"\r\x1b[2K{rng.choice(SPINNER)}"]
+        else:
+            yield [round(ts, 6), 'o', _sentence(rng, rng.randint(2, 12)) + '\r\n']
+
+
+def write_cast(path: Union[str, Path], count: int, seed: int = 0) -> Path:
+    header = {'version': 2, 'width': 120, 'height': 40, 'timestamp': START_UNIX,
+              'title': 'synthetic session', 'env': {'SHELL': '/bin/bash', 'TERM': 'xterm-256color'}}
+    return _write_lines(path, header, cast_events(count, seed))
+
+
+def cc_entries(count: int, seed: int = 0) -> Iterator[Dict]:
+    """`count` Claude Code transcript entries."""
+    rng = random.Random(seed)
+    for i in range(count):
+        timestamp = f"2026-01-19T{10 + i // 3600 % 14:02d}:{i // 60 % 60:02d}:{i % 60:02d}Z"
+        roll = rng.random()
+        if roll < 0.1:
+            yield {'type': 'token_usage',
+                   'usage': {'input_tokens': rng.randint(100, 5000), 'output_tokens': rng.randint(10, 800)}}
+        elif roll < 0.4:
+            yield {'type': 'message', 'role': 'user', 'content': _sentence(rng, 10), 'timestamp': timestamp}
+        else:
+            content = [{'type': 'text', 'text': _sentence(rng, rng.randint(8, 30))}]
+            if rng.random() < 0.5:
+                content.append({'type': 'tool_use', 'name': rng.choice(TOOLS), 'id': f"toolu_{i:08d}",
+                                'input': {'file_path': f"/repo/src/{rng.choice(WORDS)}.py"}})
+            yield {'type': 'message', 'role': 'assistant', 'content': content, 'timestamp': timestamp}
+
+
+def write_cc_jsonl(path: Union[str, Path], count: int, seed: int = 0) -> Path:
+    return _write_lines(path, None, cc_entries(count, seed))
+
+
+def ag_entries(count: int, seed: int = 0) -> Iterator[Dict]:
+    """`count` AG telemetry events (timestamps in milliseconds)."""
+    rng = random.Random(seed)
+    for i in range(count):
+        timestamp = START_UNIX * 1000 + i * 250
+        roll = rng.random()
+        if roll < 0.3:
+            yield {'type': 'api_request', 'timestamp': timestamp, 'model': 'gemini-pro'}
+        elif roll < 0.7:
+            yield {'type': 'api_response', 'timestamp': timestamp,
+                   'thoughtsTokenCount': rng.randint(0, 400), 'inputTokenCount': rng.randint(100, 4000),
+                   'outputTokenCount': rng.randint(10, 600)}
+        else:
+            yield {'type': 'tool_call', 'timestamp': timestamp, 'tool_name': rng.choice(TOOLS).lower(),
+                   'arguments': {'path': f"/repo/src/{rng.choice(WORDS)}.py"},
+                   'duration_ms': rng.randint(1, 500)}
+
+
+def write_ag_telemetry(path: Union[str, Path], count: int, seed: int = 0) -> Path:
+    return _write_lines(path, None, ag_entries(count, seed))
+
+
+def _write_lines(path: Union[str, Path], header, records: Iterator) -> Path:
+    with open(path, 'w', encoding='utf-8') as f:
+        if header is not None:
+            f.write(json.dumps(header) + '\n')
+        for record in records:
+            f.write(json.dumps(record) + '\n')
+    return Path(path)
+
+
+# Format name -> writer(path, count, seed)
+WRITERS: Dict[str, Callable[..., Path]] = {
+    'otlp': write_otlp,
+    'cast': write_cast,
+    'cc_jsonl': write_cc_jsonl,
+    'ag_telemetry': write_ag_telemetry,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('format', choices=sorted(WRITERS))
+    parser.add_argument('count', type=int, help='Records to generate (spans, frames, entries)')
+    parser.add_argument('path', type=Path)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    WRITERS[args.format](args.path, args.count, args.seed)
+    print(f"{args.path}: {args.count} {args.format} records, "
+          f"{args.path.stat().st_size / (1024 * 1024):.1f}MB")
+
+
+if __name__ == '__main__':
+    main()
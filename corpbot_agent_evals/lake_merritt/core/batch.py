@@ -0,0 +1,366 @@
+"""
+Batch Evaluation
+Evaluates a directory of traces against one or more eval packs in a single run.
+
+Looping run-skill-eval.sh over .observability/traces/ pays a Python start, a
+dotenv load and an OpenAI client per trace. This runner instead:
+
+- finds OTLP traces under the given directories, skipping other JSON (reports,
+  caches, pack files) and the report directory itself;
+- parses and prepares traces on a process pool (--jobs), streaming each file;
+- scores every (trace, pack) pair on one shared judge thread pool, with one
+  scorer (and API client) per scorer type for the whole run;
+- reuses cached judge results for unchanged (trace, pack, stage) combinations
+  (see core.result_cache; --force re-judges, --no-cache disables);
+- writes reports to .observability/evals/{pack}_{trace}_{timestamp}.{jsonl,md}
+  as each pair finishes (a failure to write or report one pair is recorded
+  and the run goes on), then prints a throughput summary.
+
+Usage (from corpbot_agent_evals/lake_merritt):
+    python -m core.batch                                   # .observability/traces, all packs
+    python -m core.batch path/to/traces --packs revision_addressed approval_chain --jobs 4
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from contextlib import closing
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .data_models import EvaluationBatch, PreparedItem
+from .eval_pack.loader import load_eval_pack
+from .evaluation import DEFAULT_PACK_DIR, evaluate_pack, prepare_trace, shared_scorer_factory
+from .ingestion.otlp_stream import iter_otlp_spans
+from .result_cache import DEFAULT_CACHE_DIR, PackResultCache, ResultCache
+from .stats import ScoreStats
+
+OBSERVABILITY_DIR = Path(__file__).parents[3] / '.observability'
+DEFAULT_TRACE_DIR = OBSERVABILITY_DIR / 'traces'
+DEFAULT_EVALS_DIR = OBSERVABILITY_DIR / 'evals'
+
+# Trace files picked up when a directory is given
+TRACE_SUFFIXES = ('.json', '.ndjson')
+# Bytes of an unparseable file searched for "resourceSpans" (see is_otlp_trace)
+SNIFF_BYTES = 64 * 1024
+
+# Judge tasks in flight across all traces and packs
+DEFAULT_JUDGE_WORKERS = 8
+
+
+@dataclass
+class BatchSummary:
+    """Outcome and throughput of a batch run."""
+    traces: int = 0
+    evaluations: int = 0
+    items: int = 0
+    passed: int = 0
+    elapsed_seconds: float = 0.0
+    prepare_seconds: float = 0.0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    # Numeric scores of every evaluation, merged from each report's digest
+    scores: ScoreStats = field(default_factory=ScoreStats)
+    reports: List[Path] = field(default_factory=list)
+    failures: List[Tuple[str, str]] = field(default_factory=list)
+
+    @property
+    def traces_per_second(self) -> float:
+        return self.traces / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    @property
+    def items_per_second(self) -> float:
+        return self.items / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+
+def is_otlp_trace(path: Path) -> bool:
+    """
+    Whether a file holds an OTLP/JSON trace: its first streamed record (a span,
+    or a resource without spans) is read and the rest of the file is not.
+
+    A file that does not parse is kept only if its start names resourceSpans,
+    so a truncated trace export is still picked up and reported as a failure.
+    """
+    try:
+        with closing(iter_otlp_spans(path, empty_resources=True)) as records:
+            return next(records, None) is not None
+    except (ValueError, UnicodeDecodeError):
+        with open(path, 'rb') as f:
+            return b'"resourceSpans"' in f.read(SNIFF_BYTES)
+
+
+def discover_traces(paths: Sequence[Path], exclude: Sequence[Path] = ()) -> List[Path]:
+    """
+    Expand trace files and directories into a sorted list of trace files.
+
+    Directories are searched recursively for *.json / *.ndjson OTLP traces
+    (see is_otlp_trace), so both .observability/traces/ and a tree of run
+    bundles can be passed as-is. Files under an `exclude` directory (the
+    report and cache directories) are skipped. Files named explicitly are
+    always kept.
+    """
+    excluded = [Path(p).resolve() for p in exclude]
+
+    def wanted(p: Path) -> bool:
+        if not p.is_file() or p.suffix not in TRACE_SUFFIXES:
+            return False
+        resolved = p.resolve()
+        if any(resolved.is_relative_to(directory) for directory in excluded):
+            return False
+        return is_otlp_trace(p)
+
+    found = []
+    for path in paths:
+        path = Path(path)
+        if path.is_dir():
+            found.extend(p for p in sorted(path.rglob('*')) if wanted(p))
+        elif path.is_file():
+            found.append(path)
+        else:
+            raise FileNotFoundError(f"Trace file or directory not found: {path}")
+    # Keep first occurrence of files listed twice
+    return list(dict.fromkeys(found))
+
+
+def resolve_pack_paths(names: Sequence[str]) -> List[str]:
+    """Resolve pack names ('all', a name in examples/eval_packs, or a YAML path)."""
+    if not names or 'all' in names:
+        return [str(p) for p in sorted(DEFAULT_PACK_DIR.glob('*.yaml'))]
+
+    pack_paths = []
+    for name in names:
+        path = Path(name)
+        if not path.is_file():
+            path = DEFAULT_PACK_DIR / f"{name}.yaml"
+        if not path.is_file():
+            raise FileNotFoundError(f"Eval pack not found: {name}")
+        pack_paths.append(str(path))
+    return pack_paths
+
+
+# Packs loaded once per worker process
+_worker_packs: Dict[str, object] = {}
+
+
+def prepare_trace_items(trace_path: str, pack_paths: List[str],
+                        with_fingerprint: bool = False
+                        ) -> Tuple[Dict[str, List[PreparedItem]], Optional[str], float]:
+    """
+    Parse one trace and build its items for every pack (runs in a worker process).
+
+    Returns pack path -> items, the trace fingerprint (if requested) and the
+    time spent.
+    """
+    start = time.perf_counter()
+    prepared = prepare_trace(Path(trace_path))
+    pack_items = {}
+    for pack_path in pack_paths:
+        if pack_path not in _worker_packs:
+            _worker_packs[pack_path] = load_eval_pack(pack_path)
+        pack_items[pack_path] = prepared.items_for(_worker_packs[pack_path])
+    fingerprint = prepared.fingerprint if with_fingerprint else None
+    return pack_items, fingerprint, time.perf_counter() - start
+
+
+def write_reports(results: EvaluationBatch, output_dir: Path, pack_name: str,
+                  trace_name: str, timestamp: str) -> List[Path]:
+    """Write the JSON Lines and Markdown reports for one (trace, pack) pair."""
+    stem = f"{pack_name}_{trace_name}_{timestamp}"
+    jsonl_output = output_dir / f"{stem}.jsonl"
+    md_output = output_dir / f"{stem}.md"
+
+    results.write_jsonl(jsonl_output)
+    results.write_markdown(md_output)
+    return [jsonl_output, md_output]
+
+
+def run_batch(
+    trace_paths: Sequence[Path],
+    pack_paths: Sequence[str],
+    jobs: Optional[int] = None,
+    judge_workers: int = DEFAULT_JUDGE_WORKERS,
+    output_dir: Path = DEFAULT_EVALS_DIR,
+    timestamp: Optional[str] = None,
+    progress=None,
+    cache: Optional[ResultCache] = None,
+    force: bool = False
+) -> BatchSummary:
+    """
+    Evaluate every trace against every pack.
+
+    Args:
+        trace_paths: Trace files to evaluate
+        pack_paths: Eval pack YAML files
+        jobs: Worker processes for parsing/preparation (default: CPU count;
+              1 prepares traces in this process)
+        judge_workers: Threads scoring (trace, pack) pairs, shared by all traces
+        output_dir: Where reports are written
+        timestamp: Report filename suffix (default: now)
+        progress: Optional callback(trace_path, pack_path, results_or_None, error_or_None);
+                  an exception from it (or from writing a report) is recorded
+                  as a failure of that pair and the run continues
+        cache: Optional ResultCache; unchanged stages reuse their stored results
+        force: Re-judge cached stages and overwrite their entries
+
+    Returns:
+        BatchSummary with counts, report paths, failures and timings
+    """
+    start = time.perf_counter()
+    trace_paths = [Path(p) for p in trace_paths]
+    pack_paths = [str(p) for p in pack_paths]
+    packs = {path: load_eval_pack(path) for path in pack_paths}
+    timestamp = timestamp or datetime.now().strftime('%Y%m%d_%H%M%S')
+    jobs = jobs or os.cpu_count() or 1
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    summary = BatchSummary()
+    shared_scorer = shared_scorer_factory()
+
+    def report(trace_path, pack_path, results=None, error=None):
+        if error is not None:
+            summary.failures.append((f"{trace_path} [{Path(pack_path).stem}]" if pack_path
+                                     else str(trace_path), error))
+        else:
+            summary.evaluations += 1
+            summary.items += results.summary_stats.get('total_items', 0)
+            summary.passed += results.summary_stats.get('passed', 0)
+            cache_stats = results.summary_stats.get('cache', {})
+            summary.cache_hits += cache_stats.get('hits', 0)
+            summary.cache_misses += cache_stats.get('misses', 0)
+            score_state = results.summary_stats.get('scores', {}).get('state')
+            if score_state:
+                summary.scores.merge(ScoreStats.from_dict(score_state))
+            summary.reports.extend(write_reports(
+                results, output_dir, Path(pack_path).stem, trace_path.stem, timestamp))
+        if progress is not None:
+            progress(trace_path, pack_path, results, error)
+
+    def safe_report(trace_path, pack_path, results=None, error=None):
+        try:
+            report(trace_path, pack_path, results, error)
+        except Exception as e:
+            label = f"{trace_path} [{Path(pack_path).stem}]" if pack_path else str(trace_path)
+            message = f"report failed: {type(e).__name__}: {e}"
+            summary.failures.append((label, message))
+            print(f"WARNING: {label}: {message}", file=sys.stderr)
+
+    prepare_pool = ProcessPoolExecutor(max_workers=jobs) if jobs > 1 else None
+    judge_pool = ThreadPoolExecutor(max_workers=max(1, judge_workers),
+                                    thread_name_prefix='lake-merritt-judge')
+    try:
+        pending = {}
+        if prepare_pool is not None:
+            for trace_path in trace_paths:
+                future = prepare_pool.submit(prepare_trace_items, str(trace_path), pack_paths,
+                                             cache is not None)
+                pending[future] = ('prepare', trace_path, None)
+
+        def schedule(trace_path, pack_items, fingerprint, prepare_seconds):
+            summary.traces += 1
+            summary.prepare_seconds += prepare_seconds
+            for pack_path in pack_paths:
+                pack_cache = (PackResultCache(cache, fingerprint, pack_path, force)
+                              if cache is not None else None)
+                future = judge_pool.submit(evaluate_pack, packs[pack_path], pack_path,
+                                           pack_items[pack_path], shared_scorer, pack_cache)
+                pending[future] = ('evaluate', trace_path, pack_path)
+
+        if prepare_pool is None:
+            # Prepare in-process, one trace at a time, while earlier traces are scored
+            for trace_path in trace_paths:
+                try:
+                    schedule(trace_path, *prepare_trace_items(str(trace_path), pack_paths,
+                                                              cache is not None))
+                except Exception as e:
+                    safe_report(trace_path, None, error=f"{type(e).__name__}: {e}")
+
+        while pending:
+            done, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+            for future in done:
+                phase, trace_path, pack_path = pending.pop(future)
+                error = future.exception()
+                if error is not None:
+                    safe_report(trace_path, pack_path, error=f"{type(error).__name__}: {error}")
+                elif phase == 'prepare':
+                    schedule(trace_path, *future.result())
+                else:
+                    safe_report(trace_path, pack_path, results=future.result())
+    finally:
+        judge_pool.shutdown(wait=True)
+        if prepare_pool is not None:
+            prepare_pool.shutdown(wait=True)
+
+    summary.elapsed_seconds = time.perf_counter() - start
+    return summary
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('paths', nargs='*', type=Path, default=[DEFAULT_TRACE_DIR],
+                        help='Trace files or directories (default: .observability/traces)')
+    parser.add_argument('--packs', nargs='+', default=['all'],
+                        help="Eval pack names or YAML paths (default: all)")
+    parser.add_argument('--jobs', '-j', type=int, default=None,
+                        help='Processes for parsing traces (default: CPU count)')
+    parser.add_argument('--judge-workers', type=int, default=DEFAULT_JUDGE_WORKERS,
+                        help=f'Concurrent (trace, pack) evaluations (default: {DEFAULT_JUDGE_WORKERS})')
+    parser.add_argument('--output-dir', type=Path, default=DEFAULT_EVALS_DIR,
+                        help='Report directory (default: .observability/evals)')
+    parser.add_argument('--cache-dir', type=Path, default=DEFAULT_CACHE_DIR,
+                        help='Result cache directory (default: .observability/cache/results)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Judge every stage and do not read or write the result cache')
+    parser.add_argument('--force', action='store_true',
+                        help='Re-judge cached stages and overwrite their cache entries')
+    args = parser.parse_args(argv)
+
+    try:
+        trace_paths = discover_traces(args.paths, exclude=[args.output_dir, args.cache_dir])
+        pack_paths = resolve_pack_paths(args.packs)
+    except FileNotFoundError as e:
+        print(f"ERROR: {e}")
+        return 1
+    if not trace_paths:
+        print("No trace files found.")
+        return 1
+
+    print(f"=== Batch Evaluation: {len(trace_paths)} traces x {len(pack_paths)} packs ===")
+
+    def progress(trace_path, pack_path, results, error):
+        label = f"{trace_path.name} [{Path(pack_path).stem}]" if pack_path else trace_path.name
+        if error is not None:
+            print(f"  ERROR  {label}: {error}")
+        else:
+            stats = results.summary_stats
+            print(f"  {stats['status']:<8} {label}: "
+                  f"{stats['passed']}/{stats['total_items']} passed, score {stats['average_score']}")
+
+    cache = None if args.no_cache else ResultCache(args.cache_dir)
+    summary = run_batch(trace_paths, pack_paths, jobs=args.jobs,
+                        judge_workers=args.judge_workers, output_dir=args.output_dir,
+                        progress=progress, cache=cache, force=args.force)
+
+    print("")
+    print(f"Traces: {summary.traces}  Evaluations: {summary.evaluations}  "
+          f"Items: {summary.items} ({summary.passed} passed)  Failures: {len(summary.failures)}")
+    print(f"Elapsed: {summary.elapsed_seconds:.2f}s  "
+          f"(prepare {summary.prepare_seconds:.2f}s summed across workers)")
+    print(f"Throughput: {summary.traces_per_second:.2f} traces/s, "
+          f"{summary.items_per_second:.2f} items/s")
+    if summary.scores.count:
+        scores = summary.scores.summary()
+        print(f"Scores: mean {scores['mean']}  p50 {scores['p50']}  "
+              f"p90 {scores['p90']}  p99 {scores['p99']}  (n={scores['count']})")
+    if cache is not None:
+        print(f"Cache: {summary.cache_hits} stage hits, {summary.cache_misses} misses")
+    print(f"Reports: {args.output_dir}")
+    return 1 if summary.failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,13 +1,30 @@
 """
 Pydantic models for structured data exchange throughout the application.
 These models serve as the contract between all modules.
+
+The evaluation hot path works on PreparedItem, a slotted dataclass with the
+same fields as EvaluationItem: EvaluationBatch holds PreparedItems as they
+are and Pydantic only turns them into dicts when the batch is serialized.
 """
 
+from dataclasses import dataclass, field, replace
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from pathlib import Path
+from typing import IO, Annotated, Any, Dict, List, Optional, Union
+
+from pydantic import BaseModel, Field, PlainSerializer, model_validator, validator
 
-from pydantic import BaseModel, Field, validator
+from .reports import (
+    ITEM_RECORD, SUMMARY_RECORD, TRACE_CONTEXT_RECORD, JsonlReportWriter, MarkdownReportWriter,
+    iter_jsonl_records, markdown_header, markdown_item, markdown_summary
+)
+from .stats import ScoreStats
+from .trace_context import TraceContext, metadata_context, own_metadata
+
+# Item metadata serializes only the item's own values; shared trace context
+# is written once per batch (see core/trace_context.py)
+ItemMetadata = Annotated[Dict[str, Any], PlainSerializer(own_metadata)]
 
 
 class EvaluationMode(str, Enum):
@@ -26,12 +43,16 @@ class EvaluationItem(BaseModel):
     # FIX: 'expected_output' is now Optional to support the "Generate Expected Outputs" workflow,
     # where it does not exist at the time of ingestion.
     expected_output: Optional[str] = Field(None, description="The ideal/correct output")
-    metadata: Dict[str, Any] = Field(
+    metadata: ItemMetadata = Field(
         default_factory=dict, description="Additional metadata"
     )
     scores: List["ScorerResult"] = Field(
         default_factory=list, description="Scoring results"
     )
+    # Set on trace-level items, whose input is metadata['otel_trace'] serialized
+    # in this format; lets the judge re-serialize a compacted trace without
+    # comparing against a fresh serialization. Not written to reports.
+    input_serialization: Optional[str] = Field(None, exclude=True)
 
     @validator("input", "expected_output")
     def non_empty_strings(cls, v):
@@ -59,6 +80,48 @@ class ScorerResult(BaseModel):
     error: Optional[str] = None
     details: Dict[str, Any] = Field(default_factory=dict)
     raw_response: Dict[str, Any] = Field(default_factory=dict)  # v2.2: Store raw LLM response
+    # Judge call latency, retries and token usage (core/instrumentation.py)
+    timings: Dict[str, Any] = Field(default_factory=dict)
+
+
+@dataclass(slots=True, kw_only=True)
+class PreparedItem:
+    """
+    Unvalidated evaluation item used while traces are prepared and scored.
+
+    Unlike EvaluationItem nothing is validated, so builders must not produce
+    a blank `input`; to_model() gives the validated model. Scorers and
+    reports read the same attributes from either type.
+    """
+
+    id: Optional[str] = None
+    input: str
+    output: Optional[str] = None
+    expected_output: Optional[str] = None
+    metadata: ItemMetadata = field(default_factory=dict)
+    scores: List[ScorerResult] = field(default_factory=list)
+    input_serialization: Annotated[Optional[str], Field(exclude=True)] = None  # See EvaluationItem
+
+    def model_copy(self, update: Optional[Dict[str, Any]] = None) -> "PreparedItem":
+        """Shallow copy with fields replaced, like BaseModel.model_copy."""
+        return replace(self, **(update or {}))
+
+    def model_dump(self, **kwargs) -> Dict[str, Any]:
+        return self.to_model().model_dump(**kwargs)
+
+    def fresh_copy(self) -> "PreparedItem":
+        """Copy with its own metadata dict and no scores, for one pack to score."""
+        return PreparedItem(id=self.id, input=self.input, output=self.output,
+                            expected_output=self.expected_output,
+                            metadata=self.metadata.copy(), scores=[],
+                            input_serialization=self.input_serialization)
+
+    def to_model(self) -> EvaluationItem:
+        """The validated EvaluationItem for this item (scores are not re-validated)."""
+        return EvaluationItem(id=self.id, input=self.input, output=self.output,
+                              expected_output=self.expected_output,
+                              metadata=self.metadata, scores=self.scores,
+                              input_serialization=self.input_serialization)
 
 
 class LLMConfig(BaseModel):
@@ -102,6 +165,11 @@ class EvaluationConfig(BaseModel):
         use_enum_values = True
 
 
+# Scorers whose summary includes a score distribution over these bins
+DISTRIBUTION_SCORERS = ("fuzzy_match", "llm_judge")
+DISTRIBUTION_BINS = [0, 0.2, 0.4, 0.6, 0.8, 1.0]
+
+
 class EvaluationResults(BaseModel):
     """Complete results from an evaluation run."""
 
@@ -117,7 +185,7 @@ class EvaluationResults(BaseModel):
     )
 
     def calculate_summary_stats(self) -> None:
-        """Calculate summary statistics for all scorers."""
+        """Calculate summary statistics for all scorers in one streaming pass."""
         # Initialize stats dict
         scorer_stats = {}
 
@@ -126,7 +194,9 @@ class EvaluationResults(BaseModel):
             for score in item.scores:
                 if score.scorer_name not in scorer_stats:
                     scorer_stats[score.scorer_name] = {
-                        "scores": [],
+                        # Score distribution for certain scorers
+                        "scores": ScoreStats(bins=DISTRIBUTION_BINS if score.scorer_name
+                                             in DISTRIBUTION_SCORERS else None),
                         "passed": 0,
                         "failed": 0,
                         "errors": 0,
@@ -139,16 +209,17 @@ class EvaluationResults(BaseModel):
                 else:
                     scorer_stats[score.scorer_name]["failed"] += 1
 
-                # Only append numeric scores
+                # Only count numeric scores
                 if score.numeric_score is not None:
-                    scorer_stats[score.scorer_name]["scores"].append(score.numeric_score)
+                    scorer_stats[score.scorer_name]["scores"].add(score.numeric_score)
                 elif score.score_type == "float" and isinstance(score.score, (int, float)):
-                    scorer_stats[score.scorer_name]["scores"].append(float(score.score))
+                    scorer_stats[score.scorer_name]["scores"].add(float(score.score))
 
         # Calculate final statistics
         for scorer_name, stats in scorer_stats.items():
             total = stats["passed"] + stats["failed"] + stats["errors"]
             scores = stats["scores"]
+            summary = scores.summary()
 
             self.summary_stats[scorer_name] = {
                 "total": total,
@@ -156,20 +227,19 @@ class EvaluationResults(BaseModel):
                 "failed": stats["failed"],
                 "errors": stats["errors"],
                 "accuracy": stats["passed"] / total if total > 0 else 0,
-                "average_score": sum(scores) / len(scores) if scores else 0,
-                "min_score": min(scores) if scores else 0,
-                "max_score": max(scores) if scores else 0,
+                "average_score": scores.mean,
+                "min_score": summary["min"],
+                "max_score": summary["max"],
+                "p50_score": summary["p50"],
+                "p90_score": summary["p90"],
+                "p99_score": summary["p99"],
             }
 
-            # Add score distribution for certain scorers
-            if scorer_name in ["fuzzy_match", "llm_judge"] and scores:
-                import numpy as np
-
-                bins = [0, 0.2, 0.4, 0.6, 0.8, 1.0]
-                hist, _ = np.histogram(scores, bins=bins)
+            if scores.histogram is not None and scores.count:
+                bins = scores.bins
                 self.summary_stats[scorer_name]["score_distribution"] = {
-                    f"{bins[i]:.1f}-{bins[i+1]:.1f}": int(hist[i])
-                    for i in range(len(hist))
+                    f"{bins[i]:.1f}-{bins[i+1]:.1f}": count
+                    for i, count in enumerate(scores.histogram)
                 }
 
 
@@ -193,40 +263,96 @@ class EvaluationBatch(BaseModel):
     """Results from running an evaluation batch (v2.2 - for skill run evals)."""
 
     eval_pack: str
-    items: List[EvaluationItem]
+    # PreparedItems from the engine are kept as-is (no per-item model); reports
+    # read back from JSON validate as EvaluationItems
+    items: List[Union[EvaluationItem, PreparedItem]]
     summary_stats: Dict[str, Any] = Field(default_factory=dict)
+    # Metadata shared by the items (core/trace_context.py), written once;
+    # taken from the items' context when not given
+    trace_context: Dict[str, Any] = Field(default_factory=dict)
+
+    @model_validator(mode="after")
+    def share_trace_context(self):
+        """
+        Keep every item's shared metadata in what the batch serializes.
+
+        Items dump only their own metadata, so a batch built without
+        `trace_context` takes it from its items' context. Loaded items are
+        pointed back at the batch's context, and items backed by a different
+        context (another trace) keep its values as their own.
+        """
+        if not self.trace_context:
+            context = next((metadata_context(item.metadata) for item in self.items
+                            if metadata_context(item.metadata) is not None), None)
+            if context is not None:
+                self.trace_context = context.report_values()
+
+        shared = None
+        covered = {}  # id(context) -> whether trace_context holds its values
+        for item in self.items:
+            context = metadata_context(item.metadata)
+            if context is None:
+                if self.trace_context:
+                    shared = shared or TraceContext(self.trace_context)
+                    item.metadata = shared.metadata(item.metadata)
+                continue
+            if id(context) not in covered:
+                covered[id(context)] = context.report_values() == self.trace_context
+            if not covered[id(context)]:
+                item.metadata = dict(item.metadata)
+        return self
 
     def to_markdown(self) -> str:
         """Generate markdown report."""
-        lines = [
-            f"# Evaluation Report: {self.eval_pack}",
-            "",
-            "## Summary",
-            "",
-            f"- **Total Items:** {self.summary_stats.get('total_items', 0)}",
-            f"- **Passed:** {self.summary_stats.get('passed', 0)}",
-            f"- **Failed:** {self.summary_stats.get('failed', 0)}",
-            f"- **Average Score:** {self.summary_stats.get('average_score', 0):.2f}",
-            f"- **Status:** {self.summary_stats.get('status', 'UNKNOWN')}",
-            "",
-            "## Item Details",
-            ""
-        ]
-
+        lines = markdown_header(self.eval_pack) + markdown_summary(self.summary_stats)
+        lines += ["## Item Details", ""]
         for item in self.items:
-            lines.append(f"### {item.id}")
-            for score in item.scores:
-                score_val = score.numeric_score if score.numeric_score is not None else 'N/A'
-                lines.append(f"- **Score:** {score_val:.2f}" if isinstance(score_val, float) else f"- **Score:** {score_val}")
-                lines.append(f"- **Passed:** {'YES' if score.passed else 'NO'}")
-                reasoning = score.reasoning or 'No reasoning provided'
-                if len(reasoning) > 500:
-                    reasoning = reasoning[:500] + '...'
-                lines.append(f"- **Reasoning:** {reasoning}")
-            lines.append("")
+            lines.extend(markdown_item(item))
 
         return "\n".join(lines)
 
+    def write_jsonl(self, target: Union[str, Path, IO[str]]) -> None:
+        """Write a JSON Lines report (item lines, then a summary line) item by item."""
+        writer = JsonlReportWriter(target, self.eval_pack)
+        try:
+            for item in self.items:
+                writer.write_item(item)
+            writer.write_summary(self.summary_stats)
+        finally:
+            writer.close()
+
+    def write_markdown(self, target: Union[str, Path, IO[str]]) -> None:
+        """Write a Markdown report item by item (summary last, see core/reports.py)."""
+        writer = MarkdownReportWriter(target, self.eval_pack)
+        try:
+            for item in self.items:
+                writer.write_item(item)
+            writer.write_summary(self.summary_stats)
+        finally:
+            writer.close()
+
+    @classmethod
+    def from_jsonl(cls, path: Union[str, Path]) -> "EvaluationBatch":
+        """Read a JSON Lines report; one without a summary line has empty summary_stats."""
+        eval_pack, items, summary_stats, trace_context = "", [], {}, {}
+        context = None
+        for record in iter_jsonl_records(path):
+            kind = record.pop("record", None)
+            if kind == ITEM_RECORD:
+                item = EvaluationItem(**record)
+                if context is not None:
+                    item.metadata = context.metadata(item.metadata)
+                items.append(item)
+            elif kind == TRACE_CONTEXT_RECORD:
+                # Applies to the item records that follow it
+                trace_context = record.get("values", {})
+                context = TraceContext(trace_context)
+            elif kind == SUMMARY_RECORD:
+                eval_pack = record.get("eval_pack", "")
+                summary_stats = record.get("summary_stats", {})
+        return cls(eval_pack=eval_pack, items=items, summary_stats=summary_stats,
+                   trace_context=trace_context)
+
 
 # Update forward references
 EvaluationItem.model_rebuild()
\ No newline at end of file
@@ -11,18 +11,35 @@ Fixes in v2.3:
 """
 
 import json
-import os
-import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from functools import partial
 from pathlib import Path
-from typing import List, Dict, Any, Optional
-from dotenv import load_dotenv
+from typing import List, Dict, Any, Callable, Optional, Tuple, Union
 
-from .data_models import EvaluationItem, ScorerResult, EvaluationBatch
-from .scoring.llm_judge import LLMJudgeScorer
+from .data_models import PreparedItem, ScorerResult, EvaluationBatch
+from .scoring.prompt_budget import CHARS_PER_TOKEN
+from .scoring.registry import get_scorer_class
+from .scoring.rule_based import PrecheckScorer
 from .eval_pack.loader import load_eval_pack
-
-# Load .env from repo root
-load_dotenv(Path(__file__).parents[3] / '.env')
+from .instrumentation import RunTimings, phase
+from .ingestion.otlp_stream import iter_otlp_spans
+from .result_cache import PackResultCache, ResultCache, trace_fingerprint
+from .redaction import redact_content, redact_sensitive_attrs
+from .sections import extract_sections
+from .serialization import DEFAULT_SERIALIZATION, serialize, validate_serialization
+from .span_index import (
+    SpanIndex, decode_attributes, iter_resource_spans, resource_metadata_from_attributes
+)
+from .stats import RunStats
+from .trace_context import TraceContext
+
+# A parsed OTLP dict, a prebuilt SpanIndex, or a path to a trace file
+TraceSource = Union[Dict[str, Any], SpanIndex, str, Path]
+
+# Packs run by run_evaluation_suite when none are given
+DEFAULT_PACK_DIR = Path(__file__).parents[1] / 'examples' / 'eval_packs'
 
 # P0: Required metadata fields per eval pack (fail-fast validation)
 REQUIRED_METADATA = {
@@ -34,19 +51,11 @@ REQUIRED_METADATA = {
 # P0: Sentinel value for invalid/missing data
 INVALID_DATA_SENTINEL = 'INVALID_DATA'
 
-# Sensitive patterns for content redaction
-SENSITIVE_PATTERNS = [
-    r'sk-[a-zA-Z0-9]{20,}',  # OpenAI API keys
-    r'sk-ant-[a-zA-Z0-9-]+',  # Anthropic API keys
-    r'OPENAI_API_KEY\s*=\s*\S+',
-    r'api[_-]?key\s*[=:]\s*\S+',
-    r'password\s*[=:]\s*\S+',
-    r'secret\s*[=:]\s*\S+',
-    r'token\s*[=:]\s*[a-zA-Z0-9_-]{20,}',
-]
-
+# Judge calls in flight per stage (1 = serial). Override per stage or per pack
+# with `concurrency:` in the stage config or `ingestion.config`.
+DEFAULT_CONCURRENCY = 1
 
-def validate_required_metadata(item: EvaluationItem, pack_name: str) -> List[str]:
+def validate_required_metadata(item: PreparedItem, pack_name: str) -> List[str]:
     """
     P0: Validate that required metadata fields are present and not INVALID_DATA.
     Returns list of missing field names. Empty list = valid.
@@ -86,47 +95,199 @@ def extract_resource_metadata(trace_data: Dict) -> Dict[str, Any]:
             continue
 
         resource = resource_span.get('resource', {})
-        attrs = resource.get('attributes', [])
-
-        for attr in attrs:
-            if not isinstance(attr, dict):
-                continue
-            key = attr.get('key', '')
-            value_obj = attr.get('value', {})
-
-            # Extract metadata.* attributes
-            if key.startswith('metadata.'):
-                field_name = key[9:]  # Remove 'metadata.' prefix
-                for value_type in ['stringValue', 'intValue', 'boolValue', 'doubleValue']:
-                    if value_type in value_obj:
-                        metadata[field_name] = value_obj[value_type]
-                        break
+        attrs = decode_attributes(resource.get('attributes', []))
+        metadata.update(resource_metadata_from_attributes(attrs))
 
     return metadata
 
 
+class PreparedTrace:
+    """
+    A trace parsed and prepared once, shared by every pack evaluated against it.
+
+    Holds the resource metadata plus the redacted trace-level item and the
+    per-span items (one list per `input_field`), built on first use. Packs get
+    fresh copies with empty scores, so they never see each other's results.
+    """
+
+    def __init__(self, trace_data: Union[Dict[str, Any], SpanIndex]):
+        # One walk over the trace; every extractor reads from the index
+        self.index = as_span_index(trace_data)
+        # P0: Structured metadata from resource attributes
+        self.resource_metadata = self.index.resource_metadata
+        self._trace_items: Dict[str, PreparedItem] = {}  # by serialization format
+        self._span_items: Dict[str, List[PreparedItem]] = {}
+        self._fingerprint: Optional[str] = None
+
+    @property
+    def fingerprint(self) -> str:
+        """Content hash of the trace, used as the result cache key."""
+        if self._fingerprint is None:
+            self._fingerprint = trace_fingerprint(self.index)
+        return self._fingerprint
+
+    def items_for(self, pack) -> List[PreparedItem]:
+        """Return fresh, unscored evaluation items for a pack."""
+        # Check evaluation mode (per-span vs whole-trace)
+        eval_mode = pack.ingestion.config.get('evaluation_mode', 'span')
+
+        if eval_mode == 'trace':
+            # Whole-trace evaluation: single item with full trace as context
+            serialization = pack_serialization(pack)
+            if serialization not in self._trace_items:
+                self._trace_items[serialization] = create_trace_level_item(
+                    self.index, self.resource_metadata, serialization
+                )
+            prepared = [self._trace_items[serialization]]
+        else:
+            # Per-span evaluation: one item per span
+            input_field = pack.ingestion.config.get('input_field', 'attributes.content')
+            if input_field not in self._span_items:
+                self._span_items[input_field] = extract_items_from_trace(
+                    self.index, pack, self.resource_metadata
+                )
+            prepared = self._span_items[input_field]
+
+        return [item.fresh_copy() for item in prepared]
+
+
+def prepare_trace(trace_data: TraceSource) -> PreparedTrace:
+    """
+    Parse, extract and redact a trace once for use by one or more packs.
+
+    Accepts a parsed OTLP dict, a SpanIndex, or a path to an OTLP/JSON or ndjson
+    file; files are streamed span by span instead of being loaded whole.
+    """
+    if isinstance(trace_data, (str, Path)):
+        trace_data = load_trace_index(trace_data)
+    return PreparedTrace(trace_data)
+
+
+def load_trace_index(path: Union[str, Path]) -> SpanIndex:
+    """Stream an OTLP/JSON (or ndjson) trace file into a SpanIndex with bounded parse memory."""
+    return SpanIndex.from_span_records(iter_otlp_spans(path, empty_resources=True))
+
+
 def run_evaluation_batch(
-    trace_data: Dict[str, Any],
-    pack_path: str
+    trace_data: TraceSource,
+    pack_path: str,
+    prepared: Optional[PreparedTrace] = None,
+    cache: Optional[ResultCache] = None,
+    force: bool = False,
+    on_item: Optional[Callable[[PreparedItem], None]] = None,
+    self_trace: Optional[Union[str, Path]] = None
 ) -> EvaluationBatch:
     """
     Run evaluation on an OTEL trace using the specified eval pack.
+
+    `trace_data` may be a parsed trace dict or a path to a trace file.
+    Pass `prepared` to reuse a trace already prepared for another pack.
+    With a `cache`, stages whose trace, pack and stage config are unchanged
+    reuse their stored results instead of calling the judge; `force`
+    re-judges and overwrites them. `on_item` is called with each item, in
+    order, as soon as it has all its scores (see core.reports).
+
+    Wall/CPU time per phase and judge latency, retries and token usage are
+    reported in `summary_stats['timings']`; `self_trace` also writes the run
+    as an OTLP/JSON trace to that path (see core/instrumentation.py).
     """
-    pack = load_eval_pack(pack_path)
+    timings = RunTimings(record_spans=self_trace is not None)
+    with timings.activate():
+        with timings.phase('load_pack'):
+            pack = load_eval_pack(pack_path)
+        if prepared is None:
+            with timings.phase('prepare_trace'):
+                prepared = prepare_trace(trace_data)
+        with timings.phase('extract_items'):
+            items = prepared.items_for(pack)
+        batch = evaluate_pack(pack, pack_path, items, create_scorer,
+                              pack_cache(cache, prepared, pack_path, force), on_item)
+
+    batch.summary_stats['timings'] = {**timings.summary(),
+                                      **batch.summary_stats.get('timings', {})}
+    if self_trace is not None:
+        timings.write_otlp(self_trace, pack.name, batch.items)
+    return batch
+
+
+def pack_cache(cache: Optional[ResultCache], prepared: PreparedTrace, pack_path: str,
+               force: bool = False) -> Optional[PackResultCache]:
+    """Bind a result cache to one (trace, pack) pair; None when caching is off."""
+    if cache is None:
+        return None
+    return PackResultCache(cache, prepared.fingerprint, pack_path, force)
+
+
+def run_evaluation_suite(
+    trace_data: TraceSource,
+    pack_paths: Optional[List[str]] = None,
+    max_parallel_packs: Optional[int] = None,
+    cache: Optional[ResultCache] = None,
+    force: bool = False,
+    on_item: Optional[Callable[[str, PreparedItem], None]] = None
+) -> Dict[str, EvaluationBatch]:
+    """
+    Run several eval packs against one trace, parsing and preparing it only once.
 
-    # P0: Extract structured metadata from resource attributes
-    resource_metadata = extract_resource_metadata(trace_data)
+    Packs run side by side (their judge calls overlap) and share one scorer
+    instance per scorer type. Defaults to every pack in examples/eval_packs/.
+    `cache` and `force` work as in run_evaluation_batch; `on_item` is called
+    with (pack path, item) from the pack's thread as each item finishes.
 
-    # Check evaluation mode (per-span vs whole-trace)
-    eval_mode = pack.ingestion.config.get('evaluation_mode', 'span')
+    Returns a dict of pack path -> EvaluationBatch, in the order given.
+    """
+    if pack_paths is None:
+        pack_paths = [str(p) for p in sorted(DEFAULT_PACK_DIR.glob('*.yaml'))]
+    pack_paths = [str(p) for p in pack_paths]
+    if not pack_paths:
+        return {}
+
+    prepared = prepare_trace(trace_data)
+    packs = [load_eval_pack(path) for path in pack_paths]
+    # Build every pack's items up front, before the packs run concurrently
+    pack_items = [prepared.items_for(pack) for pack in packs]
+
+    shared_scorer = shared_scorer_factory()
+    workers = max_parallel_packs or len(packs)
+    with ThreadPoolExecutor(max_workers=max(1, workers),
+                            thread_name_prefix='lake-merritt-pack') as executor:
+        futures = [
+            executor.submit(evaluate_pack, pack, path, items, shared_scorer,
+                            pack_cache(cache, prepared, path, force),
+                            partial(on_item, path) if on_item is not None else None)
+            for pack, path, items in zip(packs, pack_paths, pack_items)
+        ]
+        return {path: future.result() for path, future in zip(pack_paths, futures)}
+
+
+def shared_scorer_factory():
+    """
+    Return a thread-safe scorer factory that creates one scorer per scorer type.
+
+    Scorers take their stage config per call, so one instance (and one API
+    client) can serve every stage, pack and trace that uses its type.
+    """
+    scorers: Dict[str, Any] = {}
+    scorers_lock = threading.Lock()
+
+    def shared_scorer(stage):
+        with scorers_lock:
+            if stage.scorer not in scorers:
+                scorers[stage.scorer] = create_scorer(stage)
+            return scorers[stage.scorer]
+
+    return shared_scorer
 
-    if eval_mode == 'trace':
-        # Whole-trace evaluation: single item with full trace as context
-        items = [create_trace_level_item(trace_data, resource_metadata)]
-    else:
-        # Per-span evaluation: one item per span
-        items = extract_items_from_trace(trace_data, pack, resource_metadata)
 
+def evaluate_pack(pack, pack_path: str, items: List[PreparedItem], scorer_factory,
+                  cache: Optional[PackResultCache] = None,
+                  on_item: Optional[Callable[[PreparedItem], None]] = None) -> EvaluationBatch:
+    """
+    Validate and score prepared items through a pack's pipeline.
+
+    `on_item` receives every item once, in order, when no later stage will
+    score it: as the last stage commits it, or when the pipeline stops.
+    """
     if not items:
         return EvaluationBatch(
             eval_pack=pack.name,
@@ -141,6 +302,9 @@ def run_evaluation_batch(
         if missing:
             # Mark as invalid immediately
             item.scores.append(create_invalid_result(missing))
+            if on_item is not None:
+                for invalid_item in items:
+                    on_item(invalid_item)
             return EvaluationBatch(
                 eval_pack=pack.name,
                 items=items,
@@ -148,63 +312,187 @@ def run_evaluation_batch(
                               'average_score': 0, 'status': 'INVALID (Incomplete Data)'}
             )
 
-    # Run each scorer in the pipeline
-    for stage in pack.pipeline:
-        scorer = create_scorer(stage)
-        stage_failed = False
-
-        for item in items:
-            result = scorer.score(item, stage.config)
-            item.scores.append(result)
+    # Summary statistics accumulate as scores are committed and items finish
+    stats = RunStats()
+    emitted = 0
 
-            # Check on_fail behavior
-            if not result.passed and stage.on_fail == 'stop':
-                stage_failed = True
-                break
+    def emit(item):
+        nonlocal emitted
+        stats.count_item(item)
+        if on_item is not None:
+            on_item(item)
+        emitted += 1
 
+    # Run each scorer in the pipeline
+    last_stage = len(pack.pipeline) - 1
+    for stage_index, stage in enumerate(pack.pipeline):
+        stage = pack_stage(stage, pack)
+        with phase(f"stage:{stage.name}", span=True,
+                   attributes={'lake_merritt.scorer': stage.scorer}):
+            scored_before = [len(item.scores) for item in items]
+            stage_failed = cache.replay(stage, items) if cache is not None else None
+            if stage_failed is None:
+                # Scorers are only created for stages that actually call the judge
+                scorer = stage_scorer(stage, scorer_factory)
+                concurrency = resolve_concurrency(stage, pack)
+
+                on_scored = emit if stage_index == last_stage else None
+                stage_failed = score_stage(scorer, items, stage, concurrency, on_scored, stats)
+                if cache is not None:
+                    cache.store(stage, items, scored_before, stage_failed)
+            else:
+                for item, before in zip(items, scored_before):
+                    for result in item.scores[before:]:
+                        stats.add_score(result)
         if stage_failed:
             break  # Don't run remaining pipeline stages
 
+    for item in items[emitted:]:
+        emit(item)
+
+    with phase('summary', span=True):
+        summary_stats = calculate_summary(items, pack, stats)
+    if cache is not None:
+        summary_stats['cache'] = cache.summary()
     return EvaluationBatch(
         eval_pack=pack.name,
         items=items,
-        summary_stats=calculate_summary(items, pack)
+        summary_stats=summary_stats
+    )
+
+
+def stage_scorer(stage, scorer_factory):
+    """The stage's scorer, behind its rule `precheck` if one is configured."""
+    precheck = stage.config.get('precheck')
+    if precheck:
+        return PrecheckScorer(precheck, lambda: scorer_factory(stage))
+    return scorer_factory(stage)
+
+
+def pack_serialization(pack) -> str:
+    """Return the pack's prompt serialization format (`ingestion.config.serialization`)."""
+    return validate_serialization(pack.ingestion.config.get('serialization', DEFAULT_SERIALIZATION))
+
+
+def pack_stage(stage, pack):
+    """Return the stage with pack-wide judge settings applied (stage config wins)."""
+    serialization = pack_serialization(pack)
+    if serialization == DEFAULT_SERIALIZATION or 'serialization' in stage.config:
+        return stage
+    return replace(stage, config={**stage.config, 'serialization': serialization})
+
+
+def resolve_concurrency(stage, pack) -> int:
+    """Return the number of concurrent judge calls for a stage (stage config wins over pack)."""
+    value = stage.config.get(
+        'concurrency',
+        pack.ingestion.config.get('concurrency', DEFAULT_CONCURRENCY)
     )
+    try:
+        concurrency = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid concurrency for stage '{stage.name}': {value!r}")
+    return max(1, concurrency)
+
+
+def score_stage(scorer, items: List[PreparedItem], stage, concurrency: int = 1,
+                on_scored: Optional[Callable[[PreparedItem], None]] = None,
+                stats: Optional[RunStats] = None) -> bool:
+    """
+    Score every item for one pipeline stage.
+
+    With concurrency > 1 the judge calls run on a bounded thread pool, but results
+    are still committed in item order, so reports and `on_fail: stop` behave exactly
+    as in a serial run: items after the first stopping failure get no score for this
+    stage, and their queued calls are cancelled.
 
+    Stages with `judge_mode: batch` send all items as one provider batch job
+    (for scorers that support it) and commit the results the same way.
 
-def create_trace_level_item(trace_data: Dict, resource_metadata: Dict = None) -> EvaluationItem:
-    """Create a single evaluation item containing the full trace."""
-    spans = extract_all_spans(trace_data)
-    resource_metadata = resource_metadata or {}
+    Each committed result is added to `stats`, if given, and then `on_scored`
+    is called with its item.
+
+    Returns True if the stage stopped on a failure.
+    """
+    def commit(item, result) -> bool:
+        item.scores.append(result)
+        if stats is not None:
+            stats.add_score(result)
+        if on_scored is not None:
+            on_scored(item)
+
+        # Check on_fail behavior
+        return not result.passed and stage.on_fail == 'stop'
+
+    if stage.config.get('judge_mode') == 'batch' and hasattr(scorer, 'score_batch'):
+        results = scorer.score_batch(items, stage.config)
+        for item, result in zip(items, results):
+            if commit(item, result):
+                return True
+        return False
+
+    if concurrency <= 1 or len(items) <= 1:
+        for item in items:
+            if commit(item, scorer.score(item, stage.config)):
+                return True
+        return False
+
+    executor = ThreadPoolExecutor(max_workers=min(concurrency, len(items)),
+                                  thread_name_prefix='lake-merritt-judge')
+    try:
+        futures = [executor.submit(scorer.score, item, stage.config) for item in items]
+        for item, future in zip(items, futures):
+            if commit(item, future.result()):
+                return True
+        return False
+    finally:
+        # Drop queued calls; calls already in flight finish but are discarded
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def as_span_index(trace: Union[Dict, SpanIndex]) -> SpanIndex:
+    """Accept either a raw OTLP trace dict or an already-built SpanIndex."""
+    return trace if isinstance(trace, SpanIndex) else SpanIndex.from_trace(trace)
+
+
+def create_trace_level_item(trace: Union[Dict, SpanIndex], resource_metadata: Dict = None,
+                            serialization: str = DEFAULT_SERIALIZATION) -> PreparedItem:
+    """Create a single evaluation item containing the full trace, serialized as `serialization`."""
+    index = as_span_index(trace)
+    spans = index.spans
+    if resource_metadata is None:
+        resource_metadata = index.resource_metadata
 
     # Build trace summary with content extraction
     trace_summary = []
     all_content = []
 
-    for span in spans:
-        attrs = otel_attributes_to_dict(span.get('attributes', []))
-        content = attrs.get('content', '')
+    # Redact sensitive content (Codex v2.1 issue #2), timed as one phase per trace
+    contents = [attrs.get('content', '') for attrs in index.attributes]
+    with phase('redaction'):
+        redacted = [redact_content(content) for content in contents]
 
-        # Redact sensitive content (Codex v2.1 issue #2)
-        redacted_content = redact_content(content)
+    for span, attrs, content, redacted_content in zip(spans, index.attributes, contents, redacted):
         truncated_content = truncate_content(redacted_content, 500)
 
         if content:
-            all_content.append(content)
+            # Sections below are extracted from redacted text
+            all_content.append(redacted_content)
 
+        # Free-text fields are redacted here, so the summary needs no second pass
         trace_summary.append({
-            'name': span.get('name'),
+            'name': redact_value(span.get('name')),
             'spanId': span.get('spanId'),
             'startTime': span.get('startTimeUnixNano'),
             'endTime': span.get('endTimeUnixNano'),
-            'agent': attrs.get('agent'),
+            'agent': redact_value(attrs.get('agent')),
             'content': truncated_content
         })
 
     # Extract breaker_review and change_log from content (Codex v2.1 issue #1)
     full_content = '\n'.join(all_content)
-    breaker_review = extract_breaker_review(full_content)
-    change_log = extract_change_log(full_content)
+    with phase('sections'):
+        breaker_review, change_log = extract_review_sections(full_content)
 
     # P0: Prefer resource metadata over content extraction
     final_breaker_review = resource_metadata.get('breaker_review', breaker_review)
@@ -222,82 +510,56 @@ def create_trace_level_item(trace_data: Dict, resource_metadata: Dict = None) ->
 
     all_approved = resource_metadata.get('all_approved', False)
 
-    return EvaluationItem(
+    # The input is the serialized trace summary, so reports leave `otel_trace` out
+    context = TraceContext({
+        'otel_trace': trace_summary,
+        'span_count': len(spans),
+        'trace_id': spans[0].get('traceId') if spans else None,
+        'breaker_review': final_breaker_review,
+        'change_log': final_change_log,
+        'reviewer_suggestions': final_reviewer_suggestions,
+        'user_prompt': final_user_prompt,
+        'approvals': approvals,
+        'all_approved': all_approved,
+        'data_quality': resource_metadata.get('data_quality', {})
+    }, in_input=('otel_trace',))
+    return PreparedItem(
         id='trace_evaluation',
-        input=redact_content(json.dumps(trace_summary, indent=2)),
-        metadata={
-            'otel_trace': trace_summary,
-            'span_count': len(spans),
-            'trace_id': spans[0].get('traceId') if spans else None,
-            'breaker_review': final_breaker_review,
-            'change_log': final_change_log,
-            'reviewer_suggestions': final_reviewer_suggestions,
-            'user_prompt': final_user_prompt,
-            'approvals': approvals,
-            'all_approved': all_approved,
-            'data_quality': resource_metadata.get('data_quality', {})
-        }
+        input=serialize(trace_summary, serialization),
+        metadata=context.metadata(),
+        input_serialization=serialization
     )
 
 
 def extract_breaker_review(content: str) -> str:
     """Extract Breaker/failure scenarios from content."""
-    # Look for common Breaker review patterns
-    patterns = [
-        r'(?:FAILURE SCENARIO|FAILURE|Failure scenario)[^\n]*\n((?:.*?\n)*?)(?=\n\n|\Z)',
-        r'(?:BREAKER|Breaker)[^\n]*\n((?:.*?\n)*?)(?=\n\n|\Z)',
-        r'(?:\[Codex\].*?BREAKER.*?\n)((?:.*?\n)*?)(?=---|\Z)',
-        r'(?:REQUEST.?CHANGES|Request Changes)[^\n]*\n((?:.*?\n)*?)(?=\n\n|\Z)',
-    ]
-
-    reviews = []
-    for pattern in patterns:
-        matches = re.findall(pattern, content, re.IGNORECASE | re.MULTILINE)
-        reviews.extend(matches)
-
-    if reviews:
-        return truncate_content('\n'.join(reviews), 2000)
-    return 'No breaker review found in trace'
+    return extract_review_sections(content)[0]
 
 
 def extract_change_log(content: str) -> str:
     """Extract change log/revision information from content."""
-    patterns = [
-        r'(?:Change Log|CHANGE LOG|Changelog)[^\n]*\n((?:.*?\n)*?)(?=\n\n|\Z)',
-        r'(?:v\d+\.\d+.*?(?:FIXED|Fixed|Addressed|DONE).*?\n)((?:.*?\n)*?)(?=\n\n|\Z)',
-        r'(?:Revision|REVISION)[^\n]*\n((?:.*?\n)*?)(?=\n\n|\Z)',
-        r'(?:Issues? (?:fixed|addressed|resolved))[^\n]*\n((?:.*?\n)*?)(?=\n\n|\Z)',
-    ]
+    return extract_review_sections(content)[1]
 
-    logs = []
-    for pattern in patterns:
-        matches = re.findall(pattern, content, re.IGNORECASE | re.MULTILINE)
-        logs.extend(matches)
 
-    if logs:
-        return truncate_content('\n'.join(logs), 2000)
-    return 'No change log found in trace'
+def extract_review_sections(content: str) -> Tuple[str, str]:
+    """
+    Extract (breaker_review, change_log) from content in one linear scan.
+
+    Looks for FAILURE/BREAKER/[Codex] BREAKER/REQUEST CHANGES sections and
+    Change Log/vX.Y FIXED/Revision/Issues fixed sections (see core.sections).
+    """
+    reviews, logs = extract_sections(content)
+
+    breaker_review = truncate_content('\n'.join(reviews), 2000) if reviews else 'No breaker review found in trace'
+    change_log = truncate_content('\n'.join(logs), 2000) if logs else 'No change log found in trace'
+    return breaker_review, change_log
 
 
 def extract_all_spans(trace_data: Dict) -> List[Dict]:
     """Extract all spans from trace, handling missing keys gracefully."""
     spans = []
-
-    for resource_span in trace_data.get('resourceSpans', []):
-        if not isinstance(resource_span, dict):
-            continue
-
-        scope_spans = resource_span.get('scopeSpans')
-        if not scope_spans:
-            continue
-
-        for scope_span in scope_spans:
-            if not isinstance(scope_span, dict):
-                continue
-            span_list = scope_span.get('spans', [])
-            if span_list:
-                spans.extend(span_list)
-
+    for _, _, span_list in iter_resource_spans(trace_data):
+        spans.extend(span_list)
     return spans
 
 
@@ -308,49 +570,35 @@ def otel_attributes_to_dict(attributes: List[Dict]) -> Dict[str, Any]:
     OTEL format: [{"key": "foo", "value": {"stringValue": "bar"}}]
     Output: {"foo": "bar"}
     """
-    result = {}
-    if not isinstance(attributes, list):
-        return result
+    return decode_attributes(attributes)
 
-    for attr in attributes:
-        if not isinstance(attr, dict):
-            continue
-        key = attr.get('key')
-        value_obj = attr.get('value', {})
-        if key and isinstance(value_obj, dict):
-            for value_type in ['stringValue', 'intValue', 'boolValue', 'doubleValue']:
-                if value_type in value_obj:
-                    result[key] = value_obj[value_type]
-                    break
-    return result
 
-
-def extract_items_from_trace(trace_data: Dict, pack, resource_metadata: Dict = None) -> List[EvaluationItem]:
+def extract_items_from_trace(trace: Union[Dict, SpanIndex], pack, resource_metadata: Dict = None) -> List[PreparedItem]:
     """Extract evaluation items from OTEL trace based on pack config."""
     items = []
-    spans = extract_all_spans(trace_data)
-    resource_metadata = resource_metadata or {}
+    index = as_span_index(trace)
+    if resource_metadata is None:
+        resource_metadata = index.resource_metadata
 
     input_field = pack.ingestion.config.get('input_field', 'attributes.content')
 
     # Also collect all content for metadata extraction
     all_content = []
 
-    for i, span in enumerate(spans):
-        attrs = otel_attributes_to_dict(span.get('attributes', []))
-
-        if input_field == 'attributes.content':
-            content = attrs.get('content')
-        else:
-            content = extract_nested_field(span, input_field)
+    # Redact sensitive content (sections below are extracted from redacted text),
+    # timed as one phase per trace
+    contents = [index.get_field(i, input_field) for i in range(len(index.spans))]
+    with phase('redaction'):
+        redacted = [redact_content(content) if content else None for content in contents]
 
+    for i, (span, attrs, content, redacted_content) in enumerate(
+            zip(index.spans, index.attributes, contents, redacted)):
         if content:
-            all_content.append(content)
-
-            # Redact sensitive content
-            redacted_content = redact_content(content)
+            all_content.append(redacted_content)
+            if not redacted_content.strip():
+                continue  # Nothing to judge (EvaluationItem rejects blank input)
 
-            items.append(EvaluationItem(
+            items.append(PreparedItem(
                 id=f"span_{i}",
                 input=truncate_content(redacted_content, 2000),
                 metadata={
@@ -361,20 +609,20 @@ def extract_items_from_trace(trace_data: Dict, pack, resource_metadata: Dict = N
                 }
             ))
 
-    # Extract and add breaker_review/change_log to all items
+    # Extract breaker_review/change_log once and share them with all items
     full_content = '\n'.join(all_content)
-    breaker_review = extract_breaker_review(full_content)
-    change_log = extract_change_log(full_content)
+    with phase('sections'):
+        breaker_review, change_log = extract_review_sections(full_content)
 
     # P0: Prefer resource metadata over content extraction
-    final_breaker_review = resource_metadata.get('breaker_review', breaker_review)
-    final_change_log = resource_metadata.get('change_log', change_log)
-    final_reviewer_suggestions = resource_metadata.get('reviewer_suggestions', '')
+    context = TraceContext({
+        'breaker_review': resource_metadata.get('breaker_review', breaker_review),
+        'change_log': resource_metadata.get('change_log', change_log),
+        'reviewer_suggestions': resource_metadata.get('reviewer_suggestions', ''),
+    })
 
     for item in items:
-        item.metadata['breaker_review'] = final_breaker_review
-        item.metadata['change_log'] = final_change_log
-        item.metadata['reviewer_suggestions'] = final_reviewer_suggestions
+        item.metadata = context.metadata(item.metadata)
 
     return items
 
@@ -398,54 +646,28 @@ def truncate_content(content: str, max_chars: int) -> str:
     return content[:max_chars] + f"\n... [TRUNCATED - {len(content) - max_chars} chars removed]"
 
 
-def redact_content(content: str) -> str:
-    """Redact sensitive patterns from content (Codex v2.1 issue #2)."""
-    if not content:
-        return content
-
-    redacted = content
-    for pattern in SENSITIVE_PATTERNS:
-        redacted = re.sub(pattern, '[REDACTED]', redacted, flags=re.IGNORECASE)
-    return redacted
-
-
-def redact_sensitive_attrs(attrs: Dict) -> Dict:
-    """Redact potentially sensitive data from attributes."""
-    sensitive_keys = {'api_key', 'password', 'secret', 'token', 'credential', 'auth'}
-    redacted = {}
-    for key, value in attrs.items():
-        if any(s in key.lower() for s in sensitive_keys):
-            redacted[key] = '[REDACTED]'
-        elif isinstance(value, str):
-            redacted[key] = redact_content(value)
-        else:
-            redacted[key] = value
-    return redacted
+def redact_value(value: Any) -> Any:
+    """Redact a value if it is a string; pass anything else through."""
+    return redact_content(value) if isinstance(value, str) else value
 
 
 def create_scorer(stage):
-    """Create scorer instance based on stage config."""
-    if stage.scorer == 'llm_judge':
-        return LLMJudgeScorer()
-    raise ValueError(f"Unknown scorer: {stage.scorer}")
+    """Create scorer instance based on stage config (see core/scoring/registry.py)."""
+    return get_scorer_class(stage.scorer)()
+
 
+def calculate_summary(items: List[PreparedItem], pack, stats: Optional[RunStats] = None) -> Dict:
+    """
+    Summary statistics of scored items (see core/stats.py).
 
-def calculate_summary(items: List[EvaluationItem], pack) -> Dict:
-    """Calculate summary statistics from scored items."""
+    evaluate_pack passes the RunStats it fed while scoring; without one the
+    items are summarized in one pass.
+    """
     if not items:
         return {'total_items': 0, 'passed': 0, 'failed': 0, 'average_score': 0, 'status': 'NO_ITEMS'}
 
-    total = len(items)
-    passed = sum(1 for item in items if item.scores and all(s.passed for s in item.scores))
-    failed = total - passed
-
-    all_scores = [s.numeric_score for item in items for s in item.scores if s.numeric_score is not None]
-    avg_score = sum(all_scores) / len(all_scores) if all_scores else 0
-
-    return {
-        'total_items': total,
-        'passed': passed,
-        'failed': failed,
-        'average_score': round(avg_score, 3),
-        'status': 'PASS' if passed == total else 'PARTIAL' if passed > 0 else 'FAIL'
-    }
+    if stats is None:
+        stats = RunStats()
+        for item in items:
+            stats.add_item(item)
+    return stats.summary(chars_per_token=CHARS_PER_TOKEN)
@@ -1,22 +1,42 @@
 # Ingestion module for Lake Merritt
-from core.ingestion.base import BaseIngester
-from core.ingestion.csv_ingester import CSVIngester
-from core.ingestion.json_ingester import JSONIngester
-from core.ingestion.generic_otel_ingester import GenericOtelIngester
+#
+# Ingesters are imported on first attribute access (PEP 562), so importing
+# one of them does not pull in the others' dependencies: CSVIngester needs
+# pandas, and the OTEL/JSON ingesters need pydantic through core.data_models,
+# while the cast, CC and AG ingesters need neither.
+import importlib
 
-# CC + AG Observability Ingestors (Sprint: Lightweight Hybrid Observability)
-from core.ingestion.cast_ingester import CastIngester, CastRecording, parse_cast_file
-from core.ingestion.cc_jsonl_ingester import CCJSONLIngester, CCTranscript, parse_cc_transcript
-from core.ingestion.ag_telemetry_ingester import AGTelemetryIngester, AGSession, parse_ag_telemetry
+_LAZY_ATTRIBUTES = {
+    "BaseIngester": "core.ingestion.base",
+    "CSVIngester": "core.ingestion.csv_ingester",
+    "JSONIngester": "core.ingestion.json_ingester",
+    "GenericOtelIngester": "core.ingestion.generic_otel_ingester",
+    "OtlpSpanRecord": "core.ingestion.otlp_stream",
+    "iter_otlp_spans": "core.ingestion.otlp_stream",
+    # CC + AG Observability Ingestors (Sprint: Lightweight Hybrid Observability)
+    "CastIngester": "core.ingestion.cast_ingester",
+    "CastRecording": "core.ingestion.cast_ingester",
+    "CastFrame": "core.ingestion.cast_ingester",
+    "parse_cast_file": "core.ingestion.cast_ingester",
+    "CCJSONLIngester": "core.ingestion.cc_jsonl_ingester",
+    "CCTranscript": "core.ingestion.cc_jsonl_ingester",
+    "parse_cc_transcript": "core.ingestion.cc_jsonl_ingester",
+    "AGTelemetryIngester": "core.ingestion.ag_telemetry_ingester",
+    "AGSession": "core.ingestion.ag_telemetry_ingester",
+    "parse_ag_telemetry": "core.ingestion.ag_telemetry_ingester",
+}
 
 __all__ = [
     "BaseIngester",
     "CSVIngester",
     "JSONIngester",
     "GenericOtelIngester",
+    "OtlpSpanRecord",
+    "iter_otlp_spans",
     # Observability ingestors
     "CastIngester",
     "CastRecording",
+    "CastFrame",
     "parse_cast_file",
     "CCJSONLIngester",
     "CCTranscript",
@@ -24,4 +44,17 @@ __all__ = [
     "AGTelemetryIngester",
     "AGSession",
     "parse_ag_telemetry",
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value  # Later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
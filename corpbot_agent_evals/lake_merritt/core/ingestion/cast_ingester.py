@@ -9,11 +9,16 @@ Format (asciicast v2):
   Line 2+: JSON events [timestamp, "o", "output_text"]
 
 BC-03: This ingester expects v2 format (forced by logged-claude.sh/logged-ag.sh).
+
+Recordings of long sessions run to hundreds of MB, so frames are parsed
+lazily: iter_frames() reads one line at a time with constant memory, and
+extract_text() / find_patterns() accept a file as well as a CastRecording.
 """
 
 import json
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List, Dict, Any, Union, IO, Optional
+from typing import Container, List, Dict, Any, Union, IO, Iterable, Iterator, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime
 
@@ -51,6 +56,10 @@ class CastIngester:
         # Access frames
         for frame in recording.frames:
             print(f"[{frame.timestamp:.2f}s] {frame.data}")
+
+        # Or stream them from a large recording, optionally filtered
+        for frame in ingester.iter_frames("session.cast", start=60, end=120, event_types={"o"}):
+            print(frame.data)
     """
 
     SUPPORTED_VERSIONS = {2}  # BC-03: We force v2
@@ -65,32 +74,11 @@ class CastIngester:
         Returns:
             CastRecording with header info and all frames
         """
-        source_path = None
-
-        # Handle different input types
-        if isinstance(source, (str, Path)):
-            source_path = str(source)
-            with open(source, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-        elif hasattr(source, 'read'):
-            lines = source.read().splitlines()
-            if hasattr(source, 'name'):
-                source_path = source.name
-        else:
-            raise ValueError(f"Unsupported source type: {type(source)}")
-
-        if not lines:
-            raise ValueError("Empty cast file")
-
-        # Parse header (first line)
-        try:
-            header = json.loads(lines[0])
-        except json.JSONDecodeError as e:
-            raise ValueError(f"Invalid cast header: {e}")
+        with self._open(source) as (lines, source_path):
+            header = self._parse_header(lines)
+            frames = list(self._parse_frames(lines))
 
         version = header.get("version", 1)
-        if version not in self.SUPPORTED_VERSIONS:
-            raise ValueError(f"Unsupported asciicast version: {version}. Expected: {self.SUPPORTED_VERSIONS}")
 
         # Parse timestamp if present
         timestamp = None
@@ -100,28 +88,7 @@ class CastIngester:
             except (TypeError, ValueError):
                 pass
 
-        # Parse frames (remaining lines)
-        frames: List[CastFrame] = []
-        max_timestamp = 0.0
-
-        for i, line in enumerate(lines[1:], start=2):
-            line = line.strip()
-            if not line:
-                continue
-
-            try:
-                event = json.loads(line)
-                if isinstance(event, list) and len(event) >= 3:
-                    ts, event_type, data = event[0], event[1], event[2]
-                    frames.append(CastFrame(
-                        timestamp=float(ts),
-                        event_type=str(event_type),
-                        data=str(data)
-                    ))
-                    max_timestamp = max(max_timestamp, float(ts))
-            except (json.JSONDecodeError, TypeError, ValueError) as e:
-                # Gracefully skip malformed lines
-                continue
+        max_timestamp = max((frame.timestamp for frame in frames), default=0.0)
 
         return CastRecording(
             version=version,
@@ -135,25 +102,46 @@ class CastIngester:
             source_file=source_path
         )
 
-    def extract_text(self, recording: CastRecording) -> str:
+    def iter_frames(self, source: Union[str, Path, IO],
+                    start: Optional[float] = None,
+                    end: Optional[float] = None,
+                    event_types: Optional[Container[str]] = None) -> Iterator[CastFrame]:
+        """
+        Yield the frames of an asciicast file one at a time, with constant memory.
+
+        Args:
+            source: File path, Path object, or file-like object
+            start: Skip frames before this many seconds into the recording
+            end: Stop at the first frame at or after this many seconds
+                 (asciicast v2 timestamps only increase, so the rest of the
+                 file is not read)
+            event_types: Only yield these event types, e.g. {"o"}
+
+        The header is validated when iteration starts; malformed lines are
+        skipped, as in ingest().
+        """
+        with self._open(source) as (lines, _):
+            self._parse_header(lines)
+            yield from self._parse_frames(lines, start, end, event_types)
+
+    def extract_text(self, recording: Union[CastRecording, str, Path, IO]) -> str:
         """
         Extract all output text from a recording (concatenated).
 
-        Useful for searching/analyzing what was displayed.
+        Useful for searching/analyzing what was displayed. Pass a file
+        instead of a CastRecording to stream it rather than load every frame.
         """
-        return ''.join(
-            frame.data for frame in recording.frames
-            if frame.event_type == "o"
-        )
+        return ''.join(frame.data for frame in self._output_frames(recording))
 
-    def find_patterns(self, recording: CastRecording, patterns: List[str]) -> Dict[str, List[float]]:
+    def find_patterns(self, recording: Union[CastRecording, str, Path, IO],
+                      patterns: List[str]) -> Dict[str, List[float]]:
         """
         Find timestamps where patterns appear in the output.
 
         Useful for locating cognitive states like "Channelling...", "Thinking...".
 
         Args:
-            recording: The cast recording to search
+            recording: The cast recording to search, or a cast file to stream
             patterns: List of text patterns to find
 
         Returns:
@@ -161,15 +149,74 @@ class CastIngester:
         """
         results = {p: [] for p in patterns}
 
-        for frame in recording.frames:
-            if frame.event_type != "o":
-                continue
+        for frame in self._output_frames(recording):
             for pattern in patterns:
                 if pattern in frame.data:
                     results[pattern].append(frame.timestamp)
 
         return results
 
+    def _output_frames(self, recording: Union[CastRecording, str, Path, IO]) -> Iterable[CastFrame]:
+        """Output frames of a parsed recording, or streamed from a cast file."""
+        if isinstance(recording, CastRecording):
+            return (frame for frame in recording.frames if frame.event_type == "o")
+        return self.iter_frames(recording, event_types={"o"})
+
+    @contextmanager
+    def _open(self, source: Union[str, Path, IO]) -> Iterator[Tuple[Iterator, Optional[str]]]:
+        """Lines of a cast file, read lazily, and its path if it has one."""
+        if isinstance(source, (str, Path)):
+            with open(source, 'r', encoding='utf-8') as f:
+                yield iter(f), str(source)
+        elif hasattr(source, 'read'):
+            yield iter(source.readline, source.read(0)), getattr(source, 'name', None)
+        else:
+            raise ValueError(f"Unsupported source type: {type(source)}")
+
+    def _parse_header(self, lines: Iterator) -> Dict[str, Any]:
+        """Parse and validate the header (first line)."""
+        first = next(lines, None)
+        if first is None:
+            raise ValueError("Empty cast file")
+
+        try:
+            header = json.loads(first)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid cast header: {e}")
+
+        version = header.get("version", 1)
+        if version not in self.SUPPORTED_VERSIONS:
+            raise ValueError(f"Unsupported asciicast version: {version}. Expected: {self.SUPPORTED_VERSIONS}")
+        return header
+
+    def _parse_frames(self, lines: Iterator,
+                      start: Optional[float] = None,
+                      end: Optional[float] = None,
+                      event_types: Optional[Container[str]] = None) -> Iterator[CastFrame]:
+        """Parse the remaining lines into frames, skipping malformed ones."""
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+
+            try:
+                event = json.loads(line)
+                if isinstance(event, list) and len(event) >= 3:
+                    ts, event_type, data = float(event[0]), str(event[1]), event[2]
+                else:
+                    continue
+            except (json.JSONDecodeError, TypeError, ValueError):
+                # Gracefully skip malformed lines
+                continue
+
+            if end is not None and ts >= end:
+                return
+            if start is not None and ts < start:
+                continue
+            if event_types is not None and event_type not in event_types:
+                continue
+            yield CastFrame(timestamp=ts, event_type=event_type, data=str(data))
+
 
 # Convenience function for quick parsing
 def parse_cast_file(path: Union[str, Path]) -> CastRecording:
@@ -1,11 +1,18 @@
 # In file: core/ingestion/generic_otel_ingester.py
 
 import json
-from typing import List, Dict, Any, Union, IO, Optional
+import re
+from pathlib import Path
+from typing import List, Dict, Any, Union, IO, Iterable, Optional, Tuple
 
 from core.ingestion.base import BaseIngester
+from core.ingestion.otlp_stream import iter_otlp_spans
 from core.data_models import EvaluationItem
 
+# Matches the (possibly empty) run of whitespace at a position
+_skip_whitespace = re.compile(r'\s*').match
+
+
 class GenericOtelIngester(BaseIngester):
     """
     A trace-aware ingester for standard OpenTelemetry JSON traces.
@@ -14,7 +21,7 @@ class GenericOtelIngester(BaseIngester):
     per trace, searching across all spans in that trace to find specified fields.
     """
 
-    def ingest(self, data: Union[str, IO, Dict], config: Dict) -> List[EvaluationItem]:
+    def ingest(self, data: Union[str, Path, IO, Dict, List[Dict]], config: Dict) -> List[EvaluationItem]:
         # --- Configuration from Eval Pack ---
         input_field_path = config.get("input_field", "attributes.input")
         output_field_path = config.get("output_field", "attributes.output")
@@ -25,25 +32,21 @@ class GenericOtelIngester(BaseIngester):
 
         # --- Load and Parse Data ---
         # This now handles single, list, and newline-delimited JSON.
-        if hasattr(data, 'getvalue'):
-            content = data.getvalue().decode("utf-8")
-        elif hasattr(data, 'read'):
-            data.seek(0)
-            content = data.read()
+        # Files and paths are streamed span by span; only spans are kept in memory.
+        if isinstance(data, Path) or hasattr(data, 'read'):
+            if hasattr(data, 'seek'):
+                data.seek(0)
+            all_spans = (record.span for record in iter_otlp_spans(data))
+        elif isinstance(data, dict):
+            all_spans = self._get_all_spans_from_payload([data])
+        elif isinstance(data, list):
+            all_spans = self._get_all_spans_from_payload(data)
         else:
-            content = data if isinstance(data, str) else json.dumps(data)
+            raw_trace_objects = self._parse_json_input(data)
+            all_spans = self._get_all_spans_from_payload(raw_trace_objects)
 
-        raw_trace_objects = self._parse_json_input(content)
-        
         # --- Group Spans by Trace ID ---
-        all_spans = self._get_all_spans_from_payload(raw_trace_objects)
-        traces: Dict[str, List[Dict[str, Any]]] = {}
-        for span in all_spans:
-            trace_id = span.get("traceId")
-            if trace_id:
-                if trace_id not in traces:
-                    traces[trace_id] = []
-                traces[trace_id].append(span)
+        traces = self._group_spans_by_trace(all_spans)
 
         # --- Create One EvaluationItem Per Trace ---
         items: List[EvaluationItem] = []
@@ -81,7 +84,14 @@ class GenericOtelIngester(BaseIngester):
         return items
 
     def _parse_json_input(self, content: str) -> List[Dict]:
-        """Parses a string that could be a single JSON object, a JSON array, or ndjson."""
+        """
+        Parses a string that could be a single JSON object, a JSON array, or ndjson.
+
+        Decoding is linear in the input size: line-delimited input is decoded
+        line by line, and anything else (pretty-printed or concatenated objects)
+        is decoded in place with raw_decode(content, pos) rather than by slicing
+        off the remainder of the string for every object.
+        """
         content = content.strip()
         if not content:
             return []
@@ -94,18 +104,20 @@ class GenericOtelIngester(BaseIngester):
                 # Fallback to ndjson if array parsing fails (e.g., malformed)
                 pass
 
-        # Try parsing as ndjson (or a single object)
-        objects = []
+        # Fast path: one JSON value per line
+        objects, pos = self._parse_json_lines(content)
+        if pos is None:
+            return objects
+
+        # Try parsing as concatenated JSON (or a single object) from where lines stopped
         decoder = json.JSONDecoder()
-        pos = 0
+        pos = _skip_whitespace(content, pos).end()
         while pos < len(content):
             try:
-                obj, end_pos = decoder.raw_decode(content[pos:])
+                obj, pos = decoder.raw_decode(content, pos)
                 objects.append(obj)
-                pos += end_pos
                 # Skip whitespace and newlines
-                while pos < len(content) and content[pos].isspace():
-                    pos += 1
+                pos = _skip_whitespace(content, pos).end()
             except json.JSONDecodeError:
                 # This can happen if there's trailing non-JSON data, which we can ignore
                 # if we have already parsed at least one object.
@@ -115,6 +127,36 @@ class GenericOtelIngester(BaseIngester):
                     raise # Re-raise if we couldn't parse any object at all.
         return objects
 
+    def _parse_json_lines(self, content: str) -> Tuple[List[Dict], Optional[int]]:
+        """
+        Decode content as one JSON value per line.
+
+        Returns the decoded objects and None if every line decoded, or the
+        objects decoded so far and the offset of the first line that did not
+        (e.g. the opening line of a pretty-printed object) so the caller can
+        continue from there.
+        """
+        objects = []
+        offset = 0
+        for line in content.split('\n'):
+            if line and not line.isspace():
+                try:
+                    objects.append(json.loads(line))
+                except json.JSONDecodeError:
+                    return objects, offset
+            offset += len(line) + 1
+        return objects, None
+
+    def _group_spans_by_trace(self, spans: Iterable[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+        """Group spans by traceId, preserving first-seen trace order."""
+        traces: Dict[str, List[Dict[str, Any]]] = {}
+        for span in spans:
+            trace_id = span.get("traceId")
+            if trace_id:
+                if trace_id not in traces:
+                    traces[trace_id] = []
+                traces[trace_id].append(span)
+        return traces
 
     def _get_all_spans_from_payload(self, data: List[Dict]) -> List[Dict[str, Any]]:
         """Extracts a flat list of all spans from a list of OTLP/JSON trace objects."""
@@ -0,0 +1,280 @@
+# core/ingestion/otlp_stream.py
+"""
+Streaming OTLP/JSON Span Loader
+
+Yields spans one at a time, with their resource and scope, from exported
+OTLP/JSON traces without loading the whole document:
+
+  - a single OTLP object:       {"resourceSpans": [...]}
+  - a JSON array of them:       [{"resourceSpans": [...]}, ...]
+  - ndjson / concatenated JSON: {"resourceSpans": [...]}\\n{"resourceSpans": [...]}
+
+With empty_resources=True, a resource that has no spans is still reported,
+as a record whose span is None, so consumers that read resource attributes
+see every resource in the document, not just the ones with spans.
+
+The file is read in chunks and only the structural path
+resourceSpans[].scopeSpans[].spans[] is walked; every span, resource and scope
+is decoded on its own with json's raw_decode. Memory use is bounded by the
+largest single span (plus one resource's spans if a producer writes "resource"
+after "scopeSpans"), not by the file size.
+"""
+
+import codecs
+import io
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, IO, Iterator, List, Optional, Tuple, Union
+
+DEFAULT_CHUNK_SIZE = 1 << 20  # 1 MiB
+
+_WHITESPACE = ' \t\n\r'
+
+
+@dataclass
+class OtlpSpanRecord:
+    """
+    One span with the resource and instrumentation scope it was exported under.
+
+    `span` is None for a resource-only record (see iter_otlp_spans' empty_resources).
+    """
+    span: Optional[Dict[str, Any]]
+    resource: Dict[str, Any] = field(default_factory=dict)
+    scope: Dict[str, Any] = field(default_factory=dict)
+
+
+class _JsonStream:
+    """Chunked reader that decodes one JSON value at a time from a text stream."""
+
+    def __init__(self, read_chunk, chunk_size: int):
+        self._read_chunk = read_chunk
+        self.chunk_size = chunk_size
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+        self._decoder = json.JSONDecoder()
+
+    def _fill(self, min_chars: int) -> bool:
+        """Read at least min_chars more characters (or to EOF). Returns False at EOF."""
+        if self.eof:
+            return False
+        if self.pos and self.pos > len(self.buffer) // 2:
+            # Drop the consumed prefix so the buffer stays bounded
+            self.buffer = self.buffer[self.pos:]
+            self.pos = 0
+        parts = [self.buffer]
+        read = 0
+        while read < min_chars:
+            chunk = self._read_chunk(max(self.chunk_size, min_chars - read))
+            if not chunk:
+                self.eof = True
+                break
+            parts.append(chunk)
+            read += len(chunk)
+        self.buffer = ''.join(parts)
+        return read > 0
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character ('' at EOF)."""
+        while True:
+            buffer, pos = self.buffer, self.pos
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            self.pos = pos
+            if pos < len(buffer):
+                return buffer[pos]
+            if not self._fill(self.chunk_size):
+                return ''
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Invalid OTLP JSON: expected '{char}', found '{found or 'EOF'}'")
+        self.pos += 1
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value."""
+        self.peek()
+        want = self.chunk_size
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                # Possibly cut off at the end of the buffer: read more and retry
+                if not self._fill(want):
+                    raise
+                want = max(want, len(self.buffer) - self.pos)  # grow geometrically
+                continue
+            # A number or literal ending exactly at the buffer end may continue in the next chunk
+            if end == len(self.buffer) and self._fill(self.chunk_size):
+                continue
+            self.pos = end
+            return value
+
+    def items(self) -> Iterator[None]:
+        """Walk an array: position the stream at each element in turn."""
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield
+            sep = self.peek()
+            self.pos += 1
+            if sep == ']':
+                return
+            if sep != ',':
+                raise ValueError(f"Invalid OTLP JSON: expected ',' or ']', found '{sep or 'EOF'}'")
+
+    def members(self) -> Iterator[str]:
+        """Walk an object: yield each key with the stream positioned at its value."""
+        self.expect('{')
+        if self.peek() == '}':
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(':')
+            yield key
+            sep = self.peek()
+            self.pos += 1
+            if sep == '}':
+                return
+            if sep != ',':
+                raise ValueError(f"Invalid OTLP JSON: expected ',' or '}}', found '{sep or 'EOF'}'")
+
+
+def _open_text(source: Union[str, Path, IO]) -> Tuple[Any, Optional[IO]]:
+    """Return (read_chunk, file_to_close) for a path, text stream or binary stream."""
+    if isinstance(source, (str, Path)):
+        f = open(source, 'r', encoding='utf-8')
+        return f.read, f
+    if hasattr(source, 'read'):
+        if isinstance(source, io.TextIOBase):
+            return source.read, None
+        # Binary stream (e.g. an upload's BytesIO): decode incrementally
+        decoder = codecs.getincrementaldecoder('utf-8')()
+
+        def read_chunk(size: int) -> str:
+            data = source.read(size)
+            if isinstance(data, str):
+                return data
+            return decoder.decode(data, final=not data)
+
+        return read_chunk, None
+    raise ValueError(f"Unsupported source type: {type(source)}")
+
+
+def iter_otlp_spans(source: Union[str, Path, IO],
+                    chunk_size: int = DEFAULT_CHUNK_SIZE,
+                    empty_resources: bool = False) -> Iterator[OtlpSpanRecord]:
+    """
+    Stream spans from an OTLP/JSON file, JSON array or ndjson file.
+
+    Args:
+        source: File path, Path object, or text/binary file-like object
+        chunk_size: Characters read per chunk
+        empty_resources: Also yield a record with span=None for every
+            resource that has no spans, in document order
+
+    Yields:
+        OtlpSpanRecord for every span, in document order
+    """
+    read_chunk, to_close = _open_text(source)
+    try:
+        stream = _JsonStream(read_chunk, chunk_size)
+        parsed_any = False
+        while True:
+            first = stream.peek()
+            if not first:
+                return
+            try:
+                if first == '[':
+                    for _ in stream.items():
+                        yield from _walk_trace_object(stream, empty_resources)
+                elif first == '{':
+                    yield from _walk_trace_object(stream, empty_resources)
+                else:
+                    raise ValueError(f"Invalid OTLP JSON: unexpected '{first}'")
+            except (ValueError, json.JSONDecodeError):
+                # Trailing non-JSON data after at least one object is ignored
+                if parsed_any:
+                    return
+                raise
+            parsed_any = True
+    finally:
+        if to_close is not None:
+            to_close.close()
+
+
+def _walk_trace_object(stream: _JsonStream, empty_resources: bool) -> Iterator[OtlpSpanRecord]:
+    if stream.peek() != '{':
+        stream.value()  # Not an OTLP object; skip it
+        return
+    for key in stream.members():
+        if key == 'resourceSpans' and stream.peek() == '[':
+            for _ in stream.items():
+                yield from _walk_resource_span(stream, empty_resources)
+        else:
+            stream.value()
+
+
+def _walk_resource_span(stream: _JsonStream, empty_resources: bool) -> Iterator[OtlpSpanRecord]:
+    if stream.peek() != '{':
+        stream.value()
+        return
+    resource: Optional[Dict[str, Any]] = None
+    pending: List[OtlpSpanRecord] = []  # Spans seen before their resource
+    spans = 0
+    for key in stream.members():
+        if key == 'resource':
+            value = stream.value()
+            resource = value if isinstance(value, dict) else {}
+            for record in pending:
+                record.resource = resource
+            yield from pending
+            pending = []
+        elif key == 'scopeSpans' and stream.peek() == '[':
+            for _ in stream.items():
+                for record in _walk_scope_span(stream):
+                    spans += 1
+                    if resource is None:
+                        pending.append(record)
+                    else:
+                        record.resource = resource
+                        yield record
+        else:
+            stream.value()
+    yield from pending
+    if empty_resources and not spans and resource is not None:
+        yield OtlpSpanRecord(span=None, resource=resource)
+
+
+def _walk_scope_span(stream: _JsonStream) -> Iterator[OtlpSpanRecord]:
+    if stream.peek() != '{':
+        stream.value()
+        return
+    scope: Optional[Dict[str, Any]] = None
+    pending: List[OtlpSpanRecord] = []  # Spans seen before their scope
+    for key in stream.members():
+        if key == 'scope':
+            value = stream.value()
+            scope = value if isinstance(value, dict) else {}
+            for record in pending:
+                record.scope = scope
+            yield from pending
+            pending = []
+        elif key == 'spans' and stream.peek() == '[':
+            for _ in stream.items():
+                span = stream.value()
+                if not isinstance(span, dict):
+                    continue
+                record = OtlpSpanRecord(span=span, scope=scope if scope is not None else {})
+                if scope is None:
+                    pending.append(record)
+                else:
+                    yield record
+        else:
+            stream.value()
+    yield from pending
@@ -0,0 +1,206 @@
+"""
+Run Instrumentation
+Where the time in an evaluation run goes.
+
+run_evaluation_batch times its phases (pack load, trace preparation, item
+extraction, each pipeline stage, the summary) with a RunTimings, and code
+deeper in the call stack (redaction, section extraction) records into the
+same run through phase(), which does nothing when no run is being timed.
+Phases nest: redaction time is also part of extract_items. Wall time comes
+from time.perf_counter() and CPU time from time.process_time(), so a stage
+whose judge calls run on a thread pool reports the CPU of all its threads.
+
+LLMJudgeScorer records each call in `ScorerResult.timings`: render_seconds,
+latency_seconds (including retries and rate-limit waits), attempts, and the
+token usage the API reported. RunStats adds them up per run. Both end up in
+`summary_stats['timings']`:
+
+    {'wall_seconds': ..., 'cpu_seconds': ...,
+     'phases': {'load_pack': {'calls': 1, 'wall_seconds': ..., 'cpu_seconds': ...}, ...},
+     'judge': {'calls': ..., 'retries': ..., 'total_tokens': ..., 'latency': {'p50': ...}, ...}}
+
+With `self_trace=path`, run_evaluation_batch also writes the run itself as an
+OTLP/JSON trace (one span per phase, one per judge call) that this engine,
+or any OTLP viewer, can read.
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+SERVICE_NAME = 'lake-merritt'
+SCOPE_NAME = 'lake_merritt.instrumentation'
+ROOT_SPAN = 'lake_merritt.evaluation'
+
+# The RunTimings of the run being timed in this context, if any
+_active: ContextVar[Optional['RunTimings']] = ContextVar('lake_merritt_timings', default=None)
+_NO_PHASE = nullcontext()
+
+
+@dataclass
+class PhaseSpan:
+    """One timed phase, kept for the self-trace."""
+    name: str
+    start_ns: int
+    end_ns: int
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+
+class RunTimings:
+    """
+    Wall and CPU time per phase of one evaluation run.
+
+    Phases with the same name accumulate (calls, wall_seconds, cpu_seconds).
+    With `record_spans`, phases opened with span=True are also kept as
+    PhaseSpans for write_otlp().
+    """
+
+    def __init__(self, record_spans: bool = False):
+        self.record_spans = record_spans
+        self.spans: List[PhaseSpan] = []
+        self.phases: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._start_ns = time.time_ns()
+        self._start_wall = time.perf_counter()
+        self._start_cpu = time.process_time()
+        self._end_ns: Optional[int] = None
+        self._wall = 0.0
+        self._cpu = 0.0
+
+    @contextmanager
+    def phase(self, name: str, span: bool = True,
+              attributes: Optional[Dict[str, Any]] = None) -> Iterator[None]:
+        start_ns = time.time_ns() if self.record_spans and span else 0
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+            with self._lock:
+                totals = self.phases.setdefault(name, {'calls': 0, 'wall_seconds': 0.0,
+                                                       'cpu_seconds': 0.0})
+                totals['calls'] += 1
+                totals['wall_seconds'] += wall
+                totals['cpu_seconds'] += cpu
+                if start_ns:
+                    self.spans.append(PhaseSpan(name, start_ns, start_ns + int(wall * 1e9),
+                                                attributes or {}))
+
+    @contextmanager
+    def activate(self) -> Iterator['RunTimings']:
+        """Make this the run that phase() records into, for the duration of the block."""
+        token = _active.set(self)
+        try:
+            yield self
+        finally:
+            _active.reset(token)
+            self.stop()
+
+    def stop(self) -> None:
+        """Fix the run's total wall and CPU time (later phases still accumulate)."""
+        if self._end_ns is None:
+            self._end_ns = time.time_ns()
+            self._wall = time.perf_counter() - self._start_wall
+            self._cpu = time.process_time() - self._start_cpu
+
+    def summary(self) -> Dict[str, Any]:
+        self.stop()
+        with self._lock:
+            phases = {name: {'calls': totals['calls'],
+                             'wall_seconds': round(totals['wall_seconds'], 6),
+                             'cpu_seconds': round(totals['cpu_seconds'], 6)}
+                      for name, totals in self.phases.items()}
+        return {'wall_seconds': round(self._wall, 6), 'cpu_seconds': round(self._cpu, 6),
+                'phases': phases}
+
+    def otlp_trace(self, eval_pack: str, items: Iterable = ()) -> Dict[str, Any]:
+        """
+        The run as an OTLP/JSON trace.
+
+        A root span covers the run; phase spans and one span per judge call
+        (from the items' ScorerResult.timings) are its children.
+        """
+        self.stop()
+        trace_id = os.urandom(16).hex()
+        root_id = os.urandom(8).hex()
+
+        def span(name, start_ns, end_ns, attributes, parent=root_id, span_id=None):
+            record = {
+                'traceId': trace_id,
+                'spanId': span_id or os.urandom(8).hex(),
+                'name': name,
+                'kind': 1,  # SPAN_KIND_INTERNAL
+                'startTimeUnixNano': str(start_ns),
+                'endTimeUnixNano': str(end_ns),
+                'attributes': encode_attributes(attributes),
+            }
+            if parent:
+                record['parentSpanId'] = parent
+            return record
+
+        items = list(items)
+        spans = [span(ROOT_SPAN, self._start_ns, self._end_ns,
+                      {'lake_merritt.eval_pack': eval_pack, 'lake_merritt.items': len(items)},
+                      parent=None, span_id=root_id)]
+        with self._lock:
+            spans += [span(phase.name, phase.start_ns, phase.end_ns, phase.attributes)
+                      for phase in self.spans]
+        for item in items:
+            for result in item.scores:
+                timings = result.timings
+                if 'started_at' not in timings:
+                    continue
+                start_ns = int(timings['started_at'] * 1e9)
+                attributes = {
+                    'lake_merritt.item_id': item.id,
+                    'lake_merritt.scorer': result.scorer_name,
+                    'lake_merritt.judge.attempts': timings.get('attempts', 0),
+                    'gen_ai.request.model': timings.get('model'),
+                    'gen_ai.usage.input_tokens': timings.get('prompt_tokens'),
+                    'gen_ai.usage.output_tokens': timings.get('completion_tokens'),
+                }
+                spans.append(span(f"judge {item.id}", start_ns,
+                                  start_ns + int(timings.get('latency_seconds', 0) * 1e9),
+                                  attributes))
+
+        return {'resourceSpans': [{
+            'resource': {'attributes': encode_attributes({'service.name': SERVICE_NAME})},
+            'scopeSpans': [{'scope': {'name': SCOPE_NAME}, 'spans': spans}],
+        }]}
+
+    def write_otlp(self, path: Union[str, Path], eval_pack: str, items: Iterable = ()) -> None:
+        """Write the run's self-trace (see otlp_trace) as an OTLP/JSON file."""
+        with open(path, 'w') as f:
+            json.dump(self.otlp_trace(eval_pack, items), f)
+
+
+def phase(name: str, span: bool = False, attributes: Optional[Dict[str, Any]] = None):
+    """Time a block into the active run's timings; a no-op when no run is timed."""
+    timings = _active.get()
+    if timings is None:
+        return _NO_PHASE
+    return timings.phase(name, span, attributes)
+
+
+def encode_attributes(values: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Encode a dict as OTLP attributes, skipping None values (inverse of decode_attributes)."""
+    attributes = []
+    for key, value in values.items():
+        if value is None:
+            continue
+        if isinstance(value, bool):
+            encoded = {'boolValue': value}
+        elif isinstance(value, int):
+            encoded = {'intValue': str(value)}
+        elif isinstance(value, float):
+            encoded = {'doubleValue': value}
+        else:
+            encoded = {'stringValue': str(value)}
+        attributes.append({'key': key, 'value': encoded})
+    return attributes
@@ -0,0 +1,156 @@
+"""
+Redaction Engine
+Compiled, memoized redaction of secrets in trace content (Codex v2.1 issue #2).
+
+All SENSITIVE_PATTERNS are fused into one case-insensitive alternation that is
+compiled once. A literal prefilter skips the regex entirely for the common case
+of content that cannot contain a secret, and results are memoized by content so
+that strings repeated across spans, items and packs are only scanned once.
+"""
+
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional
+
+# Sensitive patterns for content redaction
+SENSITIVE_PATTERNS = [
+    r'sk-[a-zA-Z0-9]{20,}',  # OpenAI API keys
+    r'sk-ant-[a-zA-Z0-9-]+',  # Anthropic API keys
+    r'OPENAI_API_KEY\s*=\s*\S+',
+    r'api[_-]?key\s*[=:]\s*\S+',
+    r'password\s*[=:]\s*\S+',
+    r'secret\s*[=:]\s*\S+',
+    r'token\s*[=:]\s*[a-zA-Z0-9_-]{20,}',
+]
+
+# Every SENSITIVE_PATTERNS match contains one of these (compared case-folded)
+PREFILTER_LITERALS = ('sk-', 'key', 'password', 'secret', 'token')
+
+# Attribute keys whose values are always replaced wholesale
+SENSITIVE_ATTR_KEYS = ('api_key', 'password', 'secret', 'token', 'credential', 'auth')
+
+REDACTED = '[REDACTED]'
+DEFAULT_CACHE_SIZE = 4096
+DEFAULT_MAX_CACHE_CHARS = 64 * 1024 * 1024  # Memo holds inputs and outputs; bound it by size too
+
+
+class RedactionEngine:
+    """Single-pass redactor with a literal prefilter and an LRU memo keyed by content."""
+
+    def __init__(self,
+                 patterns: Iterable[str] = SENSITIVE_PATTERNS,
+                 prefilter_literals: Optional[Iterable[str]] = PREFILTER_LITERALS,
+                 cache_size: int = DEFAULT_CACHE_SIZE,
+                 max_cache_chars: int = DEFAULT_MAX_CACHE_CHARS):
+        patterns = list(patterns)
+        alternation = '|'.join(f'(?:{p})' for p in patterns)
+        leading = {p[:1] for p in patterns}
+        if all(c.isalpha() for c in leading):
+            # Lets the engine reject most positions on their first character
+            alternation = f"(?=[{''.join(sorted(leading))}])(?:{alternation})"
+        self.pattern = re.compile(alternation, re.IGNORECASE)
+
+        self.prefilter_literals = tuple(l.casefold() for l in prefilter_literals or ())
+        self.cache_size = cache_size
+        self.max_cache_chars = max_cache_chars
+        self._cache: 'OrderedDict[str, str]' = OrderedDict()
+        self._cache_chars = 0
+        self._lock = threading.Lock()
+        self.stats = {'calls': 0, 'cache_hits': 0, 'prefilter_skips': 0, 'scans': 0}
+
+    def redact(self, content: str) -> str:
+        """Return content with every sensitive match replaced by [REDACTED]."""
+        if not content:
+            return content
+
+        with self._lock:
+            self.stats['calls'] += 1
+            cached = self._cache.get(content)
+            if cached is not None:
+                self._cache.move_to_end(content)
+                self.stats['cache_hits'] += 1
+                return cached
+
+        if self.prefilter_literals and not self._may_contain_secret(content):
+            redacted = content
+            stat = 'prefilter_skips'
+        else:
+            redacted = self._substitute(content)
+            stat = 'scans'
+
+        with self._lock:
+            self.stats[stat] += 1
+            size = len(content) + (len(redacted) if redacted is not content else 0)
+            if self.cache_size > 0 and size <= self.max_cache_chars and content not in self._cache:
+                self._cache[content] = redacted
+                self._cache_chars += size
+                while len(self._cache) > self.cache_size or self._cache_chars > self.max_cache_chars:
+                    old_content, old_redacted = self._cache.popitem(last=False)
+                    self._cache_chars -= len(old_content) + (
+                        len(old_redacted) if old_redacted is not old_content else 0)
+        return redacted
+
+    def redact_attrs(self, attrs: Dict) -> Dict:
+        """Redact potentially sensitive data from attributes."""
+        redacted = {}
+        for key, value in attrs.items():
+            if any(s in key.lower() for s in SENSITIVE_ATTR_KEYS):
+                redacted[key] = REDACTED
+            elif isinstance(value, str):
+                redacted[key] = self.redact(value)
+            else:
+                redacted[key] = value
+        return redacted
+
+    def clear(self) -> None:
+        """Drop memoized results."""
+        with self._lock:
+            self._cache.clear()
+            self._cache_chars = 0
+
+    def _substitute(self, content: str) -> str:
+        """
+        Replace every match, merging matches that overlap into one [REDACTED].
+
+        The fused alternation takes the leftmost match, which can swallow the
+        start of an overlapping match of another pattern (e.g. a long token run
+        into `api_key = ...`). The old one-pass-per-pattern loop caught those,
+        so matches starting inside the current one extend it.
+        """
+        search = self.pattern.search
+        parts = []
+        last = 0
+        match = search(content)
+        while match:
+            start, end = match.span()
+            following = search(content, start + 1)
+            while following and following.start() < end:
+                end = max(end, following.end())
+                following = search(content, following.start() + 1)
+            parts.append(content[last:start])
+            parts.append(REDACTED)
+            last = end
+            match = following
+        if not parts:
+            return content
+        parts.append(content[last:])
+        return ''.join(parts)
+
+    def _may_contain_secret(self, content: str) -> bool:
+        folded = content.casefold()
+        return any(literal in folded for literal in self.prefilter_literals)
+
+
+# Shared engine used by core.evaluation
+default_engine = RedactionEngine()
+
+
+def redact_content(content: str) -> str:
+    """Redact sensitive patterns from content (Codex v2.1 issue #2)."""
+    return default_engine.redact(content)
+
+
+def redact_sensitive_attrs(attrs: Dict) -> Dict:
+    """Redact potentially sensitive data from attributes."""
+    return default_engine.redact_attrs(attrs)
@@ -0,0 +1,175 @@
+"""
+Streaming Report Writers
+Write evaluation reports item by item, as results are committed, instead of
+building the whole report in memory first.
+
+- JSON Lines: one `{"record": "item", ...}` line per item (the same fields as
+  EvaluationItem), then a trailing `{"record": "summary", "eval_pack": ...,
+  "summary_stats": {...}}` line. A report without a summary line is a run
+  that is still going (or was interrupted). Metadata the items share is
+  written once, as a `{"record": "trace_context", "values": {...}}` line
+  before the first item that uses it (see core/trace_context.py).
+- Markdown: the report title, then an item section per item, then the
+  summary once the run finishes.
+
+Both flush after every record so partial results can be followed with
+`tail -f` during long runs:
+
+    with ReportWriter(pack.name, jsonl_path, md_path) as writer:
+        results = run_evaluation_batch(trace, pack_path, on_item=writer.write_item)
+        writer.write_summary(results.summary_stats)
+
+EvaluationBatch.write_jsonl() / write_markdown() write a finished batch the
+same way, and EvaluationBatch.from_jsonl() reads a JSON Lines report back.
+"""
+
+import json
+from pathlib import Path
+from typing import IO, Any, Dict, Iterator, List, Optional, Union
+
+from .trace_context import metadata_context, own_metadata
+
+ITEM_RECORD = 'item'
+TRACE_CONTEXT_RECORD = 'trace_context'
+SUMMARY_RECORD = 'summary'
+
+# Characters of judge reasoning shown per score in Markdown reports
+MAX_MARKDOWN_REASONING = 500
+
+
+def item_record(item) -> Dict[str, Any]:
+    """JSON-ready dict of an EvaluationItem or PreparedItem, without its shared trace context."""
+    return {
+        'id': item.id,
+        'input': item.input,
+        'output': item.output,
+        'expected_output': item.expected_output,
+        'metadata': own_metadata(item.metadata),
+        'scores': [score.model_dump() for score in item.scores],
+    }
+
+
+def iter_jsonl_records(path: Union[str, Path]) -> Iterator[Dict[str, Any]]:
+    """Yield the records of a JSON Lines report, skipping blank lines."""
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def markdown_header(eval_pack: str) -> List[str]:
+    return [f"# Evaluation Report: {eval_pack}", ""]
+
+
+def markdown_summary(summary_stats: Dict[str, Any]) -> List[str]:
+    return [
+        "## Summary",
+        "",
+        f"- **Total Items:** {summary_stats.get('total_items', 0)}",
+        f"- **Passed:** {summary_stats.get('passed', 0)}",
+        f"- **Failed:** {summary_stats.get('failed', 0)}",
+        f"- **Average Score:** {summary_stats.get('average_score', 0):.2f}",
+        f"- **Status:** {summary_stats.get('status', 'UNKNOWN')}",
+        "",
+    ]
+
+
+def markdown_item(item) -> List[str]:
+    lines = [f"### {item.id}"]
+    for score in item.scores:
+        score_val = score.numeric_score if score.numeric_score is not None else 'N/A'
+        lines.append(f"- **Score:** {score_val:.2f}" if isinstance(score_val, float) else f"- **Score:** {score_val}")
+        lines.append(f"- **Passed:** {'YES' if score.passed else 'NO'}")
+        reasoning = score.reasoning or 'No reasoning provided'
+        if len(reasoning) > MAX_MARKDOWN_REASONING:
+            reasoning = reasoning[:MAX_MARKDOWN_REASONING] + '...'
+        lines.append(f"- **Reasoning:** {reasoning}")
+    lines.append("")
+    return lines
+
+
+class _StreamWriter:
+    """Owns (or borrows) a text stream and writes whole records to it."""
+
+    def __init__(self, target: Union[str, Path, IO[str]]):
+        if isinstance(target, (str, Path)):
+            self._file = open(target, 'w')
+            self._owns_file = True
+        else:
+            self._file = target
+            self._owns_file = False
+
+    def _write(self, text: str) -> None:
+        self._file.write(text)
+        self._file.flush()
+
+    def close(self) -> None:
+        if self._owns_file:
+            self._file.close()
+
+
+class JsonlReportWriter(_StreamWriter):
+    """JSON Lines report: one line per item, then a summary line."""
+
+    def __init__(self, target: Union[str, Path, IO[str]], eval_pack: str):
+        super().__init__(target)
+        self.eval_pack = eval_pack
+        self._context = None  # TraceContext written most recently
+
+    def write_item(self, item) -> None:
+        context = metadata_context(item.metadata)
+        if context is not None and context is not self._context:
+            record = {'record': TRACE_CONTEXT_RECORD, 'values': context.report_values()}
+            self._write(json.dumps(record, default=str) + '\n')
+            self._context = context
+        record = {'record': ITEM_RECORD, **item_record(item)}
+        self._write(json.dumps(record, default=str) + '\n')
+
+    def write_summary(self, summary_stats: Dict[str, Any]) -> None:
+        record = {'record': SUMMARY_RECORD, 'eval_pack': self.eval_pack,
+                  'summary_stats': summary_stats}
+        self._write(json.dumps(record, default=str) + '\n')
+
+
+class MarkdownReportWriter(_StreamWriter):
+    """Markdown report: title, item sections as they arrive, summary at the end."""
+
+    def __init__(self, target: Union[str, Path, IO[str]], eval_pack: str):
+        super().__init__(target)
+        self._write('\n'.join(markdown_header(eval_pack) + ["## Item Details", "", ""]))
+
+    def write_item(self, item) -> None:
+        self._write('\n'.join(markdown_item(item)) + '\n')
+
+    def write_summary(self, summary_stats: Dict[str, Any]) -> None:
+        self._write('\n'.join(markdown_summary(summary_stats)))
+
+
+class ReportWriter:
+    """Writes the same items and summary to a JSON Lines and/or Markdown report."""
+
+    def __init__(self, eval_pack: str, jsonl: Optional[Union[str, Path, IO[str]]] = None,
+                 markdown: Optional[Union[str, Path, IO[str]]] = None):
+        self.writers: List[_StreamWriter] = []
+        if jsonl is not None:
+            self.writers.append(JsonlReportWriter(jsonl, eval_pack))
+        if markdown is not None:
+            self.writers.append(MarkdownReportWriter(markdown, eval_pack))
+
+    def write_item(self, item) -> None:
+        for writer in self.writers:
+            writer.write_item(item)
+
+    def write_summary(self, summary_stats: Dict[str, Any]) -> None:
+        for writer in self.writers:
+            writer.write_summary(summary_stats)
+
+    def close(self) -> None:
+        for writer in self.writers:
+            writer.close()
+
+    def __enter__(self) -> 'ReportWriter':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
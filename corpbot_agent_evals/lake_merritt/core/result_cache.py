@@ -0,0 +1,243 @@
+"""
+Result Cache
+Content-addressed cache of judge results, so unchanged traces are not re-judged.
+
+Each pipeline stage's results for one trace are stored under a key derived from:
+
+- the trace content (spans and decoded attributes as evaluated, so the same
+  trace hashes the same whether it came from a dict or a streamed file);
+- the eval pack YAML file;
+- the stage (name, scorer, on_fail and config);
+- the judge model.
+
+Entries are JSON files in one directory. The cache is bounded by total size
+and entry age; least recently used entries are evicted first.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .data_models import PreparedItem, ScorerResult
+from .scoring.prompt_budget import DEFAULT_MODEL
+from .span_index import SpanIndex
+
+DEFAULT_CACHE_DIR = Path(__file__).parents[3] / '.observability' / 'cache' / 'results'
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024  # 256 MiB
+DEFAULT_MAX_AGE_SECONDS = 30 * 24 * 3600  # 30 days
+
+# Bump when the entry format or key derivation changes
+CACHE_FORMAT_VERSION = 1
+
+
+def _sha256_json(value: Any) -> str:
+    encoded = json.dumps(value, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+def trace_fingerprint(index: SpanIndex) -> str:
+    """Hash of a trace as the evaluator sees it (raw attribute lists excluded)."""
+    digest = hashlib.sha256()
+    digest.update(json.dumps(index.resource_metadata, sort_keys=True, default=str).encode('utf-8'))
+    for span, attrs in zip(index.spans, index.attributes):
+        view = {key: value for key, value in span.items() if key != 'attributes'}
+        digest.update(b'\n')
+        digest.update(json.dumps([view, attrs], sort_keys=True, default=str).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def file_fingerprint(path) -> str:
+    """Hash of a file's bytes."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def stage_fingerprint(stage) -> str:
+    """Hash of everything in a stage definition that affects its results."""
+    return _sha256_json({
+        'name': stage.name,
+        'scorer': stage.scorer,
+        'on_fail': stage.on_fail,
+        'config': stage.config,
+    })
+
+
+def stage_cache_key(trace_hash: str, pack_hash: str, stage) -> str:
+    """Cache key for one stage's results on one trace."""
+    model = stage.config.get('model', DEFAULT_MODEL)
+    return _sha256_json([CACHE_FORMAT_VERSION, trace_hash, pack_hash, stage_fingerprint(stage), model])
+
+
+def is_cacheable(result: ScorerResult) -> bool:
+    """Judge errors (API failures, render errors) are retried next run, not cached."""
+    return not result.error and 'error' not in (result.raw_response or {})
+
+
+class ResultCache:
+    """Directory of JSON entries with size- and age-bounded LRU eviction."""
+
+    def __init__(self,
+                 cache_dir=DEFAULT_CACHE_DIR,
+                 max_bytes: int = DEFAULT_MAX_BYTES,
+                 max_age_seconds: float = DEFAULT_MAX_AGE_SECONDS):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self._lock = threading.Lock()
+        self._entries: Optional[Dict[str, Tuple[int, float]]] = None  # key -> (size, last used)
+        self._total_bytes = 0
+        self.stats = {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0}
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def _load_index(self) -> Dict[str, Tuple[int, float]]:
+        """Scan the cache directory once; later changes are tracked in memory."""
+        if self._entries is None:
+            self._entries = {}
+            self._total_bytes = 0
+            if self.cache_dir.is_dir():
+                for path in self.cache_dir.glob('*.json'):
+                    try:
+                        st = path.stat()
+                    except OSError:
+                        continue
+                    self._entries[path.stem] = (st.st_size, st.st_mtime)
+                    self._total_bytes += st.st_size
+            self._evict(time.time())
+        return self._entries
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a cached entry, or None on a miss or an expired entry."""
+        with self._lock:
+            entries = self._load_index()
+            now = time.time()
+            if key not in entries or now - entries[key][1] > self.max_age_seconds:
+                self._remove(key)
+                self.stats['misses'] += 1
+                return None
+            path = self._path(key)
+            try:
+                with open(path) as f:
+                    entry = json.load(f)
+                os.utime(path, (now, now))
+            except (OSError, ValueError):
+                self._remove(key)
+                self.stats['misses'] += 1
+                return None
+            entries[key] = (entries[key][0], now)
+            self.stats['hits'] += 1
+            return entry
+
+    def put(self, key: str, entry: Dict[str, Any]) -> None:
+        """Store an entry (atomically replacing any previous one) and evict as needed."""
+        data = json.dumps(entry, default=str)
+        with self._lock:
+            entries = self._load_index()
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            path = self._path(key)
+            tmp_path = path.with_suffix(f'.{os.getpid()}.{threading.get_ident()}.tmp')
+            with open(tmp_path, 'w') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+
+            self._total_bytes -= entries.get(key, (0, 0))[0]
+            size = len(data.encode('utf-8'))
+            entries[key] = (size, time.time())
+            self._total_bytes += size
+            self.stats['stores'] += 1
+            self._evict(time.time())
+
+    def clear(self) -> None:
+        """Delete every entry."""
+        with self._lock:
+            for key in list(self._load_index()):
+                self._remove(key)
+
+    def _remove(self, key: str) -> None:
+        size = self._entries.pop(key, (0, 0))[0]
+        self._total_bytes -= size
+        try:
+            self._path(key).unlink()
+        except OSError:
+            pass
+
+    def _evict(self, now: float) -> None:
+        expired = [key for key, (_, used) in self._entries.items()
+                   if now - used > self.max_age_seconds]
+        for key in expired:
+            self._remove(key)
+        evicted = len(expired)
+        if self._total_bytes > self.max_bytes:
+            for key, _ in sorted(self._entries.items(), key=lambda e: e[1][1]):
+                if self._total_bytes <= self.max_bytes:
+                    break
+                self._remove(key)
+                evicted += 1
+        self.stats['evictions'] += evicted
+
+
+class PackResultCache:
+    """A ResultCache bound to one (trace, pack) pair, consulted stage by stage."""
+
+    def __init__(self, cache: ResultCache, trace_hash: str, pack_path, force: bool = False):
+        self.cache = cache
+        self.trace_hash = trace_hash
+        self.pack_hash = file_fingerprint(pack_path)
+        self.force = force
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, stage) -> str:
+        return stage_cache_key(self.trace_hash, self.pack_hash, stage)
+
+    def replay(self, stage, items: List[PreparedItem]) -> Optional[bool]:
+        """
+        Append a stage's cached results to items.
+
+        Returns whether the stage stopped on a failure, or None on a miss (with
+        force set, every lookup is a miss and the fresh results overwrite).
+        """
+        entry = None if self.force else self.cache.get(self.key(stage))
+        if entry is None or entry.get('item_ids') != [item.id for item in items]:
+            self.misses += 1
+            return None
+        self.hits += 1
+        for item in items:
+            result = entry['results'].get(item.id)
+            if result is not None:
+                item.scores.append(ScorerResult(**result))
+        return entry['stage_failed']
+
+    def store(self, stage, items: List[PreparedItem], scored_before: List[int],
+              stage_failed: bool) -> None:
+        """Cache the results a stage just added to items, unless any was a judge error."""
+        results = {}
+        for item, before in zip(items, scored_before):
+            new_scores = item.scores[before:]
+            if not new_scores:
+                continue
+            result = new_scores[0]
+            if not is_cacheable(result):
+                return
+            stored = result.model_dump()
+            # Replays make no judge request, so they carry no response cache outcome or timings
+            stored['details'].pop('response_cache', None)
+            stored.pop('timings', None)
+            results[item.id] = stored
+        self.cache.put(self.key(stage), {
+            'stage': stage.name,
+            'item_ids': [item.id for item in items],
+            'results': results,
+            'stage_failed': stage_failed,
+        })
+
+    def summary(self) -> Dict[str, int]:
+        return {'hits': self.hits, 'misses': self.misses}
@@ -1,3 +1,38 @@
-from .llm_judge import LLMJudgeScorer
+# Scorers are imported on first attribute access (PEP 562): LLMJudgeScorer
+# pulls in openai, tenacity and jinja2, which rule scorers and ingestion-only
+# tools never need.
+import importlib
 
-__all__ = ['LLMJudgeScorer']
+from .registry import available_scorers, get_scorer_class, register_scorer
+
+_LAZY_ATTRIBUTES = {
+    'LLMJudgeScorer': '.llm_judge',
+    'BatchJudge': '.batch_judge',
+    'ResponseCache': '.response_cache',
+    'RateLimiter': '.rate_limiter',
+    'PrecheckScorer': '.rule_based',
+}
+
+__all__ = [
+    'LLMJudgeScorer',
+    'BatchJudge',
+    'ResponseCache',
+    'RateLimiter',
+    'PrecheckScorer',
+    'available_scorers',
+    'get_scorer_class',
+    'register_scorer',
+]
+
+
+def __getattr__(name):
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value  # Later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,191 @@
+"""
+Batch Judge
+Runs many judge requests as one OpenAI Batch API job.
+
+For bulk re-scoring, latency does not matter but per-request overhead and
+rate limits do. A stage with `judge_mode: batch` renders every item's request,
+writes them to a JSONL batch file, uploads it, creates a batch against
+/v1/chat/completions, polls until the job finishes and maps each output line
+back to its request by custom_id. Identical requests are sent once.
+
+Stage config:
+
+    config:
+      judge_mode: batch
+      batch_poll_seconds: 30          # Status poll interval
+      batch_timeout_seconds: 86400    # Give up (and cancel) after this long
+      batch_dir: .observability/batches  # Keep the request file here (default: temp file)
+"""
+
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+BATCH_ENDPOINT = '/v1/chat/completions'
+COMPLETION_WINDOW = '24h'
+DEFAULT_POLL_SECONDS = 30
+DEFAULT_TIMEOUT_SECONDS = 24 * 3600
+
+# Batch statuses after which the job will not change again
+TERMINAL_STATUSES = ('completed', 'failed', 'expired', 'cancelled')
+
+
+class BatchJudgeError(Exception):
+    """A batch job, or one request within it, did not produce a usable response."""
+
+
+class BatchJudge:
+    """Submits judge requests through the Batch API and collects parsed responses."""
+
+    def __init__(self, client,
+                 poll_seconds: float = DEFAULT_POLL_SECONDS,
+                 timeout_seconds: float = DEFAULT_TIMEOUT_SECONDS,
+                 batch_dir: Optional[Union[str, Path]] = None,
+                 sleep=time.sleep):
+        self.client = client
+        self.poll_seconds = poll_seconds
+        self.timeout_seconds = timeout_seconds
+        self.batch_dir = Path(batch_dir) if batch_dir else None
+        self._sleep = sleep
+
+    @classmethod
+    def from_config(cls, client, config: Dict[str, Any]) -> 'BatchJudge':
+        return cls(
+            client,
+            poll_seconds=float(config.get('batch_poll_seconds', DEFAULT_POLL_SECONDS)),
+            timeout_seconds=float(config.get('batch_timeout_seconds', DEFAULT_TIMEOUT_SECONDS)),
+            batch_dir=config.get('batch_dir'),
+        )
+
+    def run(self, requests: Sequence) -> List[Union[Dict, Exception]]:
+        """
+        Send requests (objects with `cache_key` and `body()`) as one batch.
+
+        Returns, in request order, the parsed JSON verdict for each request or
+        the exception explaining why there is none.
+        """
+        if not requests:
+            return []
+
+        # One batch line per distinct request
+        custom_ids: Dict[str, str] = {}
+        lines = []
+        for request in requests:
+            if request.cache_key not in custom_ids:
+                custom_id = f"request-{len(custom_ids)}"
+                custom_ids[request.cache_key] = custom_id
+                lines.append({
+                    'custom_id': custom_id,
+                    'method': 'POST',
+                    'url': BATCH_ENDPOINT,
+                    'body': request.body(),
+                })
+
+        try:
+            outputs = self._submit(lines)
+        except Exception as e:
+            return [e for _ in requests]
+
+        results = []
+        for request in requests:
+            output = outputs.get(custom_ids[request.cache_key])
+            results.append(output if output is not None
+                           else BatchJudgeError("Batch returned no result for this request"))
+        return results
+
+    def _submit(self, lines: List[Dict]) -> Dict[str, Union[Dict, Exception]]:
+        """Upload the batch file, wait for the job and return custom_id -> outcome."""
+        path, keep = self._write_batch_file(lines)
+        try:
+            with open(path, 'rb') as f:
+                input_file = self.client.files.create(file=f, purpose='batch')
+        finally:
+            if not keep:
+                os.unlink(path)
+
+        batch = self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window=COMPLETION_WINDOW,
+        )
+        batch = self._wait(batch)
+        if batch.status != 'completed':
+            raise BatchJudgeError(f"Batch {batch.id} ended with status '{batch.status}'"
+                                  f"{self._describe_errors(batch)}")
+
+        outcomes: Dict[str, Union[Dict, Exception]] = {}
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if file_id:
+                for line in self.client.files.content(file_id).text.splitlines():
+                    if line.strip():
+                        custom_id, outcome = self._parse_output_line(json.loads(line))
+                        outcomes[custom_id] = outcome
+        return outcomes
+
+    def _write_batch_file(self, lines: List[Dict]) -> Tuple[Path, bool]:
+        """Write the JSONL request file. Returns its path and whether to keep it."""
+        if self.batch_dir is not None:
+            self.batch_dir.mkdir(parents=True, exist_ok=True)
+            fd, name = tempfile.mkstemp(prefix='judge_batch_', suffix='.jsonl', dir=self.batch_dir)
+            keep = True
+        else:
+            fd, name = tempfile.mkstemp(prefix='judge_batch_', suffix='.jsonl')
+            keep = False
+        with os.fdopen(fd, 'w') as f:
+            for line in lines:
+                f.write(json.dumps(line))
+                f.write('\n')
+        return Path(name), keep
+
+    def _wait(self, batch):
+        """Poll until the batch reaches a terminal status, cancelling it on timeout."""
+        deadline = time.monotonic() + self.timeout_seconds
+        while batch.status not in TERMINAL_STATUSES:
+            if time.monotonic() >= deadline:
+                try:
+                    self.client.batches.cancel(batch.id)
+                except Exception:
+                    pass
+                raise BatchJudgeError(
+                    f"Batch {batch.id} did not finish within {self.timeout_seconds:.0f}s "
+                    f"(last status '{batch.status}')"
+                )
+            self._sleep(self.poll_seconds)
+            batch = self.client.batches.retrieve(batch.id)
+        return batch
+
+    @staticmethod
+    def _describe_errors(batch) -> str:
+        errors = getattr(batch, 'errors', None)
+        data = getattr(errors, 'data', None) or []
+        messages = [getattr(e, 'message', None) for e in data]
+        messages = [m for m in messages if m]
+        return f": {'; '.join(messages)}" if messages else ''
+
+    @staticmethod
+    def _parse_output_line(line: Dict) -> Tuple[str, Union[Dict, Exception]]:
+        """Map one output/error file line to (custom_id, parsed verdict or error)."""
+        custom_id = line.get('custom_id')
+        if line.get('error'):
+            error = line['error']
+            message = error.get('message', error) if isinstance(error, dict) else error
+            return custom_id, BatchJudgeError(str(message))
+
+        response = line.get('response') or {}
+        if response.get('status_code') != 200:
+            body = response.get('body') or {}
+            message = (body.get('error') or {}).get('message') if isinstance(body, dict) else None
+            return custom_id, BatchJudgeError(
+                f"HTTP {response.get('status_code')}: {message or 'request failed'}")
+
+        try:
+            content = response['body']['choices'][0]['message']['content']
+            verdict = json.loads(content)
+        except (KeyError, IndexError, TypeError, ValueError) as e:
+            return custom_id, BatchJudgeError(f"Unparseable judge response: {e}")
+        if not isinstance(verdict, dict):
+            return custom_id, BatchJudgeError("Judge response is not a JSON object")
+        return custom_id, verdict
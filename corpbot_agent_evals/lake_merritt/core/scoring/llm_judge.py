@@ -8,27 +8,110 @@ Fixes in v2.2:
 
 import json
 import os
-from typing import Dict, Any
-from jinja2 import Environment, BaseLoader
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Any, FrozenSet, List, Optional, Tuple, Union
+from jinja2 import Environment, BaseLoader, Template, meta, pass_context
+from dotenv import load_dotenv
 from openai import OpenAI, APIError, RateLimitError, APIConnectionError, APITimeoutError, InternalServerError
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 
 from ..data_models import EvaluationItem, ScorerResult
+from ..serialization import DEFAULT_SERIALIZATION, SerializationTally, serialize, validate_serialization
+from .batch_judge import BatchJudge
+from .prompt_budget import (
+    DEFAULT_MAX_PROMPT_TOKENS, DEFAULT_MODEL, estimate_tokens, iter_compactions, with_compacted_trace
+)
+from .rate_limiter import DEFAULT_COMPLETION_TOKENS, RateLimiter, retry_after_seconds, shared_rate_limiter
+from .registry import register_scorer
+from .response_cache import ResponseCache, request_key
 
 # Retry configuration
 MAX_RETRIES = 3
 RETRY_WAIT_MIN = 1  # seconds
 RETRY_WAIT_MAX = 10  # seconds
 REQUEST_TIMEOUT = 60  # seconds
+RETRY_AFTER_MAX = 60  # seconds; longest server-requested pause honored per retry
 
-# Prompt size limits
-MAX_PROMPT_CHARS = 100000  # ~25k tokens
+# .env in the repo root, loaded when a judge is constructed rather than at import
+ENV_FILE = Path(__file__).parents[4] / '.env'
 
+# Common metadata shortcuts (P0: expanded list) and their defaults when missing
+METADATA_SHORTCUTS = {
+    'breaker_review': 'No breaker review found',
+    'change_log': 'No change log found',
+    'reviewer_suggestions': 'No reviewer suggestions found',
+    'user_prompt': 'No user prompt found',
+    'otel_trace': [],
+    'attributes': {},
+    'approvals': [],
+    'all_approved': False,
+    'data_quality': {},
+}
 
+
+@dataclass
+class JudgeRequest:
+    """A rendered judge request, ready to send or to write into a batch file."""
+    model: str
+    temperature: float
+    system_prompt: str
+    user_prompt: str
+    threshold: float
+    details: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def cache_key(self) -> str:
+        return request_key(self.model, self.temperature, self.system_prompt, self.user_prompt)
+
+    def body(self) -> Dict[str, Any]:
+        """Chat completions request body."""
+        return {
+            'model': self.model,
+            'temperature': self.temperature,
+            'messages': [
+                {"role": "system", "content": self.system_prompt},
+                {"role": "user", "content": self.user_prompt}
+            ],
+            'response_format': {"type": "json_object"},
+        }
+
+
+# Render context variable holding the prompt's SerializationTally
+TALLY_VARIABLE = '_serialization'
+
+
+@pass_context
+def tojson_filter(context, value) -> str:
+    """Jinja2 `tojson` filter: serialize in the stage's format and tally the size."""
+    tally = context.get(TALLY_VARIABLE)
+    text = serialize(value, tally.format if tally is not None else DEFAULT_SERIALIZATION)
+    if tally is not None:
+        tally.add(value, text)
+    return text
+
+
+_exponential_wait = wait_exponential(multiplier=1, min=RETRY_WAIT_MIN, max=RETRY_WAIT_MAX)
+
+
+def wait_retry_after_or_exponential(retry_state) -> float:
+    """Wait as long as a 429's Retry-After asks, else back off exponentially."""
+    error = retry_state.outcome.exception() if retry_state.outcome else None
+    retry_after = retry_after_seconds(error) if error is not None else None
+    if retry_after is not None:
+        return min(max(retry_after, 0.0), RETRY_AFTER_MAX)
+    return _exponential_wait(retry_state)
+
+
+@register_scorer('llm_judge')
 class LLMJudgeScorer:
     """Scores items using LLM-as-judge via OpenAI API with retry logic."""
 
-    def __init__(self):
+    def __init__(self, response_cache: Optional[ResponseCache] = None):
+        # Variables already in the environment win over .env
+        load_dotenv(ENV_FILE)
         api_key = os.getenv('OPENAI_API_KEY')
         if not api_key:
             raise ValueError(
@@ -39,21 +122,145 @@ class LLMJudgeScorer:
         self.client = OpenAI(api_key=api_key, timeout=REQUEST_TIMEOUT)
         self.jinja_env = Environment(loader=BaseLoader(), autoescape=False)
 
-        # Add tojson filter for Jinja2
-        self.jinja_env.filters['tojson'] = lambda x: json.dumps(x, indent=2, default=str)
+        # Add tojson filter for Jinja2 (format set per stage by `serialization`)
+        self.jinja_env.filters['tojson'] = tojson_filter
+
+        # Compiled templates and the variables they use, by template source
+        self._templates: Dict[str, Tuple[Template, FrozenSet[str]]] = {}
+        self._template_lock = threading.Lock()
+
+        # Opt-in response caches: this one, or one per stage `response_cache` setting
+        self.response_cache = response_cache
+        self._stage_caches: Dict[str, ResponseCache] = {}
+        self._cache_lock = threading.Lock()
 
     def score(self, item: EvaluationItem, config: Dict[str, Any]) -> ScorerResult:
         """Score an item using LLM judgment with retry logic."""
-        model = config.get('model', 'gpt-4o')
+        render_start = time.perf_counter()
+        request = self.prepare_request(item, config)
+        if isinstance(request, ScorerResult):
+            return request
+        # Per-call instrumentation, summed per run by RunStats (core/instrumentation.py)
+        timings = {'model': request.model,
+                   'render_seconds': round(time.perf_counter() - render_start, 6)}
+
+        # Reuse an identical earlier request if caching is on
+        cache = self._response_cache_for(config)
+        # Pace calls under the account's RPM/TPM limits if configured
+        rate_limiter = shared_rate_limiter(config.get('rate_limit'))
+        details = dict(request.details)
+
+        # Make API call with retry
+        try:
+            result_json = None
+            if cache is not None:
+                result_json = cache.get(request.cache_key)
+                details['response_cache'] = 'miss' if result_json is None else 'hit'
+            if result_json is None:
+                timings['started_at'] = time.time()
+                call_start = time.perf_counter()
+                try:
+                    result_json = self._call_api_with_retry(request.model, request.temperature,
+                                                            request.system_prompt, request.user_prompt,
+                                                            rate_limiter=rate_limiter, timings=timings)
+                finally:
+                    # Includes retry back-off and rate-limit waits
+                    timings['latency_seconds'] = round(time.perf_counter() - call_start, 6)
+                if cache is not None:
+                    cache.put(request.cache_key, result_json)
+
+            result = self.result_from_response(result_json, request.threshold, details)
+
+        except Exception as e:
+            result = self.error_result(f"LLM call failed after retries: {str(e)}", e)
+
+        result.timings = timings
+        return result
+
+    def score_batch(self, items: List[EvaluationItem], config: Dict[str, Any]) -> List[ScorerResult]:
+        """
+        Score items with one provider batch job instead of one call per item.
+
+        Used for stages with `judge_mode: batch`. Cached responses are reused,
+        identical requests are sent once, and results come back in item order.
+        """
+        cache = self._response_cache_for(config)
+        results: List[Optional[ScorerResult]] = [None] * len(items)
+        pending: List[Tuple[int, JudgeRequest, Dict]] = []
+        timings: Dict[int, Dict[str, Any]] = {}
+
+        for i, item in enumerate(items):
+            render_start = time.perf_counter()
+            request = self.prepare_request(item, config)
+            if isinstance(request, ScorerResult):
+                results[i] = request
+                continue
+            # Batch jobs report no per-request latency; only rendering is timed
+            timings[i] = {'model': request.model,
+                          'render_seconds': round(time.perf_counter() - render_start, 6)}
+            details = dict(request.details)
+            if cache is not None:
+                result_json = cache.get(request.cache_key)
+                details['response_cache'] = 'miss' if result_json is None else 'hit'
+                if result_json is not None:
+                    results[i] = self.result_from_response(result_json, request.threshold, details)
+                    continue
+            pending.append((i, request, details))
+
+        if pending:
+            runner = BatchJudge.from_config(self.client, config)
+            outcomes = runner.run([request for _, request, _ in pending])
+            for (i, request, details), outcome in zip(pending, outcomes):
+                if isinstance(outcome, Exception):
+                    results[i] = self.error_result(f"LLM batch request failed: {str(outcome)}", outcome)
+                    continue
+                if cache is not None:
+                    cache.put(request.cache_key, outcome)
+                results[i] = self.result_from_response(outcome, request.threshold, details)
+
+        for i, item_timings in timings.items():
+            results[i].timings = item_timings
+        return results
+
+    def prepare_request(self, item: EvaluationItem, config: Dict[str, Any]) -> Union['JudgeRequest', ScorerResult]:
+        """Render the judge request for an item, or return a failed result if it cannot be sent."""
+        model = config.get('model', DEFAULT_MODEL)
         temperature = config.get('temperature', 0.0)
         threshold = config.get('threshold', 0.7)
 
         # Build prompt using Jinja2
         system_prompt = config.get('system_prompt', 'You are an evaluation judge. Return JSON with "score" (0.0-1.0) and "reasoning" fields.')
         user_template = config.get('user_prompt_template', '{{ input }}')
+        # Budget in estimated tokens; over it, trace context is compacted to fit
+        max_tokens = config.get('max_prompt_tokens', DEFAULT_MAX_PROMPT_TOKENS)
+        details = {}
 
         try:
-            user_prompt = self._render_template(user_template, item)
+            serialization = validate_serialization(config.get('serialization', DEFAULT_SERIALIZATION))
+            tally = SerializationTally(serialization)
+            user_prompt = self._render_template(user_template, item, tally)
+            prompt_tokens = estimate_tokens(system_prompt, user_prompt)
+
+            # Over budget: compact the trace context step by step until it fits
+            trace = (item.metadata or {}).get('otel_trace')
+            if prompt_tokens > max_tokens and trace:
+                original_tokens = prompt_tokens
+                for level, compacted in enumerate(iter_compactions(trace), 1):
+                    tally = SerializationTally(serialization)
+                    compacted_item = with_compacted_trace(item, compacted)
+                    user_prompt = self._render_template(user_template, compacted_item, tally)
+                    prompt_tokens = estimate_tokens(system_prompt, user_prompt)
+                    if prompt_tokens <= max_tokens:
+                        break
+                details['compaction'] = {
+                    'level': level,
+                    'original_tokens': original_tokens,
+                    'prompt_tokens': prompt_tokens,
+                    'spans': len(trace),
+                    'entries': len(compacted),
+                }
+            if tally.details():
+                details['serialization'] = tally.details()
         except Exception as e:
             return ScorerResult(
                 scorer_name='llm_judge',
@@ -64,76 +271,103 @@ class LLMJudgeScorer:
             )
 
         # Check prompt size
-        total_prompt_size = len(system_prompt) + len(user_prompt)
-        if total_prompt_size > MAX_PROMPT_CHARS:
+        if prompt_tokens > max_tokens:
             return ScorerResult(
                 scorer_name='llm_judge',
                 numeric_score=0.0,
                 passed=False,
-                reasoning=f"Prompt too large: {total_prompt_size} chars (max {MAX_PROMPT_CHARS})",
-                raw_response={'error': 'prompt_too_large', 'size': total_prompt_size}
+                reasoning=f"Prompt too large: ~{prompt_tokens} tokens (max {max_tokens})",
+                details=details,
+                raw_response={'error': 'prompt_too_large', 'tokens': prompt_tokens, 'max_tokens': max_tokens}
             )
 
-        # Make API call with retry
-        try:
-            result_json = self._call_api_with_retry(model, temperature, system_prompt, user_prompt)
+        return JudgeRequest(model, temperature, system_prompt, user_prompt, threshold, details)
 
-            # Extract score from response
-            score = result_json.get('score', result_json.get('overall_score', 0.5))
-            reasoning = result_json.get('reasoning', json.dumps(result_json))
+    def result_from_response(self, result_json: Dict, threshold: float,
+                             details: Optional[Dict[str, Any]] = None) -> ScorerResult:
+        """Turn a parsed judge response into a ScorerResult."""
+        # Extract score from response
+        score = result_json.get('score', result_json.get('overall_score', 0.5))
+        reasoning = result_json.get('reasoning', json.dumps(result_json))
 
-            # Handle case where score is not a number
-            try:
-                score = float(score)
-            except (TypeError, ValueError):
-                score = 0.5
+        # Handle case where score is not a number
+        try:
+            score = float(score)
+        except (TypeError, ValueError):
+            score = 0.5
 
-            return ScorerResult(
-                scorer_name='llm_judge',
-                numeric_score=score,
-                passed=score >= threshold,
-                reasoning=str(reasoning),
-                raw_response=result_json
-            )
+        return ScorerResult(
+            scorer_name='llm_judge',
+            numeric_score=score,
+            passed=score >= threshold,
+            reasoning=str(reasoning),
+            details=details or {},
+            raw_response=result_json
+        )
 
-        except Exception as e:
-            return ScorerResult(
-                scorer_name='llm_judge',
-                numeric_score=0.0,
-                passed=False,
-                reasoning=f"LLM call failed after retries: {str(e)}",
-                raw_response={'error': str(e)}
-            )
+    def error_result(self, reasoning: str, error: Exception) -> ScorerResult:
+        """A failed result for a judge call that did not return a usable response."""
+        return ScorerResult(
+            scorer_name='llm_judge',
+            numeric_score=0.0,
+            passed=False,
+            reasoning=reasoning,
+            raw_response={'error': str(error)}
+        )
 
-    def _render_template(self, template_str: str, item: EvaluationItem) -> str:
-        """Render Jinja2 template with item data."""
-        template = self.jinja_env.from_string(template_str)
+    def _response_cache_for(self, config: Dict[str, Any]) -> Optional[ResponseCache]:
+        """Return the response cache for a stage config, if caching is enabled."""
+        setting = config.get('response_cache')
+        if setting is None:
+            return self.response_cache
+        key = json.dumps(setting, sort_keys=True, default=str)
+        with self._cache_lock:
+            if key not in self._stage_caches:
+                self._stage_caches[key] = ResponseCache.from_config(setting)
+            return self._stage_caches[key]
 
-        # Build context with all available data
-        context = {
-            'input': item.input or '',
-            'metadata': item.metadata or {},
-            'id': item.id,
-            'expected_output': item.expected_output or '',
-        }
+    def _compile_template(self, template_str: str) -> Tuple[Template, FrozenSet[str]]:
+        """Parse and compile a template once; later calls reuse it for every item and pack."""
+        with self._template_lock:
+            compiled = self._templates.get(template_str)
+            if compiled is None:
+                ast = self.jinja_env.parse(template_str)
+                variables = frozenset(meta.find_undeclared_variables(ast))
+                compiled = (self.jinja_env.from_string(ast), variables)
+                self._templates[template_str] = compiled
+            return compiled
+
+    def _render_template(self, template_str: str, item: EvaluationItem,
+                         tally: Optional[SerializationTally] = None) -> str:
+        """Render Jinja2 template with item data, tallying serialized sizes into tally."""
+        template, variables = self._compile_template(template_str)
+        if tally is None:
+            tally = SerializationTally(DEFAULT_SERIALIZATION)
 
-        # Add common metadata shortcuts (P0: expanded list)
-        if item.metadata:
-            context['breaker_review'] = item.metadata.get('breaker_review', 'No breaker review found')
-            context['change_log'] = item.metadata.get('change_log', 'No change log found')
-            context['reviewer_suggestions'] = item.metadata.get('reviewer_suggestions', 'No reviewer suggestions found')
-            context['user_prompt'] = item.metadata.get('user_prompt', 'No user prompt found')
-            context['otel_trace'] = item.metadata.get('otel_trace', [])
-            context['attributes'] = item.metadata.get('attributes', {})
-            context['approvals'] = item.metadata.get('approvals', [])
-            context['all_approved'] = item.metadata.get('all_approved', False)
-            context['data_quality'] = item.metadata.get('data_quality', {})
+        # Build only the context the template refers to
+        context = {TALLY_VARIABLE: tally}
+        for name in variables:
+            if name == 'input':
+                context['input'] = item.input or ''
+                # A trace-level item's input is its serialized trace summary
+                if tally.format != DEFAULT_SERIALIZATION and item.input_serialization == tally.format:
+                    tally.add((item.metadata or {}).get('otel_trace'), item.input)
+            elif name == 'metadata':
+                # Shared trace context is flattened in only when a template uses all of it
+                metadata = item.metadata or {}
+                context['metadata'] = metadata if isinstance(metadata, dict) else dict(metadata)
+            elif name == 'id':
+                context['id'] = item.id
+            elif name == 'expected_output':
+                context['expected_output'] = item.expected_output or ''
+            elif name in METADATA_SHORTCUTS and item.metadata:
+                context[name] = item.metadata.get(name, METADATA_SHORTCUTS[name])
 
         return template.render(**context)
 
     @retry(
         stop=stop_after_attempt(MAX_RETRIES),
-        wait=wait_exponential(multiplier=1, min=RETRY_WAIT_MIN, max=RETRY_WAIT_MAX),
+        wait=wait_retry_after_or_exponential,
         retry=retry_if_exception_type((
             RateLimitError,
             APIConnectionError,
@@ -143,17 +377,42 @@ class LLMJudgeScorer:
         ))
     )
     def _call_api_with_retry(self, model: str, temperature: float,
-                             system_prompt: str, user_prompt: str) -> Dict:
-        """Make OpenAI API call with retry on transient errors."""
-        response = self.client.chat.completions.create(
-            model=model,
-            temperature=temperature,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
-            response_format={"type": "json_object"}
-        )
+                             system_prompt: str, user_prompt: str,
+                             rate_limiter: Optional[RateLimiter] = None,
+                             timings: Optional[Dict[str, Any]] = None) -> Dict:
+        """
+        Make OpenAI API call with retry on transient errors, paced by rate_limiter.
+
+        Attempts and the reported token usage are recorded into `timings`.
+        """
+        if timings is not None:
+            timings['attempts'] = timings.get('attempts', 0) + 1
+        estimated_tokens = estimate_tokens(system_prompt, user_prompt) + DEFAULT_COMPLETION_TOKENS
+        if rate_limiter is not None:
+            rate_limiter.acquire(estimated_tokens)
+
+        try:
+            response = self.client.chat.completions.create(
+                model=model,
+                temperature=temperature,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt}
+                ],
+                response_format={"type": "json_object"}
+            )
+        except RateLimitError as e:
+            if rate_limiter is not None:
+                rate_limiter.penalize(retry_after_seconds(e) or RETRY_WAIT_MIN)
+            raise
+
+        usage = getattr(response, 'usage', None)
+        if rate_limiter is not None and usage is not None:
+            rate_limiter.settle(estimated_tokens, getattr(usage, 'total_tokens', None))
+        if timings is not None and usage is not None:
+            for name in ('prompt_tokens', 'completion_tokens', 'total_tokens'):
+                if getattr(usage, name, None) is not None:
+                    timings[name] = getattr(usage, name)
 
         result_text = response.choices[0].message.content
         return json.loads(result_text)
@@ -0,0 +1,142 @@
+"""
+Prompt Budget
+Token estimates for judge prompts and compaction of trace context to fit them.
+
+Trace-level packs render the whole trace summary (`otel_trace | tojson`) into
+the judge prompt. When the rendered prompt is over the stage's token budget,
+the trace is compacted in increasingly aggressive steps until it fits:
+
+1. Repeated span content is replaced with a reference to its first occurrence.
+2. Content of the middle spans is shortened, keeping the first and last spans
+   (usually the request and the outcome) intact.
+3. Middle content is dropped, then consecutive middle spans from the same
+   agent are merged into one entry with a span count.
+
+Span names, agents and start/end timestamps are kept at every step, so timing
+and attribution questions can still be answered from a compacted trace.
+
+Stage config:
+
+    config:
+      max_prompt_tokens: 25000   # Budget for system + user prompt
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional
+
+from ..data_models import EvaluationItem
+from ..serialization import serialize
+
+# Rough prompt size estimate (~4 chars/token for English text and JSON)
+CHARS_PER_TOKEN = 4
+
+# Judge model used when a stage config does not set `model`
+DEFAULT_MODEL = 'gpt-4o'
+
+# Prompt budget used when a stage config does not set `max_prompt_tokens`
+DEFAULT_MAX_PROMPT_TOKENS = 25000
+
+
+def estimate_tokens(*texts: str) -> int:
+    """Estimate the prompt tokens of the given texts."""
+    return sum(math.ceil(len(text) / CHARS_PER_TOKEN) for text in texts if text)
+
+
+@dataclass(frozen=True)
+class CompactionLevel:
+    """How far to compact: which spans keep their content, and how much of it."""
+    edge_spans: Optional[int]  # Spans kept whole at each end of the trace (None: all)
+    middle_chars: int = 0      # Content kept for the other spans
+    merge_middle: bool = False  # Merge consecutive middle spans from one agent
+
+
+COMPACTION_LEVELS = (
+    CompactionLevel(edge_spans=None),
+    CompactionLevel(edge_spans=10, middle_chars=200),
+    CompactionLevel(edge_spans=5, middle_chars=80),
+    CompactionLevel(edge_spans=3),
+    CompactionLevel(edge_spans=2, merge_middle=True),
+)
+
+
+def shorten(content: str, max_chars: int) -> str:
+    """Keep the first max_chars characters of content, noting how many were cut."""
+    if not content or len(content) <= max_chars:
+        return content or ''
+    if max_chars <= 0:
+        return f"[{len(content)} chars omitted]"
+    return content[:max_chars] + f" ... [{len(content) - max_chars} chars omitted]"
+
+
+def compact_trace(trace: List[Dict[str, Any]], level: CompactionLevel) -> List[Dict[str, Any]]:
+    """Return a compacted copy of a trace summary (a list of span entries)."""
+    count = len(trace)
+    first_seen: Dict[str, Any] = {}
+    compacted = []
+    for i, span in enumerate(trace):
+        entry = dict(span)
+        content = entry.get('content')
+        if isinstance(content, str) and content:
+            if content in first_seen:
+                entry['content'] = f"[same as span {first_seen[content]}]"
+            else:
+                first_seen[content] = span.get('spanId') or i
+                if level.edge_spans is not None and level.edge_spans <= i < count - level.edge_spans:
+                    entry['content'] = shorten(content, level.middle_chars)
+        compacted.append(entry)
+
+    if level.merge_middle and level.edge_spans is not None:
+        edge = level.edge_spans
+        compacted = (compacted[:edge]
+                     + merge_agent_runs(compacted[edge:max(edge, count - edge)])
+                     + compacted[max(edge, count - edge):])
+    return compacted
+
+
+def merge_agent_runs(spans: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Merge consecutive spans from the same agent into one entry spanning their times."""
+    runs: List[List[Dict[str, Any]]] = []
+    for span in spans:
+        if runs and runs[-1][0].get('agent') == span.get('agent'):
+            runs[-1].append(span)
+        else:
+            runs.append([span])
+
+    merged = []
+    for run in runs:
+        if len(run) == 1:
+            merged.append(run[0])
+            continue
+        names = {span.get('name') for span in run}
+        merged.append({
+            'name': f"{run[0].get('name')} (x{len(run)})" if len(names) == 1 else f"{len(run)} spans",
+            'startTime': run[0].get('startTime'),
+            'endTime': run[-1].get('endTime'),
+            'agent': run[0].get('agent'),
+            'content': '',
+            'spanCount': len(run),
+        })
+    return merged
+
+
+def iter_compactions(trace: List[Dict[str, Any]]) -> Iterator[List[Dict[str, Any]]]:
+    """Yield the trace at each compaction level, least compacted first."""
+    for level in COMPACTION_LEVELS:
+        yield compact_trace(trace, level)
+
+
+def with_compacted_trace(item: EvaluationItem, compacted: List[Dict[str, Any]]) -> EvaluationItem:
+    """
+    A copy of an item whose trace context is the compacted trace.
+
+    `otel_trace` is replaced, and so is `input` when it is the same summary
+    serialized (item.input_serialization is set, as on trace-level items),
+    in that same format whatever the stage's serialization; the original
+    item is left untouched.
+    """
+    metadata = dict(item.metadata or {})
+    update: Dict[str, Any] = {'metadata': {**metadata, 'otel_trace': compacted}}
+    if item.input_serialization is not None:
+        update['input'] = serialize(compacted, item.input_serialization)
+    return item.model_copy(update=update)
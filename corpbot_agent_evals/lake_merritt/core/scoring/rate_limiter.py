@@ -0,0 +1,253 @@
+"""
+Judge Rate Limiter
+Client-side token buckets for requests per minute (RPM) and tokens per minute (TPM).
+
+Rather than discovering the account limits through 429s and exponential
+backoff, judge calls wait for capacity in two buckets that refill continuously
+at a little under the configured limits. A 429's Retry-After pauses every
+caller sharing the limiter. With a state file, the buckets live on disk behind
+an fcntl lock, so concurrent scorers in one process and parallel
+run-skill-eval.sh / core.batch processes draw from the same budget.
+
+Enable per stage in an eval pack:
+
+    config:
+      rate_limit:
+        requests_per_minute: 500
+        tokens_per_minute: 30000
+        headroom: 0.9                        # Pace at 90% of the limits
+        state_file: .observability/cache/rate_limit.json   # Default; null for in-process only
+
+or for every stage with JUDGE_RPM_LIMIT / JUDGE_TPM_LIMIT in .env.
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: buckets are shared within the process only
+    fcntl = None
+
+DEFAULT_STATE_FILE = Path(__file__).parents[4] / '.observability' / 'cache' / 'rate_limit.json'
+DEFAULT_HEADROOM = 0.9
+
+# Tokens budgeted for a judge reply until the real usage is known
+DEFAULT_COMPLETION_TOKENS = 300
+
+RPM_ENV = 'JUDGE_RPM_LIMIT'
+TPM_ENV = 'JUDGE_TPM_LIMIT'
+
+
+def retry_after_seconds(error: BaseException) -> Optional[float]:
+    """Read Retry-After (or retry-after-ms) from an API error's response headers."""
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None)
+    if not headers:
+        return None
+    try:
+        if headers.get('retry-after-ms') is not None:
+            return float(headers['retry-after-ms']) / 1000.0
+        if headers.get('retry-after') is not None:
+            return float(headers['retry-after'])
+    except (TypeError, ValueError):
+        # HTTP-date Retry-After values are not used by the OpenAI API
+        return None
+    return None
+
+
+class RateLimiter:
+    """
+    RPM/TPM token buckets, optionally shared across processes through a state file.
+
+    Each bucket holds at most one minute of budget (limit * headroom) and
+    refills at that amount per minute, so calls are paced just under the
+    account limit instead of bursting into 429s.
+    """
+
+    def __init__(self,
+                 requests_per_minute: Optional[float] = None,
+                 tokens_per_minute: Optional[float] = None,
+                 headroom: float = DEFAULT_HEADROOM,
+                 state_file: Optional[Path] = DEFAULT_STATE_FILE,
+                 clock=time.time,
+                 sleep=time.sleep):
+        if not requests_per_minute and not tokens_per_minute:
+            raise ValueError("RateLimiter needs requests_per_minute and/or tokens_per_minute")
+        if not 0 < headroom <= 1:
+            raise ValueError(f"Invalid rate limit headroom: {headroom}")
+        self.capacity = {
+            'requests': (requests_per_minute or 0) * headroom,
+            'tokens': (tokens_per_minute or 0) * headroom,
+        }
+        self.state_file = Path(state_file) if state_file and fcntl is not None else None
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._state: Optional[Dict[str, float]] = None
+        self.stats = {'acquired': 0, 'waits': 0, 'wait_seconds': 0.0, 'penalties': 0}
+
+    @classmethod
+    def from_config(cls, config: Any) -> Optional['RateLimiter']:
+        """Build a limiter from a stage's `rate_limit` mapping (None when off)."""
+        if not config:
+            return None
+        if not isinstance(config, dict):
+            raise ValueError(f"Invalid rate_limit setting: {config!r}")
+        return cls(
+            requests_per_minute=config.get('requests_per_minute'),
+            tokens_per_minute=config.get('tokens_per_minute'),
+            headroom=float(config.get('headroom', DEFAULT_HEADROOM)),
+            state_file=config.get('state_file', DEFAULT_STATE_FILE),
+        )
+
+    @classmethod
+    def from_env(cls) -> Optional['RateLimiter']:
+        """Build a limiter from JUDGE_RPM_LIMIT / JUDGE_TPM_LIMIT, if either is set."""
+        rpm = os.getenv(RPM_ENV)
+        tpm = os.getenv(TPM_ENV)
+        if not rpm and not tpm:
+            return None
+        return cls(requests_per_minute=float(rpm) if rpm else None,
+                   tokens_per_minute=float(tpm) if tpm else None)
+
+    def acquire(self, tokens: int = 0) -> float:
+        """
+        Block until one request and `tokens` tokens are available, then take them.
+
+        Requests larger than a full token bucket are let through once the
+        bucket is full, rather than waiting forever. Returns the time waited.
+        """
+        waited = 0.0
+        while True:
+            wait = self._update(lambda state, now: self._try_take(state, now, tokens))
+            if wait <= 0:
+                with self._lock:
+                    self.stats['acquired'] += 1
+                    if waited:
+                        self.stats['waits'] += 1
+                        self.stats['wait_seconds'] += waited
+                return waited
+            self._sleep(wait)
+            waited += wait
+
+    def settle(self, estimated_tokens: int, actual_tokens: Optional[int]) -> None:
+        """Correct the token bucket once a call's real usage is known."""
+        if actual_tokens is None or not self.capacity['tokens']:
+            return
+        difference = actual_tokens - estimated_tokens
+
+        def apply(state, now):
+            state['tokens'] = min(self.capacity['tokens'], state['tokens'] - difference)
+            return 0.0
+
+        self._update(apply)
+
+    def penalize(self, retry_after: float) -> None:
+        """Pause every caller sharing this limiter for retry_after seconds (a 429)."""
+        def apply(state, now):
+            state['blocked_until'] = max(state.get('blocked_until', 0.0), now + retry_after)
+            # The server says we are over: spend the request bucket too
+            state['requests'] = min(state['requests'], 0.0)
+            return 0.0
+
+        with self._lock:
+            self.stats['penalties'] += 1
+        self._update(apply)
+
+    def _try_take(self, state: Dict[str, float], now: float, tokens: int) -> float:
+        """Take capacity if available; otherwise return the seconds to wait."""
+        blocked = state.get('blocked_until', 0.0) - now
+        if blocked > 0:
+            return blocked
+
+        wait = 0.0
+        needs = {'requests': 1.0, 'tokens': float(tokens)}
+        for bucket, need in needs.items():
+            capacity = self.capacity[bucket]
+            if not capacity:
+                continue
+            need = min(need, capacity)
+            if state[bucket] < need:
+                wait = max(wait, (need - state[bucket]) * 60.0 / capacity)
+        if wait > 0:
+            return wait
+
+        for bucket, need in needs.items():
+            if self.capacity[bucket]:
+                state[bucket] -= need
+        return 0.0
+
+    def _refill(self, state: Dict[str, float], now: float) -> None:
+        elapsed = max(0.0, now - state.get('updated', now))
+        for bucket, capacity in self.capacity.items():
+            level = state.get(bucket, capacity)
+            state[bucket] = min(capacity, level + elapsed * capacity / 60.0)
+        state['updated'] = now
+
+    def _update(self, change) -> float:
+        """Refill the buckets, apply change(state, now) and persist, under the lock(s)."""
+        with self._lock:
+            if self.state_file is None:
+                if self._state is None:
+                    self._state = {}
+                now = self._clock()
+                self._refill(self._state, now)
+                return change(self._state, now)
+
+            self.state_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.state_file, 'a+') as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    f.seek(0)
+                    shared = self._read_shared(f.read())
+                    state = dict(shared.get(self.state_key) or {})
+                    now = self._clock()
+                    self._refill(state, now)
+                    result = change(state, now)
+                    shared[self.state_key] = state
+                    f.seek(0)
+                    f.truncate()
+                    f.write(json.dumps(shared))
+                    f.flush()
+                    return result
+                finally:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    @property
+    def state_key(self) -> str:
+        """Limiters with different limits keep separate buckets in one state file."""
+        return f"rpm={self.capacity['requests']:g},tpm={self.capacity['tokens']:g}"
+
+    @staticmethod
+    def _read_shared(text: str) -> Dict[str, Dict[str, float]]:
+        try:
+            shared = json.loads(text) if text.strip() else {}
+        except ValueError:
+            shared = {}
+        if not isinstance(shared, dict):
+            return {}
+        return {key: state for key, state in shared.items() if isinstance(state, dict)}
+
+
+_shared_limiters: Dict[str, RateLimiter] = {}
+_shared_lock = threading.Lock()
+
+
+def shared_rate_limiter(setting: Any) -> Optional[RateLimiter]:
+    """
+    Return the process-wide limiter for a stage `rate_limit` setting.
+
+    Stages with the same setting share one limiter; without a setting, the
+    JUDGE_RPM_LIMIT / JUDGE_TPM_LIMIT environment limiter is used if defined.
+    """
+    key = json.dumps(setting, sort_keys=True, default=str)
+    with _shared_lock:
+        if key not in _shared_limiters:
+            _shared_limiters[key] = (RateLimiter.from_config(setting) if setting
+                                     else RateLimiter.from_env())
+        return _shared_limiters[key]
@@ -0,0 +1,85 @@
+"""
+Scorer Registry
+Maps the `scorer:` names used in eval packs to scorer classes, importing them on first use.
+
+Built-in scorers are listed by module and only imported when a pack uses
+them, so tools that never judge do not load the OpenAI SDK. Other scorers
+register with the decorator:
+
+    from core.scoring.registry import register_scorer
+
+    @register_scorer('word_count')
+    class WordCountScorer:
+        def score(self, item, config) -> ScorerResult: ...
+
+or, from an installed package without importing it up front, through an
+entry point in the `lake_merritt.scorers` group:
+
+    [project.entry-points."lake_merritt.scorers"]
+    word_count = "my_package.scorers:WordCountScorer"
+
+A scorer class is called with no arguments and must provide
+`score(item, config) -> ScorerResult` (and optionally `score_batch`).
+"""
+
+import importlib
+import threading
+from importlib import metadata
+from typing import Any, Callable, Dict, List
+
+ENTRY_POINT_GROUP = 'lake_merritt.scorers'
+
+# Built-in scorer name -> module (relative to core.scoring) that registers it
+BUILTIN_SCORERS = {
+    'llm_judge': '.llm_judge',
+    'timestamp_order': '.rule_based',
+    'attribute_aggregate': '.rule_based',
+    'metadata_assertion': '.rule_based',
+    'regex_presence': '.rule_based',
+}
+
+_registry: Dict[str, Callable[[], Any]] = {}
+_lock = threading.RLock()
+
+
+def register_scorer(name: str):
+    """Class decorator registering a scorer under a pack `scorer:` name."""
+    def decorator(scorer_class):
+        with _lock:
+            existing = _registry.get(name)
+            if existing is not None and existing is not scorer_class:
+                raise ValueError(f"Scorer '{name}' is already registered to {existing.__qualname__}")
+            _registry[name] = scorer_class
+        return scorer_class
+    return decorator
+
+
+def _entry_points() -> List[metadata.EntryPoint]:
+    return list(metadata.entry_points(group=ENTRY_POINT_GROUP))
+
+
+def get_scorer_class(name: str) -> Callable[[], Any]:
+    """Return the scorer class for a name, importing its module if needed."""
+    with _lock:
+        if name in _registry:
+            return _registry[name]
+
+        if name in BUILTIN_SCORERS:
+            importlib.import_module(BUILTIN_SCORERS[name], __package__)
+        else:
+            for entry_point in _entry_points():
+                if entry_point.name == name:
+                    register_scorer(name)(entry_point.load())
+                    break
+
+        if name not in _registry:
+            raise ValueError(f"Unknown scorer: {name}")
+        return _registry[name]
+
+
+def available_scorers() -> List[str]:
+    """Names of every scorer that can be created, without importing any of them."""
+    with _lock:
+        names = set(_registry) | set(BUILTIN_SCORERS)
+    names.update(entry_point.name for entry_point in _entry_points())
+    return sorted(names)
@@ -0,0 +1,142 @@
+"""
+Judge Response Cache
+Opt-in SQLite cache of parsed judge responses, keyed by the exact request.
+
+A response is reused when (model, temperature, system_prompt, user_prompt)
+matches a stored request made within the TTL. The database is bounded by the
+total size of stored responses; least recently used rows are evicted first.
+Only successfully parsed responses are stored, so failed calls are retried.
+
+Enable per stage in an eval pack:
+
+    config:
+      response_cache: true            # default path and limits
+      # or
+      response_cache:
+        path: /tmp/judge_cache.sqlite
+        ttl_seconds: 86400
+        max_bytes: 104857600
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+DEFAULT_RESPONSE_CACHE_PATH = Path(__file__).parents[4] / '.observability' / 'cache' / 'judge_responses.sqlite'
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600  # 7 days
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024  # 64 MiB
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    response TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used);
+"""
+
+
+def request_key(model: str, temperature: float, system_prompt: str, user_prompt: str) -> str:
+    """Hash of everything sent to the judge."""
+    encoded = json.dumps([model, temperature, system_prompt, user_prompt], separators=(',', ':'))
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    """SQLite-backed response store with TTL expiry and byte-bounded LRU eviction."""
+
+    def __init__(self,
+                 path=DEFAULT_RESPONSE_CACHE_PATH,
+                 ttl_seconds: float = DEFAULT_TTL_SECONDS,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        # One connection shared by the judge threads, serialized by the lock
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+        self.stats = {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0}
+
+    @classmethod
+    def from_config(cls, config: Any) -> Optional['ResponseCache']:
+        """Build a cache from a stage's `response_cache` setting (None when off)."""
+        if not config:
+            return None
+        if config is True:
+            return cls()
+        if isinstance(config, dict):
+            return cls(
+                path=config.get('path', DEFAULT_RESPONSE_CACHE_PATH),
+                ttl_seconds=float(config.get('ttl_seconds', DEFAULT_TTL_SECONDS)),
+                max_bytes=int(config.get('max_bytes', DEFAULT_MAX_BYTES)),
+            )
+        raise ValueError(f"Invalid response_cache setting: {config!r}")
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return the stored response for key, or None on a miss or expired row."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT response, created FROM responses WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl_seconds:
+                if row is not None:
+                    self._conn.execute('DELETE FROM responses WHERE key = ?', (key,))
+                    self._conn.commit()
+                self.stats['misses'] += 1
+                return None
+            self._conn.execute('UPDATE responses SET last_used = ? WHERE key = ?', (now, key))
+            self._conn.commit()
+            self.stats['hits'] += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, response: Dict) -> None:
+        """Store a response and evict least recently used rows beyond max_bytes."""
+        data = json.dumps(response, default=str)
+        size = len(data.encode('utf-8'))
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO responses (key, response, size, created, last_used) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (key, data, size, now, now)
+            )
+            self.stats['stores'] += 1
+            self._evict(now)
+            self._conn.commit()
+
+    def clear(self) -> None:
+        """Delete every stored response."""
+        with self._lock:
+            self._conn.execute('DELETE FROM responses')
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _evict(self, now: float) -> None:
+        cursor = self._conn.execute('DELETE FROM responses WHERE created < ?',
+                                    (now - self.ttl_seconds,))
+        evicted = cursor.rowcount
+        total = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        if total > self.max_bytes:
+            victims = []
+            for key, size in self._conn.execute(
+                    'SELECT key, size FROM responses ORDER BY last_used, created'):
+                if total <= self.max_bytes:
+                    break
+                victims.append((key,))
+                total -= size
+            self._conn.executemany('DELETE FROM responses WHERE key = ?', victims)
+            evicted += len(victims)
+        self.stats['evictions'] += evicted
@@ -0,0 +1,372 @@
+"""
+Rule-Based Scorers
+Deterministic scorers for checks that need no LLM: ordering, sums, flags, patterns.
+
+Each scorer reads values from an item by path: `input`, `id`,
+`expected_output`, `metadata.<key>...`, or a bare metadata key such as
+`otel_trace` or `all_approved` (the same shortcuts judge templates get).
+
+    - name: "timing_check"
+      scorer: "timestamp_order"
+      config:
+        before: {name: "review|breaker"}   # Spans whose fields match these regexes...
+        after: {name: "revision"}          # ...must all end before these start
+
+Scorers:
+
+- timestamp_order:     spans (default `otel_trace`) are in start-time order,
+                       or every `before` span ends before the first `after` span starts
+- attribute_aggregate: sum/count/min/max/mean of a field across records, with
+                       optional `min` / `max` bounds
+- metadata_assertion:  a value is truthy, or `equals` / `not_equals` / is `in` a list
+- regex_presence:      `pattern` is present (or with `expect: absent`, absent) in a field
+
+Results carry details['determined']: False when the data needed to decide is
+missing (no matching spans, no numeric values, field absent). Such results fail.
+
+Any llm_judge stage can run a rule first and skip the LLM call when the rule
+decides the item:
+
+    config:
+      precheck:
+        scorer: "metadata_assertion"
+        config: {field: "all_approved"}
+        skip_llm_on: ["fail"]   # Which determined outcomes skip the LLM (default: pass and fail)
+"""
+
+import json
+import re
+import threading
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..data_models import EvaluationItem, ScorerResult
+from .registry import register_scorer
+
+# Marks a path that does not resolve on an item
+MISSING = object()
+
+AGGREGATE_OPS = ('sum', 'count', 'min', 'max', 'mean')
+SKIP_OUTCOMES = ('pass', 'fail')
+
+
+def item_value(item: EvaluationItem, path: str) -> Any:
+    """Resolve a dotted path on an item, or return MISSING."""
+    parts = path.split('.')
+    head = parts[0]
+    if head in ('input', 'id', 'expected_output'):
+        value = getattr(item, head)
+        parts = parts[1:]
+    elif head == 'metadata':
+        value = item.metadata or {}
+        parts = parts[1:]
+    else:
+        value = item.metadata or {}
+
+    for part in parts:
+        if isinstance(value, Mapping) and part in value:
+            value = value[part]
+        elif isinstance(value, list) and part.isdigit() and int(part) < len(value):
+            value = value[int(part)]
+        else:
+            return MISSING
+    return MISSING if value is None else value
+
+
+def record_value(record: Any, field: str) -> Any:
+    """Resolve a dotted field within one record, or return MISSING."""
+    value = record
+    for part in field.split('.'):
+        if not isinstance(value, dict) or part not in value:
+            return MISSING
+        value = value[part]
+    return MISSING if value is None else value
+
+
+def as_number(value: Any) -> Optional[float]:
+    """A numeric value (numbers and numeric strings), or None."""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            return None
+    return None
+
+
+def as_timestamp(value: Any) -> Optional[float]:
+    """A comparable timestamp: unix time (as number or string, any unit) or ISO 8601."""
+    number = as_number(value)
+    if number is not None:
+        return number
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+        except ValueError:
+            return None
+    return None
+
+
+def as_text(value: Any) -> str:
+    return value if isinstance(value, str) else json.dumps(value, default=str)
+
+
+def rule_result(scorer_name: str, passed: bool, reasoning: str,
+                determined: bool = True, **details) -> ScorerResult:
+    return ScorerResult(
+        scorer_name=scorer_name,
+        score=passed,
+        score_type='boolean',
+        numeric_score=1.0 if passed else 0.0,
+        passed=passed,
+        reasoning=reasoning,
+        details={'determined': determined, **details},
+    )
+
+
+def undetermined(scorer_name: str, reasoning: str, **details) -> ScorerResult:
+    return rule_result(scorer_name, False, reasoning, determined=False, **details)
+
+
+def compile_matcher(spec: Any) -> Callable[[Dict], bool]:
+    """A predicate for records whose fields all match the spec's regexes."""
+    if not isinstance(spec, dict) or not spec:
+        raise ValueError(f"Invalid span match: {spec!r} (expected a mapping of field to regex)")
+    patterns = [(field, re.compile(str(pattern), re.IGNORECASE)) for field, pattern in spec.items()]
+
+    def matches(record: Dict) -> bool:
+        for field, pattern in patterns:
+            value = record_value(record, field)
+            if value is MISSING or not pattern.search(as_text(value)):
+                return False
+        return True
+
+    return matches
+
+
+def records_at(item: EvaluationItem, config: Dict[str, Any]) -> Any:
+    """The records a stage reads (config `source`, default the trace summary)."""
+    return item_value(item, config.get('source', 'otel_trace'))
+
+
+@register_scorer('timestamp_order')
+class TimestampOrderScorer:
+    """Checks span ordering: overall start-time order, or `before` spans ending before `after` spans."""
+
+    name = 'timestamp_order'
+
+    def score(self, item: EvaluationItem, config: Dict[str, Any]) -> ScorerResult:
+        records = records_at(item, config)
+        if not isinstance(records, list) or not records:
+            return undetermined(self.name, "No spans to order")
+        start_field = config.get('start_field', 'startTime')
+        end_field = config.get('end_field', 'endTime')
+
+        if 'before' in config or 'after' in config:
+            return self._score_phases(records, config, start_field, end_field)
+
+        previous: Optional[Tuple[float, Dict]] = None
+        checked = 0
+        for record in records:
+            start = as_timestamp(record_value(record, start_field))
+            if start is None:
+                continue
+            if previous is not None and start < previous[0]:
+                return rule_result(self.name, False,
+                                   f"Span '{record.get('name')}' starts before the preceding span "
+                                   f"'{previous[1].get('name')}'")
+            previous = (start, record)
+            checked += 1
+        if not checked:
+            return undetermined(self.name, f"No spans have a '{start_field}' timestamp")
+        return rule_result(self.name, True, f"{checked} spans are in start-time order", spans=checked)
+
+    def _score_phases(self, records: List[Dict], config: Dict[str, Any],
+                      start_field: str, end_field: str) -> ScorerResult:
+        is_before = compile_matcher(config.get('before'))
+        is_after = compile_matcher(config.get('after'))
+
+        before_ends = [(as_timestamp(record_value(r, end_field)), r) for r in records if is_before(r)]
+        after_starts = [(as_timestamp(record_value(r, start_field)), r) for r in records if is_after(r)]
+        before_ends = [(t, r) for t, r in before_ends if t is not None]
+        after_starts = [(t, r) for t, r in after_starts if t is not None]
+        if not before_ends or not after_starts:
+            return undetermined(self.name,
+                                f"Found {len(before_ends)} 'before' and {len(after_starts)} 'after' "
+                                f"spans with timestamps; need at least one of each")
+
+        last_end, last = max(before_ends, key=lambda e: e[0])
+        first_start, first = min(after_starts, key=lambda e: e[0])
+        details = {'before_end': last_end, 'after_start': first_start}
+        if last_end <= first_start:
+            return rule_result(self.name, True,
+                               f"All {len(before_ends)} 'before' spans ended before "
+                               f"'{first.get('name')}' started", **details)
+        return rule_result(self.name, False,
+                           f"'{last.get('name')}' ended after '{first.get('name')}' started", **details)
+
+
+@register_scorer('attribute_aggregate')
+class AttributeAggregateScorer:
+    """Aggregates a numeric field across records and checks it against optional bounds."""
+
+    name = 'attribute_aggregate'
+
+    def score(self, item: EvaluationItem, config: Dict[str, Any]) -> ScorerResult:
+        field = config.get('field')
+        op = config.get('op', 'sum')
+        if not field:
+            raise ValueError("attribute_aggregate needs a `field`")
+        if op not in AGGREGATE_OPS:
+            raise ValueError(f"Unknown aggregate op '{op}' (expected one of {', '.join(AGGREGATE_OPS)})")
+
+        records = records_at(item, config)
+        if isinstance(records, dict):
+            records = [records]
+        if not isinstance(records, list):
+            return undetermined(self.name, f"No records at '{config.get('source', 'otel_trace')}'")
+
+        values = [as_number(record_value(record, field)) for record in records]
+        values = [v for v in values if v is not None]
+        if not values:
+            return undetermined(self.name, f"No numeric '{field}' values in {len(records)} records")
+
+        if op == 'sum':
+            value = sum(values)
+        elif op == 'count':
+            value = float(len(values))
+        elif op == 'min':
+            value = min(values)
+        elif op == 'max':
+            value = max(values)
+        else:
+            value = sum(values) / len(values)
+
+        low, high = config.get('min'), config.get('max')
+        passed = (low is None or value >= low) and (high is None or value <= high)
+        bounds = ''
+        if low is not None or high is not None:
+            bounds = f" (bounds {low if low is not None else '-inf'}..{high if high is not None else 'inf'})"
+        return rule_result(self.name, passed, f"{op}({field}) = {value:g} over {len(values)} values{bounds}",
+                           value=value, values=len(values))
+
+
+@register_scorer('metadata_assertion')
+class MetadataAssertionScorer:
+    """Asserts a single value: truthy by default, or `equals` / `not_equals` / `in`."""
+
+    name = 'metadata_assertion'
+
+    def score(self, item: EvaluationItem, config: Dict[str, Any]) -> ScorerResult:
+        field = config.get('field')
+        if not field:
+            raise ValueError("metadata_assertion needs a `field`")
+        value = item_value(item, field)
+        if value is MISSING:
+            return undetermined(self.name, f"'{field}' is not set")
+
+        if 'equals' in config:
+            passed, expectation = value == config['equals'], f"== {config['equals']!r}"
+        elif 'not_equals' in config:
+            passed, expectation = value != config['not_equals'], f"!= {config['not_equals']!r}"
+        elif 'in' in config:
+            passed, expectation = value in config['in'], f"in {config['in']!r}"
+        else:
+            passed, expectation = bool(value), "truthy"
+        verdict = 'holds' if passed else 'does not hold'
+        return rule_result(self.name, passed, f"{field} = {value!r}: {expectation} {verdict}")
+
+
+@register_scorer('regex_presence')
+class RegexPresenceScorer:
+    """Checks that a pattern is present in (or, with `expect: absent`, absent from) a field."""
+
+    name = 'regex_presence'
+
+    def score(self, item: EvaluationItem, config: Dict[str, Any]) -> ScorerResult:
+        pattern = config.get('pattern')
+        if not pattern:
+            raise ValueError("regex_presence needs a `pattern`")
+        field = config.get('field', 'input')
+        expect = config.get('expect', 'present')
+        if expect not in ('present', 'absent'):
+            raise ValueError(f"Invalid regex_presence expect: {expect!r}")
+
+        value = item_value(item, field)
+        if value is MISSING:
+            return undetermined(self.name, f"'{field}' is not set")
+        flags = 0 if config.get('case_sensitive', False) else re.IGNORECASE
+        match = re.search(pattern, as_text(value), flags)
+
+        if match:
+            reasoning = f"'{pattern}' found in {field}: {match.group(0)[:100]!r}"
+        else:
+            reasoning = f"'{pattern}' not found in {field}"
+        return rule_result(self.name, bool(match) == (expect == 'present'), reasoning)
+
+
+RULE_SCORERS = {
+    scorer.name: scorer
+    for scorer in (TimestampOrderScorer, AttributeAggregateScorer,
+                   MetadataAssertionScorer, RegexPresenceScorer)
+}
+
+
+class PrecheckScorer:
+    """
+    Runs a rule scorer before another scorer, skipping it when the rule decides.
+
+    The wrapped scorer (normally llm_judge) is only created once an item needs
+    it, so a stage whose precheck decides every item makes no judge calls and
+    needs no API key.
+    """
+
+    def __init__(self, precheck: Dict[str, Any], scorer_factory: Callable[[], Any]):
+        if not isinstance(precheck, dict) or precheck.get('scorer') not in RULE_SCORERS:
+            raise ValueError(f"Invalid precheck: {precheck!r} (scorer must be one of "
+                             f"{', '.join(RULE_SCORERS)})")
+        self.rule = RULE_SCORERS[precheck['scorer']]()
+        self.rule_config = precheck.get('config', {})
+        self.skip_on = tuple(precheck.get('skip_llm_on', SKIP_OUTCOMES))
+        unknown = set(self.skip_on) - set(SKIP_OUTCOMES)
+        if unknown:
+            raise ValueError(f"Invalid precheck skip_llm_on: {sorted(unknown)}")
+        self._scorer_factory = scorer_factory
+        self._scorer = None
+        self._lock = threading.Lock()
+
+    @property
+    def scorer(self):
+        with self._lock:
+            if self._scorer is None:
+                self._scorer = self._scorer_factory()
+            return self._scorer
+
+    def decide(self, item: EvaluationItem) -> Optional[ScorerResult]:
+        """The rule's result if it settles the item, else None."""
+        result = self.rule.score(item, self.rule_config)
+        if result.details.get('determined') and ('pass' if result.passed else 'fail') in self.skip_on:
+            result.details['precheck'] = True
+            return result
+        return None
+
+    def score(self, item: EvaluationItem, config: Dict[str, Any]) -> ScorerResult:
+        result = self.decide(item)
+        return result if result is not None else self.scorer.score(item, config)
+
+    def score_batch(self, items: List[EvaluationItem], config: Dict[str, Any]) -> List[ScorerResult]:
+        results = [self.decide(item) for item in items]
+        pending = [i for i, result in enumerate(results) if result is None]
+        if pending:
+            scorer = self.scorer
+            if hasattr(scorer, 'score_batch'):
+                scored = scorer.score_batch([items[i] for i in pending], config)
+            else:
+                scored = [scorer.score(items[i], config) for i in pending]
+            for i, result in zip(pending, scored):
+                results[i] = result
+        return results
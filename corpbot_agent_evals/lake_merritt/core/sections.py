@@ -0,0 +1,114 @@
+"""
+Section Scanner
+Linear-time extraction of Breaker review and change log sections from trace content.
+
+Replaces the per-pattern regexes of the form
+
+    HEADER[^\\n]*\\n((?:.*?\\n)*?)(?=\\n\\n|\\Z)
+
+which backtrack over the rest of the document for every header that is not
+followed by a terminator. The scanner returns the same section bodies:
+
+- A section starts at any line containing a header keyword (case-insensitive)
+  that ends with a newline; its body starts on the next line.
+- The body runs to the first line start where two empty lines begin (or, for
+  the `[Codex] ... BREAKER` header, where a line starts with `---`), or to the
+  end of the content if it ends with a newline. Otherwise there is no match.
+- Sections of one kind never overlap: headers inside a body are skipped.
+
+All header keywords are found by one regex sweep, terminator positions are
+collected once, and each section resolves its end with a binary search, so the
+cost is O(n + sections * log n).
+"""
+
+import re
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+
+# Section kinds, in the order their bodies are reported
+BREAKER_KINDS = ('failure', 'breaker', 'codex_breaker', 'request_changes')
+CHANGE_LOG_KINDS = ('change_log', 'version_fixed', 'revision', 'issues_fixed')
+
+# One alternation for every header keyword; the group name is the section kind.
+# The leading lookahead lets the engine reject most positions on one character.
+HEADER_PATTERN = re.compile(
+    r'(?=[FBRCVI\[])'
+    r'(?:(?P<failure>FAILURE)'
+    r'|(?P<breaker>BREAKER)'
+    r'|(?P<codex_breaker>\[Codex\])'
+    r'|(?P<request_changes>REQUEST.?CHANGES)'
+    r'|(?P<change_log>Change Log|Changelog)'
+    r'|(?P<version_fixed>v\d+\.\d+)'
+    r'|(?P<revision>Revision)'
+    r'|(?P<issues_fixed>Issues? (?:fixed|addressed|resolved)))',
+    re.IGNORECASE
+)
+
+# Keywords that must follow a compound header later on the same line
+FOLLOWING_KEYWORD = {
+    'codex_breaker': re.compile(r'BREAKER', re.IGNORECASE),
+    'version_fixed': re.compile(r'FIXED|Addressed|DONE', re.IGNORECASE),
+}
+
+# Line starts where two empty lines begin / where a line starts with ---
+BLANK_TERMINATOR = re.compile(r'(?:\A|(?<=\n))(?=\n\n)')
+DASH_TERMINATOR = re.compile(r'(?:\A|(?<=\n))(?=---)')
+
+
+def scan_sections(content: str) -> Dict[str, List[str]]:
+    """Return the section bodies found in content, grouped by section kind."""
+    sections: Dict[str, List[str]] = {kind: [] for kind in BREAKER_KINDS + CHANGE_LOG_KINDS}
+    if not content:
+        return sections
+
+    ends_with_newline = content.endswith('\n')
+    terminators: Dict[str, Optional[List[int]]] = {'blank': None, 'dash': None}
+    resume_at: Dict[str, int] = {}
+    exhausted = set()
+
+    def section_end(kind: str, body_start: int) -> Optional[int]:
+        family = 'dash' if kind == 'codex_breaker' else 'blank'
+        positions = terminators[family]
+        if positions is None:
+            pattern = DASH_TERMINATOR if family == 'dash' else BLANK_TERMINATOR
+            positions = terminators[family] = [m.start() for m in pattern.finditer(content)]
+        i = bisect_left(positions, body_start)
+        if i < len(positions):
+            return positions[i]
+        return len(content) if ends_with_newline else None
+
+    for match in HEADER_PATTERN.finditer(content):
+        kind = match.lastgroup
+        if kind in exhausted or match.start() < resume_at.get(kind, 0):
+            continue
+
+        line_end = content.find('\n', match.end())
+        if line_end == -1:
+            # Header on an unterminated last line never matches; nothing follows it
+            break
+
+        following = FOLLOWING_KEYWORD.get(kind)
+        if following is not None and not following.search(content, match.end(), line_end):
+            # Later headers of this kind on the same line would fail the same way
+            resume_at[kind] = line_end
+            continue
+
+        body_start = line_end + 1
+        end = section_end(kind, body_start)
+        if end is None:
+            # No terminator anywhere after this header, so none after later ones either
+            exhausted.add(kind)
+            continue
+
+        sections[kind].append(content[body_start:end])
+        resume_at[kind] = end
+
+    return sections
+
+
+def extract_sections(content: str) -> Tuple[List[str], List[str]]:
+    """Return (breaker review bodies, change log bodies) from one scan of content."""
+    sections = scan_sections(content)
+    reviews = [body for kind in BREAKER_KINDS for body in sections[kind]]
+    logs = [body for kind in CHANGE_LOG_KINDS for body in sections[kind]]
+    return reviews, logs
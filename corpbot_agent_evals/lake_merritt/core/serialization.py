@@ -0,0 +1,83 @@
+"""
+Prompt Serialization
+How structured values (the trace summary, `tojson` output) are written into judge prompts.
+
+Formats:
+
+- indent:  json.dumps(indent=2), the historical default; easiest to read,
+           but the whitespace roughly doubles large traces.
+- compact: JSON without whitespace.
+- table:   compact JSON with lists of records (e.g. spans) written as
+           {"columns": [...], "rows": [[...], ...]} so keys are not repeated
+           per record. Other values are written as compact JSON.
+
+Set per pack in `ingestion.config` (or per stage in its config):
+
+    ingestion:
+      config:
+        serialization: compact
+"""
+
+import json
+from typing import Any, Dict, List
+
+SERIALIZATION_FORMATS = ('indent', 'compact', 'table')
+DEFAULT_SERIALIZATION = 'indent'
+
+
+def validate_serialization(fmt: Any) -> str:
+    """Return fmt if it is a known serialization format, else raise ValueError."""
+    if fmt not in SERIALIZATION_FORMATS:
+        raise ValueError(f"Unknown serialization '{fmt}' (expected one of {', '.join(SERIALIZATION_FORMATS)})")
+    return fmt
+
+
+def serialize(value: Any, fmt: str = DEFAULT_SERIALIZATION) -> str:
+    """Serialize a value for a prompt in the given format."""
+    if fmt == 'indent':
+        return json.dumps(value, indent=2, default=str)
+    if validate_serialization(fmt) == 'table' and is_record_list(value):
+        value = as_table(value)
+    return json.dumps(value, separators=(',', ':'), default=str)
+
+
+def is_record_list(value: Any) -> bool:
+    return isinstance(value, list) and bool(value) and all(isinstance(row, dict) for row in value)
+
+
+def as_table(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Columnar form of a list of records; missing keys become null."""
+    columns: Dict[str, None] = {}
+    for record in records:
+        for key in record:
+            columns.setdefault(key, None)
+    return {
+        'columns': list(columns),
+        'rows': [[record.get(column) for column in columns] for record in records],
+    }
+
+
+class SerializationTally:
+    """
+    Characters serialized into one prompt, next to what indented JSON would take.
+
+    The indented baseline is only computed for non-default formats, where it
+    is needed to report the savings.
+    """
+
+    def __init__(self, fmt: str):
+        self.format = fmt
+        self.chars = 0
+        self.indent_chars = 0
+
+    def add(self, value: Any, text: str) -> None:
+        if self.format == 'indent':
+            return
+        self.chars += len(text)
+        self.indent_chars += len(serialize(value, 'indent'))
+
+    def details(self) -> Dict[str, Any]:
+        """Result details entry, or an empty dict when nothing was serialized."""
+        if not self.chars:
+            return {}
+        return {'format': self.format, 'chars': self.chars, 'indent_chars': self.indent_chars}
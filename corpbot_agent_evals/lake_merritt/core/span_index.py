@@ -0,0 +1,193 @@
+"""
+Span Index
+One-pass index over an OTLP/JSON trace, shared by all trace extractors.
+
+The raw trace is walked once: spans are flattened in document order, every
+attribute list is decoded to a dict exactly once, and lookups by span name,
+agent and parent/child links are precomputed. Building the index is linear in
+the number of spans and attributes.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# OTLP AnyValue variants we decode (in priority order)
+OTEL_VALUE_TYPES = ('stringValue', 'intValue', 'boolValue', 'doubleValue')
+
+# Resource attributes with this prefix carry structured skill-run metadata
+RESOURCE_METADATA_PREFIX = 'metadata.'
+
+
+def decode_attributes(attributes: List[Dict]) -> Dict[str, Any]:
+    """
+    Convert OTEL attributes list to dict.
+
+    OTEL format: [{"key": "foo", "value": {"stringValue": "bar"}}]
+    Output: {"foo": "bar"}
+    """
+    result = {}
+    if not isinstance(attributes, list):
+        return result
+
+    for attr in attributes:
+        if not isinstance(attr, dict):
+            continue
+        key = attr.get('key')
+        value_obj = attr.get('value', {})
+        if key and isinstance(value_obj, dict):
+            for value_type in OTEL_VALUE_TYPES:
+                if value_type in value_obj:
+                    result[key] = value_obj[value_type]
+                    break
+    return result
+
+
+def resource_metadata_from_attributes(attrs: Dict[str, Any]) -> Dict[str, Any]:
+    """P0: Pick the metadata.* fields out of decoded resource attributes."""
+    prefix_len = len(RESOURCE_METADATA_PREFIX)
+    return {
+        key[prefix_len:]: value
+        for key, value in attrs.items()
+        if key.startswith(RESOURCE_METADATA_PREFIX)
+    }
+
+
+def iter_resource_spans(trace_data: Dict) -> Iterator[Tuple[Dict, Dict, List[Dict]]]:
+    """Yield (resource_span, scope_span, spans) for every scope, skipping malformed entries."""
+    for resource_span in trace_data.get('resourceSpans', []):
+        if not isinstance(resource_span, dict):
+            continue
+
+        scope_spans = resource_span.get('scopeSpans')
+        if not scope_spans:
+            continue
+
+        for scope_span in scope_spans:
+            if not isinstance(scope_span, dict):
+                continue
+            span_list = scope_span.get('spans', [])
+            if span_list:
+                yield resource_span, scope_span, span_list
+
+
+@dataclass
+class SpanIndex:
+    """Flattened, pre-decoded view of one OTLP trace."""
+
+    spans: List[Dict] = field(default_factory=list)
+    attributes: List[Dict[str, Any]] = field(default_factory=list)
+    resource_metadata: Dict[str, Any] = field(default_factory=dict)
+    by_name: Dict[str, List[int]] = field(default_factory=dict)
+    by_agent: Dict[str, List[int]] = field(default_factory=dict)
+    by_span_id: Dict[str, int] = field(default_factory=dict)
+    children: Dict[str, List[int]] = field(default_factory=dict)
+
+    @classmethod
+    def from_trace(cls, trace_data: Dict) -> 'SpanIndex':
+        """Build the index with a single walk over the trace."""
+        index = cls()
+
+        for resource_span in trace_data.get('resourceSpans', []):
+            if not isinstance(resource_span, dict):
+                continue
+            resource = resource_span.get('resource', {})
+            resource_attrs = decode_attributes(resource.get('attributes', []))
+            # Later resources win on key collisions, as before
+            index.resource_metadata.update(resource_metadata_from_attributes(resource_attrs))
+
+        for _, _, span_list in iter_resource_spans(trace_data):
+            for span in span_list:
+                index.add_span(span)
+
+        return index
+
+    @classmethod
+    def from_span_records(cls, records: Iterable, keep_raw_attributes: bool = False) -> 'SpanIndex':
+        """
+        Build the index from streamed span records (see core.ingestion.otlp_stream).
+
+        Records carry their resource, so resource metadata is decoded once per
+        resource. Resource-only records (span None, from iter_otlp_spans with
+        empty_resources=True) contribute their metadata and no span, which
+        gives the same resource_metadata as from_trace. Unless
+        keep_raw_attributes is set, each span's raw attribute list is dropped
+        once decoded, since the streamed dicts are ours to own.
+        """
+        index = cls()
+        last_resource = None
+        for record in records:
+            if record.resource is not last_resource:
+                last_resource = record.resource
+                resource_attrs = decode_attributes(last_resource.get('attributes', []))
+                index.resource_metadata.update(resource_metadata_from_attributes(resource_attrs))
+            if record.span is None:
+                continue
+            position = index.add_span(record.span)
+            if not keep_raw_attributes:
+                index.spans[position].pop('attributes', None)
+        return index
+
+    def add_span(self, span: Dict) -> int:
+        """Append one raw span, decoding its attributes. Returns its position."""
+        position = len(self.spans)
+        if not isinstance(span, dict):
+            span = {}
+        attrs = decode_attributes(span.get('attributes', []))
+
+        self.spans.append(span)
+        self.attributes.append(attrs)
+
+        name = span.get('name')
+        if name is not None:
+            self.by_name.setdefault(name, []).append(position)
+        agent = attrs.get('agent')
+        if agent is not None:
+            self.by_agent.setdefault(str(agent), []).append(position)
+        span_id = span.get('spanId')
+        if span_id:
+            self.by_span_id.setdefault(span_id, position)
+        parent_id = span.get('parentSpanId')
+        if parent_id:
+            self.children.setdefault(parent_id, []).append(position)
+
+        return position
+
+    def __len__(self) -> int:
+        return len(self.spans)
+
+    def spans_named(self, name: str) -> List[Dict]:
+        """All spans with the given name, in trace order."""
+        return [self.spans[i] for i in self.by_name.get(name, [])]
+
+    def spans_for_agent(self, agent: str) -> List[Dict]:
+        """All spans whose `agent` attribute matches, in trace order."""
+        return [self.spans[i] for i in self.by_agent.get(agent, [])]
+
+    def parent_of(self, position: int) -> Optional[int]:
+        """Position of a span's parent, or None for roots and orphans."""
+        parent_id = self.spans[position].get('parentSpanId')
+        return self.by_span_id.get(parent_id) if parent_id else None
+
+    def children_of(self, position: int) -> List[int]:
+        """Positions of a span's direct children."""
+        span_id = self.spans[position].get('spanId')
+        return list(self.children.get(span_id, [])) if span_id else []
+
+    def get_field(self, position: int, field_path: str) -> Optional[str]:
+        """
+        Read a string field from a span using dot notation.
+
+        `attributes.<key>` reads the decoded attribute (keys may contain dots);
+        anything else walks the raw span dict.
+        """
+        if field_path.startswith('attributes.'):
+            value = self.attributes[position].get(field_path[len('attributes.'):])
+            return value if isinstance(value, str) else None
+
+        current: Any = self.spans[position]
+        for part in field_path.split('.'):
+            if isinstance(current, dict):
+                current = current.get(part)
+            else:
+                return None
+        return current if isinstance(current, str) else None
@@ -0,0 +1,325 @@
+"""
+Streaming Statistics
+Mergeable accumulators for evaluation summaries, with quantiles from a t-digest.
+
+Scores are folded into bounded state as they arrive instead of being kept
+in lists, so summaries of 100k+ item runs need a few hundred centroids, not
+a list of every score.
+Accumulators built by parallel workers combine with merge(), and serialize
+with to_dict() / from_dict() so partial summaries can cross process
+boundaries or be read back from JSON reports.
+
+    stats = ScoreStats()
+    for score in scores:
+        stats.add(score)
+    stats.quantile(0.9)
+"""
+
+import math
+from bisect import bisect_right
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+DEFAULT_COMPRESSION = 100
+REPORTED_QUANTILES = (0.5, 0.9, 0.99)
+
+
+class TDigest:
+    """
+    Merging t-digest (Dunning) for streaming quantile estimates.
+
+    Values are buffered and periodically merged into centroids whose size is
+    bounded by 4 * n * q * (1 - q) / compression, so the tails stay accurate
+    while the middle is summarized coarsely. With n <= compression every
+    value keeps its own centroid and quantiles are exact.
+    """
+
+    def __init__(self, compression: float = DEFAULT_COMPRESSION):
+        self.compression = compression
+        self._centroids: List[Tuple[float, float]] = []  # (mean, weight), sorted by mean
+        self._buffer: List[Tuple[float, float]] = []
+        self.count = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float, weight: float = 1.0) -> None:
+        self._buffer.append((float(value), float(weight)))
+        self.count += weight
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        if len(self._buffer) >= self.compression * 5:
+            self._compress()
+
+    def merge(self, other: 'TDigest') -> 'TDigest':
+        """Fold another digest into this one (the other is left unchanged)."""
+        if other.count:
+            self._buffer.extend(other.centroids())
+            self.count += other.count
+            self.min = min(self.min, other.min)
+            self.max = max(self.max, other.max)
+            self._compress()
+        return self
+
+    def centroids(self) -> List[Tuple[float, float]]:
+        self._compress()
+        return list(self._centroids)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimated value at quantile q (0..1), or None if the digest is empty."""
+        if not self.count:
+            return None
+        if not 0 <= q <= 1:
+            raise ValueError(f"Quantile must be between 0 and 1: {q}")
+        centroids = self.centroids()
+        if len(centroids) == 1:
+            return centroids[0][0]
+
+        # Interpolate between centroid centers; with unit weights this matches
+        # linear interpolation between order statistics
+        target = q * (self.count - 1) + 0.5
+        cumulative = 0.0
+        previous_center, previous_mean = None, None
+        for mean, weight in centroids:
+            center = cumulative + weight / 2
+            if target <= center:
+                if previous_center is None:
+                    # Before the first center: between the minimum and the first mean
+                    return self.min + (mean - self.min) * max(0.0, target) / center if center else mean
+                fraction = (target - previous_center) / (center - previous_center)
+                return previous_mean + (mean - previous_mean) * fraction
+            cumulative += weight
+            previous_center, previous_mean = center, mean
+        # Past the last center: between the last mean and the maximum
+        tail = self.count - previous_center
+        fraction = min(1.0, (target - previous_center) / tail) if tail else 1.0
+        return previous_mean + (self.max - previous_mean) * fraction
+
+    def _compress(self) -> None:
+        if not self._buffer:
+            return
+        points = sorted(self._centroids + self._buffer)
+        self._buffer = []
+        total = sum(weight for _, weight in points)
+
+        merged: List[Tuple[float, float]] = []
+        cumulative = 0.0
+        mean, weight = points[0]
+        for next_mean, next_weight in points[1:]:
+            combined = weight + next_weight
+            q = (cumulative + combined / 2) / total
+            if combined <= max(1.0, 4 * total * q * (1 - q) / self.compression):
+                mean += (next_mean - mean) * next_weight / combined
+                weight = combined
+            else:
+                merged.append((mean, weight))
+                cumulative += weight
+                mean, weight = next_mean, next_weight
+        merged.append((mean, weight))
+        self._centroids = merged
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'compression': self.compression,
+            'centroids': [[mean, weight] for mean, weight in self.centroids()],
+            'min': self.min if self.count else None,
+            'max': self.max if self.count else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'TDigest':
+        digest = cls(data.get('compression', DEFAULT_COMPRESSION))
+        digest._centroids = [(float(mean), float(weight)) for mean, weight in data.get('centroids', [])]
+        digest.count = sum(weight for _, weight in digest._centroids)
+        if digest.count:
+            digest.min = float(data['min'])
+            digest.max = float(data['max'])
+        return digest
+
+
+class ScoreStats:
+    """Count, mean, extremes, quantiles and optional histogram of a stream of scores."""
+
+    def __init__(self, bins: Optional[Sequence[float]] = None,
+                 compression: float = DEFAULT_COMPRESSION):
+        self.count = 0
+        self.total = 0.0
+        self.digest = TDigest(compression)
+        # Histogram bins behave like numpy.histogram: [low, high), last bin closed
+        self.bins = list(bins) if bins is not None else None
+        self.histogram = [0] * (len(self.bins) - 1) if self.bins else None
+
+    def add(self, score: float) -> None:
+        self.count += 1
+        self.total += score
+        self.digest.add(score)
+        if self.bins and self.bins[0] <= score <= self.bins[-1]:
+            index = min(bisect_right(self.bins, score) - 1, len(self.histogram) - 1)
+            self.histogram[index] += 1
+
+    def extend(self, scores: Iterable[float]) -> 'ScoreStats':
+        for score in scores:
+            self.add(score)
+        return self
+
+    def merge(self, other: 'ScoreStats') -> 'ScoreStats':
+        self.count += other.count
+        self.total += other.total
+        self.digest.merge(other.digest)
+        if self.bins is not None and other.bins == self.bins:
+            self.histogram = [a + b for a, b in zip(self.histogram, other.histogram)]
+        return self
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> Optional[float]:
+        return self.digest.quantile(q)
+
+    def summary(self) -> Dict[str, Any]:
+        """Plain statistics: count, mean, min, max and the reported quantiles."""
+        summary = {
+            'count': self.count,
+            'mean': round(self.mean, 3),
+            'min': self.digest.min if self.count else 0,
+            'max': self.digest.max if self.count else 0,
+        }
+        for q in REPORTED_QUANTILES:
+            value = self.quantile(q)
+            summary[quantile_label(q)] = round(value, 3) if value is not None else None
+        return summary
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {'count': self.count, 'total': self.total, 'digest': self.digest.to_dict()}
+        if self.bins is not None:
+            data['bins'] = self.bins
+            data['histogram'] = self.histogram
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ScoreStats':
+        stats = cls(bins=data.get('bins'))
+        stats.count = data['count']
+        stats.total = data['total']
+        stats.digest = TDigest.from_dict(data['digest'])
+        if stats.bins is not None:
+            stats.histogram = list(data['histogram'])
+        return stats
+
+
+def quantile_label(q: float) -> str:
+    """0.5 -> 'p50', 0.99 -> 'p99', 0.999 -> 'p99.9'."""
+    return f"p{q * 100:g}"
+
+
+# Judge totals summed from ScorerResult.timings
+JUDGE_COUNTERS = ('renders', 'calls', 'attempts', 'retries', 'prompt_tokens',
+                  'completion_tokens', 'total_tokens', 'render_seconds', 'latency_seconds')
+
+
+class RunStats:
+    """
+    Single-pass summary of scored evaluation items, mergeable across workers.
+
+    The engine feeds it while scoring: add_score as each result is committed
+    and count_item once an item has all its scores. add_item does both for an
+    already scored item. Partial RunStats of several workers merge, and
+    summary() produces the `summary_stats` dict of an EvaluationBatch.
+    """
+
+    def __init__(self):
+        self.total_items = 0
+        self.passed_items = 0
+        self.scores = ScoreStats()
+        self.response_cache = {'hits': 0, 'misses': 0}
+        self.serialization: Dict[str, Any] = {}
+        # Judge call instrumentation (ScorerResult.timings, see core/instrumentation.py)
+        self.judge = dict.fromkeys(JUDGE_COUNTERS, 0)
+        self.judge_latency = ScoreStats()
+
+    def add_item(self, item) -> None:
+        """Count a scored item and all of its scores."""
+        for score in item.scores:
+            self.add_score(score)
+        self.count_item(item)
+
+    def count_item(self, item) -> None:
+        """Count an item whose scores were already added; it passes if every score passed."""
+        self.total_items += 1
+        if item.scores and all(s.passed for s in item.scores):
+            self.passed_items += 1
+
+    def add_score(self, score) -> None:
+        if score.numeric_score is not None:
+            self.scores.add(score.numeric_score)
+        # Judge response cache hits/misses, when a stage enabled it
+        outcome = score.details.get('response_cache')
+        if outcome == 'hit':
+            self.response_cache['hits'] += 1
+        elif outcome == 'miss':
+            self.response_cache['misses'] += 1
+        # Prompt size saved by a non-default serialization format
+        size = score.details.get('serialization')
+        if size:
+            self._add_serialization(size['format'], size['chars'], size['indent_chars'])
+        if score.timings:
+            self._add_judge_timings(score.timings)
+
+    def _add_judge_timings(self, timings: Dict[str, Any]) -> None:
+        judge = self.judge
+        judge['renders'] += 1
+        judge['render_seconds'] += timings.get('render_seconds', 0.0)
+        if 'latency_seconds' in timings:
+            attempts = timings.get('attempts', 1)
+            judge['calls'] += 1
+            judge['attempts'] += attempts
+            judge['retries'] += max(attempts - 1, 0)
+            judge['latency_seconds'] += timings['latency_seconds']
+            self.judge_latency.add(timings['latency_seconds'])
+        for name in ('prompt_tokens', 'completion_tokens', 'total_tokens'):
+            judge[name] += timings.get(name) or 0
+
+    def merge(self, other: 'RunStats') -> 'RunStats':
+        self.total_items += other.total_items
+        self.passed_items += other.passed_items
+        self.scores.merge(other.scores)
+        for key in self.response_cache:
+            self.response_cache[key] += other.response_cache[key]
+        if other.serialization:
+            self._add_serialization(other.serialization['format'], other.serialization['chars'],
+                                    other.serialization['indent_chars'])
+        for key in self.judge:
+            self.judge[key] += other.judge[key]
+        self.judge_latency.merge(other.judge_latency)
+        return self
+
+    def _add_serialization(self, fmt: str, chars: int, indent_chars: int) -> None:
+        if not self.serialization:
+            self.serialization = {'format': fmt, 'chars': 0, 'indent_chars': 0}
+        self.serialization['chars'] += chars
+        self.serialization['indent_chars'] += indent_chars
+
+    def summary(self, chars_per_token: int = 4) -> Dict[str, Any]:
+        total, passed = self.total_items, self.passed_items
+        summary = {
+            'total_items': total,
+            'passed': passed,
+            'failed': total - passed,
+            'average_score': round(self.scores.mean, 3),
+            'status': 'PASS' if passed == total else 'PARTIAL' if passed > 0 else 'FAIL',
+            # Mergeable state rides along so reports can be combined without their items
+            'scores': {**self.scores.summary(), 'state': self.scores.to_dict()},
+        }
+        if any(self.response_cache.values()):
+            summary['response_cache'] = dict(self.response_cache)
+        if self.serialization:
+            saved = self.serialization['indent_chars'] - self.serialization['chars']
+            summary['serialization'] = {
+                **self.serialization,
+                'saved_chars': saved,
+                'saved_tokens_estimate': saved // chars_per_token,
+            }
+        if self.judge['renders']:
+            judge = {key: round(value, 6) if isinstance(value, float) else value
+                     for key, value in self.judge.items()}
+            summary['timings'] = {'judge': {**judge, 'latency': self.judge_latency.summary()}}
+        return summary
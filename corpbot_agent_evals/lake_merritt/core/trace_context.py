@@ -0,0 +1,77 @@
+"""
+Trace Context
+Read-only values shared by every item prepared from one trace.
+
+Per-span items used to carry their own copies of the trace-wide breaker
+review, change log and reviewer suggestions, and the trace-level item kept
+its trace summary both as `input` and in metadata. Items now reference one
+TraceContext instead: `item.metadata` is a SharedMetadata mapping whose
+lookups fall through to the context, so scorers and judge templates read
+shared keys exactly as before, and only the keys they use are resolved.
+Writes go to the item's own values; the context itself never changes.
+
+Reports write the context once per batch (`EvaluationBatch.trace_context`,
+or a `trace_context` record in JSON Lines reports) and only each item's own
+metadata.
+"""
+
+from collections import ChainMap
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, Mapping, Optional
+
+
+class TraceContext:
+    """
+    Shared, read-only metadata of one prepared trace.
+
+    `in_input` names keys that the items' `input` already carries in
+    serialized form (the trace-level item's trace summary); reports leave
+    them out rather than writing the same data twice.
+    """
+
+    def __init__(self, values: Mapping[str, Any], in_input: Iterable[str] = ()):
+        self.values = MappingProxyType(dict(values))
+        self.in_input = frozenset(in_input)
+
+    def metadata(self, own: Optional[Dict[str, Any]] = None) -> 'SharedMetadata':
+        """Item metadata backed by this context, with `own` for per-item values."""
+        return SharedMetadata(self, own)
+
+    def report_values(self) -> Dict[str, Any]:
+        """The context as written once per report."""
+        return {key: value for key, value in self.values.items() if key not in self.in_input}
+
+    def __reduce__(self):
+        # MappingProxyType does not pickle; items cross process pools in core.batch
+        return (TraceContext, (dict(self.values), tuple(self.in_input)))
+
+
+class SharedMetadata(ChainMap):
+    """An item's own metadata, falling back to its trace's shared TraceContext."""
+
+    def __init__(self, context: TraceContext, own: Optional[Dict[str, Any]] = None):
+        super().__init__({} if own is None else own, context.values)
+        self.context = context
+
+    @property
+    def own(self) -> Dict[str, Any]:
+        return self.maps[0]
+
+    def copy(self) -> 'SharedMetadata':
+        """Copy of the item's own values, still sharing the context."""
+        return SharedMetadata(self.context, dict(self.own))
+
+    __copy__ = copy
+
+    def __reduce__(self):
+        return (SharedMetadata, (self.context, self.own))
+
+
+def own_metadata(metadata: Mapping[str, Any]) -> Mapping[str, Any]:
+    """The values an item holds itself (all of them, for plain dict metadata)."""
+    return metadata.own if isinstance(metadata, SharedMetadata) else metadata
+
+
+def metadata_context(metadata: Any) -> Optional[TraceContext]:
+    """The TraceContext behind an item's metadata, if any."""
+    return metadata.context if isinstance(metadata, SharedMetadata) else None
@@ -6,7 +6,11 @@ set -e
 
 TRACE_FILE=$1
 EVAL_PACK=${2:-"revision_addressed"}
+# Pass --force as the third argument to re-judge results cached from earlier runs
+FORCE=$([ "${3:-}" = "--force" ] && echo True || echo False)
 TIMESTAMP=$(date +%Y%m%d_%H%M%S)
+# Set LAKE_MERRITT_SELF_TRACE=1 to also write the run's own timings as an OTLP/JSON trace
+SELF_TRACE=$([ -n "${LAKE_MERRITT_SELF_TRACE:-}" ] && echo True || echo False)
 
 # Get script directory and repo root
 SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
@@ -57,12 +61,14 @@ fi
 # Output locations
 LAKE_MERRITT_DIR="$REPO_ROOT/corpbot_agent_evals/lake_merritt"
 EVALS_DIR="$REPO_ROOT/.observability/evals"
-JSON_OUTPUT="${EVALS_DIR}/${EVAL_PACK}_${TIMESTAMP}.json"
+JSONL_OUTPUT="${EVALS_DIR}/${EVAL_PACK}_${TIMESTAMP}.jsonl"
 MD_OUTPUT="${EVALS_DIR}/${EVAL_PACK}_${TIMESTAMP}.md"
+SELF_TRACE_OUTPUT="${EVALS_DIR}/${EVAL_PACK}_${TIMESTAMP}.self_trace.json"
 
 EVAL_PACK_FILE="$LAKE_MERRITT_DIR/examples/eval_packs/${EVAL_PACK}.yaml"
 
-if [ ! -f "$EVAL_PACK_FILE" ]; then
+# "all" runs every eval pack against the trace in one pass (trace parsed once)
+if [ "$EVAL_PACK" != "all" ] && [ ! -f "$EVAL_PACK_FILE" ]; then
   echo "ERROR: Eval pack not found: $EVAL_PACK_FILE"
   echo ""
   echo "Available eval packs:"
@@ -80,38 +86,87 @@ echo ""
 # Run REAL evaluation
 cd "$LAKE_MERRITT_DIR"
 python3 << PYTHON_SCRIPT
-import json
 import sys
 sys.path.insert(0, '.')
 from pathlib import Path
-from core.evaluation import run_evaluation_batch
+from core.eval_pack.loader import load_eval_pack
+from core.evaluation import run_evaluation_batch, run_evaluation_suite
+from core.reports import ReportWriter
+from core.result_cache import ResultCache
 
 trace_file = Path('${TRACE_FILE_ABS}')
-json_output = Path('${JSON_OUTPUT}')
-md_output = Path('${MD_OUTPUT}')
-pack_path = 'examples/eval_packs/${EVAL_PACK}.yaml'
-
+evals_dir = Path('${EVALS_DIR}')
+eval_pack = '${EVAL_PACK}'
+timestamp = '${TIMESTAMP}'
+force = ${FORCE}
+self_trace = Path('${SELF_TRACE_OUTPUT}') if ${SELF_TRACE} else None
+cache = ResultCache()
+
+# The trace file is streamed span by span rather than loaded whole
 print(f"Loading trace from {trace_file}...")
-with open(trace_file) as f:
-    trace_data = json.load(f)
-
-print(f"Running evaluation with {pack_path}...")
-results = run_evaluation_batch(trace_data, pack_path)
-
-# JSON output
-with open(json_output, 'w') as f:
-    json.dump(results.model_dump(), f, indent=2, default=str)
-
-# Markdown output
-with open(md_output, 'w') as f:
-    f.write(results.to_markdown())
-
-print("")
-print(f"Status: {results.summary_stats['status']}")
-print(f"Score: {results.summary_stats['average_score']}")
-print(f"Passed: {results.summary_stats['passed']}/{results.summary_stats['total_items']}")
+trace_data = trace_file
+
+if eval_pack == 'all':
+    pack_paths = sorted(str(p) for p in Path('examples/eval_packs').glob('*.yaml'))
+else:
+    pack_paths = [f'examples/eval_packs/{eval_pack}.yaml']
+
+# Reports are written item by item as results are committed (JSON Lines with a
+# trailing summary record, and Markdown), so partial results show up during long runs
+writers = {
+    path: ReportWriter(load_eval_pack(path).name,
+                       jsonl=evals_dir / f"{Path(path).stem}_{timestamp}.jsonl",
+                       markdown=evals_dir / f"{Path(path).stem}_{timestamp}.md")
+    for path in pack_paths
+}
+try:
+    if eval_pack == 'all':
+        print(f"Running evaluation suite ({len(pack_paths)} packs)...")
+        suite = run_evaluation_suite(trace_data, pack_paths, cache=cache, force=force,
+                                     on_item=lambda path, item: writers[path].write_item(item))
+    else:
+        print(f"Running evaluation with {pack_paths[0]}...")
+        suite = {pack_paths[0]: run_evaluation_batch(trace_data, pack_paths[0], cache=cache, force=force,
+                                                     on_item=writers[pack_paths[0]].write_item,
+                                                     self_trace=self_trace)}
+    for path, results in suite.items():
+        writers[path].write_summary(results.summary_stats)
+finally:
+    for writer in writers.values():
+        writer.close()
+
+for path, results in suite.items():
+    pack_name = Path(path).stem
+    print("")
+    print(f"[{pack_name}]")
+    print(f"Status: {results.summary_stats['status']}")
+    print(f"Score: {results.summary_stats['average_score']}")
+    print(f"Passed: {results.summary_stats['passed']}/{results.summary_stats['total_items']}")
+    cache_stats = results.summary_stats.get('cache', {})
+    print(f"Cached stages: {cache_stats.get('hits', 0)} (re-judged {cache_stats.get('misses', 0)})")
+    serialization = results.summary_stats.get('serialization')
+    if serialization:
+        print(f"Serialization ({serialization['format']}): saved {serialization['saved_chars']} chars "
+              f"(~{serialization['saved_tokens_estimate']} tokens) of {serialization['indent_chars']}")
+    timings = results.summary_stats.get('timings', {})
+    if 'wall_seconds' in timings:
+        slowest = sorted(timings['phases'].items(), key=lambda kv: -kv[1]['wall_seconds'])[:3]
+        print(f"Time: {timings['wall_seconds']:.2f}s wall, {timings['cpu_seconds']:.2f}s CPU ("
+              + ", ".join(f"{name} {phase['wall_seconds']:.2f}s" for name, phase in slowest) + ")")
+    judge = timings.get('judge')
+    if judge and judge['calls']:
+        print(f"Judge: {judge['calls']} calls, {judge['retries']} retries, "
+              f"p50 {judge['latency']['p50']}s / p99 {judge['latency']['p99']}s, "
+              f"{judge['total_tokens']} tokens")
 PYTHON_SCRIPT
 
 echo ""
-echo "JSON report: $JSON_OUTPUT"
-echo "Markdown report: $MD_OUTPUT"
+if [ "$EVAL_PACK" = "all" ]; then
+  echo "Reports: ${EVALS_DIR}/*_${TIMESTAMP}.{jsonl,md}"
+else
+  echo "JSON Lines report: $JSONL_OUTPUT"
+  echo "Markdown report: $MD_OUTPUT"
+  if [ "$SELF_TRACE" = "True" ]; then
+    echo "Self-trace: $SELF_TRACE_OUTPUT"
+  fi
+fi
@@ -129,6 +129,54 @@ def sample_ag_telemetry_file(temp_dir: Path, sample_ag_telemetry: str) -> Path:
     return telemetry_file
 
 
+def _otel_attr(key, value):
+    """Build an OTLP/JSON attribute entry."""
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": value}}
+    return {"key": key, "value": {"stringValue": value}}
+
+
+@pytest.fixture
+def sample_otel_trace() -> dict:
+    """Return a small OTLP/JSON skill trace (drafter, reviewer, breaker)."""
+    contents = [
+        ("drafter", "Drafted the artifact v1.0"),
+        ("reviewer", "APPROVE with suggestions:\n1. Add tests\n2. Add docs"),
+        ("breaker", "BREAKER REVIEW\nFAILURE SCENARIO 1: empty input crashes\n\n"),
+        ("drafter", "Change Log v1.1\nFixed empty input handling\n\n"),
+    ]
+    spans = []
+    for i, (agent, content) in enumerate(contents):
+        spans.append({
+            "traceId": "trace-abc",
+            "spanId": f"span-{i}",
+            "name": f"{agent}.turn",
+            "startTimeUnixNano": str(1705700000000000000 + i * 1000000000),
+            "endTimeUnixNano": str(1705700000500000000 + i * 1000000000),
+            "attributes": [_otel_attr("agent", agent), _otel_attr("content", content)],
+        })
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [
+                _otel_attr("service.name", "skill-run"),
+                _otel_attr("metadata.user_prompt", "Write a parser"),
+                _otel_attr("metadata.all_approved", True),
+            ]},
+            "scopeSpans": [{"scope": {"name": "interlateral"}, "spans": spans}],
+        }]
+    }
+
+
+@pytest.fixture
+def sample_otel_trace_file(temp_dir: Path, sample_otel_trace: dict) -> Path:
+    """Write the sample OTLP trace to disk and return its path."""
+    trace_file = temp_dir / "trace.json"
+    trace_file.write_text(json.dumps(sample_otel_trace))
+    return trace_file
+
+
 @pytest.fixture
 def mock_observability_dir(temp_dir: Path) -> Path:
     """Create a mock .observability directory structure."""
@@ -8,6 +8,7 @@ Tests the three observability ingestors:
 """
 
 import json
+import subprocess
 import tempfile
 from pathlib import Path
 from datetime import datetime
@@ -19,6 +20,8 @@ import sys
 REPO_ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(REPO_ROOT / "corpbot_agent_evals" / "lake_merritt"))
 
+LAKE_MERRITT_DIR = REPO_ROOT / "corpbot_agent_evals" / "lake_merritt"
+
 from core.ingestion import (
     CastIngester, CastRecording, parse_cast_file,
     CCJSONLIngester, CCTranscript, parse_cc_transcript,
@@ -123,6 +126,79 @@ class TestCastIngester:
         assert recording.source_file == str(cast_file)
 
 
+    @pytest.mark.unit
+    def test_iter_frames_is_lazy(self, sample_cast_file):
+        """iter_frames yields the same frames as ingest, one at a time."""
+        ingester = CastIngester()
+        frames = ingester.iter_frames(sample_cast_file)
+
+        assert next(frames).data == "$ "
+        assert [f.data for f in frames] == [f.data for f in ingester.ingest(sample_cast_file).frames[1:]]
+
+    @pytest.mark.unit
+    def test_iter_frames_filters(self, temp_dir):
+        """Time range (start inclusive, end exclusive) and event type filters."""
+        content = "\n".join([
+            json.dumps({"version": 2, "width": 80, "height": 24}),
+            json.dumps([0.5, "o", "a"]),
+            json.dumps([1.0, "i", "b"]),
+            "not json",
+            json.dumps([1.5, "o", "c"]),
+            json.dumps([2.0, "o", "d"]),
+        ])
+        cast_file = temp_dir / "filters.cast"
+        cast_file.write_text(content)
+        ingester = CastIngester()
+
+        assert [f.data for f in ingester.iter_frames(cast_file, start=1.0, end=2.0)] == ["b", "c"]
+        assert [f.data for f in ingester.iter_frames(cast_file, event_types={"o"})] == ["a", "c", "d"]
+
+    @pytest.mark.unit
+    def test_iter_frames_validates_header(self, temp_dir):
+        """Header errors surface when iteration starts."""
+        cast_file = temp_dir / "v1.cast"
+        cast_file.write_text(json.dumps({"version": 1}) + "\n")
+
+        with pytest.raises(ValueError, match="Unsupported asciicast version"):
+            list(CastIngester().iter_frames(cast_file))
+
+    @pytest.mark.unit
+    def test_text_and_patterns_stream_from_files(self, sample_cast_v2, sample_cast_file):
+        """extract_text and find_patterns accept a file path or file object as well as a recording."""
+        import io
+
+        ingester = CastIngester()
+        recording = ingester.ingest(sample_cast_file)
+
+        assert ingester.extract_text(sample_cast_file) == ingester.extract_text(recording)
+        assert ingester.extract_text(io.StringIO(sample_cast_v2)) == ingester.extract_text(recording)
+        assert (ingester.find_patterns(sample_cast_file, ["$", "hello"])
+                == ingester.find_patterns(recording, ["$", "hello"]))
+
+    @pytest.mark.unit
+    def test_streaming_memory_is_constant(self, temp_dir):
+        """Streaming a recording 10x larger does not raise peak memory with it."""
+        import tracemalloc
+        from benchmarks import synthetic
+
+        ingester = CastIngester()
+
+        def peak_for(frames):
+            cast_file = synthetic.write_cast(temp_dir / f"{frames}.cast", frames)
+            tracemalloc.start()
+            results = ingester.find_patterns(cast_file, ["no such text"])
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            assert results == {"no such text": []}
+            return cast_file.stat().st_size, peak
+
+        small_size, small_peak = peak_for(10000)
+        large_size, large_peak = peak_for(100000)
+
+        assert large_size > 9 * small_size
+        assert large_peak < 2 * small_peak
+
+
 class TestCCJSONLIngester:
     """Tests for Claude Code transcript parsing (BC-06)."""
 
@@ -379,3 +455,111 @@ class TestIngesterImports:
         assert callable(parse_cast_file)
         assert callable(parse_cc_transcript)
         assert callable(parse_ag_telemetry)
+
+    @pytest.mark.unit
+    def test_exports_are_lazy(self):
+        """Importing the package loads no ingester until one is asked for."""
+        code = ("import sys, core.ingestion as ingestion; "
+                "before = sorted(m for m in sys.modules if m.startswith('core.ingestion.')); "
+                "ingestion.CastIngester; "
+                "after = sorted(m for m in sys.modules if m.startswith('core.ingestion.')); "
+                "print(before, after, 'CSVIngester' in dir(ingestion))")
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                             check=True, cwd=LAKE_MERRITT_DIR)
+
+        assert out.stdout.strip() == "[] ['core.ingestion.cast_ingester'] True"
+
+    @pytest.mark.unit
+    def test_ingestion_only_import_skips_heavy_modules(self):
+        """The observability ingesters (used by hooks and status scripts) import without heavy dependencies."""
+        code = ("import core.ingestion.cast_ingester, core.ingestion.cc_jsonl_ingester, "
+                "core.ingestion.ag_telemetry_ingester")
+
+        loaded = _loaded_modules(code)
+
+        for heavy in ("pydantic", "pandas", "numpy", "openai", "tenacity", "jinja2", "yaml",
+                      "dotenv", "core.data_models", "core.evaluation", "core.scoring"):
+            assert heavy not in loaded
+
+
+def _loaded_modules(code):
+    result = subprocess.run([sys.executable, "-c", f"{code}; import sys; print(' '.join(sys.modules))"],
+                            capture_output=True, text=True, check=True, cwd=LAKE_MERRITT_DIR)
+    return set(result.stdout.split())
+
+
+class TestSyntheticInputs:
+    """Tests for the benchmark input generators (benchmarks.synthetic) and the suite's baseline check."""
+
+    @pytest.mark.unit
+    def test_generators_are_deterministic(self, temp_dir):
+        """The same count and seed always give the same bytes."""
+        from benchmarks import synthetic
+
+        for name, write in synthetic.WRITERS.items():
+            first = write(temp_dir / f"{name}_a", 200, seed=3).read_bytes()
+            second = write(temp_dir / f"{name}_b", 200, seed=3).read_bytes()
+            other = write(temp_dir / f"{name}_c", 200, seed=4).read_bytes()
+            assert first == second
+            assert first != other
+
+    @pytest.mark.unit
+    def test_ingesters_read_every_record(self, temp_dir):
+        """Each generated file parses fully with its ingester."""
+        from benchmarks import synthetic
+
+        recording = CastIngester().ingest(synthetic.write_cast(temp_dir / "s.cast", 500))
+        transcript = CCJSONLIngester().ingest(synthetic.write_cc_jsonl(temp_dir / "s.jsonl", 500))
+        session = AGTelemetryIngester().ingest(synthetic.write_ag_telemetry(temp_dir / "telemetry.log", 500))
+
+        assert len(recording.frames) == 500
+        usage_entries = sum(1 for entry in synthetic.cc_entries(500) if entry['type'] == 'token_usage')
+        assert len(transcript.messages) == 500 - usage_entries
+        assert transcript.token_counts['input'] > 0
+        assert len(session.events) == 500
+        assert session.thought_metadata
+
+    @pytest.mark.unit
+    def test_otlp_trace_evaluates(self, temp_dir):
+        """A generated trace streams into one item per span, with its secrets redacted."""
+        from benchmarks import synthetic
+        from core.eval_pack.loader import EvalPack, IngestionConfig
+        from core.evaluation import extract_items_from_trace, load_trace_index
+
+        index = load_trace_index(synthetic.write_otlp(temp_dir / "trace.json", 300))
+        pack = EvalPack(name='synthetic', description='', version='1.0',
+                        ingestion=IngestionConfig(type='generic_otel', config={}), pipeline=[])
+        items = extract_items_from_trace(index, pack)
+
+        assert len(index.spans) == 300
+        assert index.children_of(0)
+        assert len(items) == 300
+        assert 'FAILURE SCENARIO' in items[0].metadata['breaker_review']
+        assert any('[REDACTED]' in item.input for item in items)
+        assert not any('sk-0' in item.input for item in items)
+
+    @pytest.mark.unit
+    def test_baseline_check(self):
+        """Results are compared per record in calibrated units; only slowdowns past the threshold fail."""
+        from benchmarks.bench_suite import compare, regressions
+
+        baseline = {'calibration_seconds': 0.04,
+                    'results': {'ingest_cast': {'1000': 4e-6}, 'render': {'1000': 1e-5}}}
+        # Machine twice as slow: calibration and results both double
+        results = {'ingest_cast': {'1000': 8e-6, '10000': 8e-6}, 'render': {'1000': 4e-5}}
+        ratios = compare(results, 0.08, baseline)
+
+        assert ratios['ingest_cast'] == {'1000': pytest.approx(1.0), '10000': None}
+        assert ratios['render']['1000'] == pytest.approx(2.0)
+        assert regressions(ratios, threshold=0.5) == ['render@1000']
+
+    @pytest.mark.unit
+    def test_suite_runs_offline(self):
+        """A small run of the suite times every requested case."""
+        from benchmarks.bench_suite import CASES, run_suite
+
+        cases = [case for case in CASES if case.name in ('ingest_cast', 'redaction')]
+        results = run_suite([50], cases, repeat=1)
+
+        assert set(results) == {'ingest_cast', 'redaction'}
+        assert all(results[name]['50'] > 0 for name in results)
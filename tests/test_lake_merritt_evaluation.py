@@ -0,0 +1,1228 @@
+"""
+Tests for the Lake Merritt evaluation engine (core.evaluation).
+
+Judge calls are replaced with in-process fake scorers, so no API key or
+network access is needed.
+"""
+
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Import from the lake_merritt package in corpbot_agent_evals
+import sys
+REPO_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(REPO_ROOT / "corpbot_agent_evals" / "lake_merritt"))
+
+from core import evaluation
+from core.data_models import ScorerResult
+from core.evaluation import run_evaluation_batch
+from core.span_index import SpanIndex
+
+
+PACK_TEMPLATE = """
+name: "Test Pack"
+ingestion:
+  type: "generic_otel"
+  config:
+    evaluation_mode: "{mode}"
+{ingestion_extra}
+pipeline:
+  - name: "judge"
+    scorer: "llm_judge"
+    config:
+      threshold: 0.5
+{stage_extra}
+    on_fail: "{on_fail}"
+"""
+
+
+def write_pack(temp_dir, mode="span", on_fail="continue", ingestion_extra="", stage_extra=""):
+    """Write a minimal eval pack and return its path."""
+    pack_file = temp_dir / "test_pack.yaml"
+    pack_file.write_text(PACK_TEMPLATE.format(
+        mode=mode, on_fail=on_fail,
+        ingestion_extra=ingestion_extra, stage_extra=stage_extra,
+    ))
+    return str(pack_file)
+
+
+class FakeScorer:
+    """Scores items without calling an LLM; tracks peak concurrency."""
+
+    def __init__(self, delay=0.0, fail_ids=()):
+        self.delay = delay
+        self.fail_ids = set(fail_ids)
+        self.calls = []
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def score(self, item, config):
+        with self._lock:
+            self.calls.append(item.id)
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        passed = item.id not in self.fail_ids
+        return ScorerResult(
+            scorer_name='fake',
+            numeric_score=1.0 if passed else 0.0,
+            passed=passed,
+            reasoning=f"scored {item.id}",
+        )
+
+
+@pytest.fixture
+def fake_scorer(monkeypatch):
+    """Install a FakeScorer factory in place of the LLM judge."""
+    def install(**kwargs):
+        scorer = FakeScorer(**kwargs)
+        monkeypatch.setattr(evaluation, "create_scorer", lambda stage: scorer)
+        return scorer
+
+    return install
+
+
+class TestConcurrentScoring:
+    """Tests for bounded-concurrency judge execution."""
+
+    @pytest.mark.unit
+    def test_serial_by_default(self, sample_otel_trace, temp_dir, fake_scorer):
+        """Without a concurrency setting, items are scored one at a time."""
+        scorer = fake_scorer(delay=0.01)
+        batch = run_evaluation_batch(sample_otel_trace, write_pack(temp_dir))
+
+        assert scorer.peak == 1
+        assert [item.id for item in batch.items] == ["span_0", "span_1", "span_2", "span_3"]
+        assert batch.summary_stats['status'] == 'PASS'
+
+    @pytest.mark.unit
+    def test_stage_concurrency_runs_in_parallel(self, sample_otel_trace, temp_dir, fake_scorer):
+        """Stage-level concurrency should overlap judge calls and keep order."""
+        scorer = fake_scorer(delay=0.05)
+        pack = write_pack(temp_dir, stage_extra="      concurrency: 4")
+        batch = run_evaluation_batch(sample_otel_trace, pack)
+
+        assert scorer.peak > 1
+        assert [item.scores[0].reasoning for item in batch.items] == [
+            f"scored span_{i}" for i in range(4)
+        ]
+
+    @pytest.mark.unit
+    def test_pack_level_concurrency(self, sample_otel_trace, temp_dir, fake_scorer):
+        """ingestion.config concurrency applies when the stage does not set one."""
+        scorer = fake_scorer(delay=0.05)
+        pack = write_pack(temp_dir, ingestion_extra="    concurrency: 4")
+        run_evaluation_batch(sample_otel_trace, pack)
+
+        assert scorer.peak > 1
+
+    @pytest.mark.unit
+    def test_on_fail_stop_matches_serial(self, sample_otel_trace, temp_dir, fake_scorer):
+        """Items after the first stopping failure get no score, even when concurrent."""
+        fake_scorer(fail_ids={"span_1"})
+        pack = write_pack(temp_dir, on_fail="stop", stage_extra="      concurrency: 4")
+        batch = run_evaluation_batch(sample_otel_trace, pack)
+
+        scored = [len(item.scores) for item in batch.items]
+        assert scored == [1, 1, 0, 0]
+
+    @pytest.mark.unit
+    def test_invalid_concurrency_raises(self, sample_otel_trace, temp_dir, fake_scorer):
+        """A non-integer concurrency is a pack error."""
+        fake_scorer()
+        pack = write_pack(temp_dir, stage_extra="      concurrency: lots")
+        with pytest.raises(ValueError, match="Invalid concurrency"):
+            run_evaluation_batch(sample_otel_trace, pack)
+
+
+class TestEvaluationSuite:
+    """Tests for single-pass multi-pack evaluation."""
+
+    @pytest.mark.unit
+    def test_suite_prepares_trace_once(self, sample_otel_trace, temp_dir, fake_scorer, monkeypatch):
+        """All packs share one parse/extraction of the trace."""
+        fake_scorer()
+        calls = {'index': 0, 'trace_item': 0}
+        real_from_trace = SpanIndex.from_trace.__func__
+        real_trace_item = evaluation.create_trace_level_item
+
+        def counting_from_trace(cls, trace_data):
+            calls['index'] += 1
+            return real_from_trace(cls, trace_data)
+
+        def counting_trace_item(*args, **kwargs):
+            calls['trace_item'] += 1
+            return real_trace_item(*args, **kwargs)
+
+        monkeypatch.setattr(SpanIndex, "from_trace", classmethod(counting_from_trace))
+        monkeypatch.setattr(evaluation, "create_trace_level_item", counting_trace_item)
+
+        pack_paths = sorted(str(p) for p in evaluation.DEFAULT_PACK_DIR.glob("*.yaml"))
+        suite = evaluation.run_evaluation_suite(sample_otel_trace, pack_paths)
+
+        assert list(suite) == pack_paths
+        assert calls == {'index': 1, 'trace_item': 1}
+        for batch in suite.values():
+            assert batch.summary_stats['total_items'] == 1
+
+    @pytest.mark.unit
+    def test_suite_items_are_independent(self, sample_otel_trace, temp_dir, fake_scorer):
+        """Scores from one pack never leak into another pack's items."""
+        fake_scorer()
+        pack_a = write_pack(temp_dir)
+        pack_b = temp_dir / "second_pack.yaml"
+        pack_b.write_text(Path(pack_a).read_text())
+
+        suite = evaluation.run_evaluation_suite(sample_otel_trace, [pack_a, str(pack_b)])
+
+        for batch in suite.values():
+            assert all(len(item.scores) == 1 for item in batch.items)
+
+    @pytest.mark.unit
+    def test_suite_defaults_to_example_packs(self, sample_otel_trace, fake_scorer):
+        """With no pack list, every example pack runs."""
+        fake_scorer()
+        suite = evaluation.run_evaluation_suite(sample_otel_trace)
+        assert len(suite) == len(list(evaluation.DEFAULT_PACK_DIR.glob("*.yaml")))
+
+
+class TestSpanIndex:
+    """Tests for the shared one-pass span index."""
+
+    @pytest.mark.unit
+    def test_flattens_and_decodes_once(self, sample_otel_trace):
+        """Spans are flattened in order with decoded attributes."""
+        index = SpanIndex.from_trace(sample_otel_trace)
+
+        assert len(index) == 4
+        assert index.attributes[0] == {"agent": "drafter", "content": "Drafted the artifact v1.0"}
+        assert index.resource_metadata == {"user_prompt": "Write a parser", "all_approved": True}
+
+    @pytest.mark.unit
+    def test_lookups_by_name_and_agent(self, sample_otel_trace):
+        """Spans can be looked up by name and by agent."""
+        index = SpanIndex.from_trace(sample_otel_trace)
+
+        assert [s["spanId"] for s in index.spans_for_agent("drafter")] == ["span-0", "span-3"]
+        assert [s["spanId"] for s in index.spans_named("breaker.turn")] == ["span-2"]
+
+    @pytest.mark.unit
+    def test_parent_child_links(self, sample_otel_trace):
+        """parentSpanId links are resolved to positions."""
+        spans = sample_otel_trace["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        spans[1]["parentSpanId"] = "span-0"
+        spans[2]["parentSpanId"] = "span-0"
+        index = SpanIndex.from_trace(sample_otel_trace)
+
+        assert index.children_of(0) == [1, 2]
+        assert index.parent_of(2) == 0
+        assert index.parent_of(0) is None
+
+    @pytest.mark.unit
+    def test_skips_malformed_entries(self):
+        """Missing or malformed scopeSpans are ignored."""
+        trace = {"resourceSpans": ["junk", {"scopeSpans": None}, {"scopeSpans": ["junk", {"spans": []}]}]}
+        index = SpanIndex.from_trace(trace)
+        assert len(index) == 0
+
+    @pytest.mark.unit
+    def test_extractors_accept_index(self, sample_otel_trace):
+        """Item extraction gives the same result from a dict or a prebuilt index."""
+        from core.eval_pack import EvalPack, IngestionConfig
+        pack = EvalPack(name="p", description="", version="1.0",
+                        ingestion=IngestionConfig(type="generic_otel"), pipeline=[])
+        index = SpanIndex.from_trace(sample_otel_trace)
+
+        from_dict = evaluation.extract_items_from_trace(sample_otel_trace, pack)
+        from_index = evaluation.extract_items_from_trace(index, pack)
+
+        assert [i.model_dump() for i in from_dict] == [i.model_dump() for i in from_index]
+        trace_item = evaluation.create_trace_level_item(index)
+        assert trace_item.metadata["span_count"] == 4
+        assert trace_item.metadata["user_prompt"] == "Write a parser"
+
+
+class TestSectionScanner:
+    """Tests for the linear-time Breaker review / change log scanner."""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("content", [
+        "BREAKER REVIEW\nline1\nline2\n\nother\n",
+        "BREAKER REVIEW\nline1\nline2\n\n\nother",
+        "BREAKER REVIEW\nline1\nline2\n\nother",
+        "x\nBREAKER REVIEW\nFAILURE 1: a\nb\n",
+        "[Codex] here BREAKER mode\nx\ny\n---\nz",
+        "Change Log v1.1\nFixed empty input handling\n\n",
+        "v2.0 all FIXED\nitem\n\n\nRevision 3\nmore\n",
+        "v2.0 pending\nnot a change log\n\n\n",
+        "request_changes\nfix it\n\n\nIssues addressed:\n- one\n",
+    ])
+    def test_matches_legacy_regexes(self, content):
+        """Section bodies are identical to the regexes the scanner replaced."""
+        from benchmarks.bench_sections import legacy_extract
+        from core.sections import extract_sections
+
+        assert extract_sections(content) == legacy_extract(content)
+
+    @pytest.mark.unit
+    def test_review_sections_fallbacks(self):
+        """Missing sections fall back to the 'not found' messages."""
+        breaker_review, change_log = evaluation.extract_review_sections("nothing here")
+        assert breaker_review == 'No breaker review found in trace'
+        assert change_log == 'No change log found in trace'
+
+    @pytest.mark.unit
+    def test_large_unterminated_transcript_is_scanned_once(self, monkeypatch):
+        """Headers with no terminator no longer rescan the rest of the document."""
+        from benchmarks.bench_sections import make_transcript
+        from core import sections
+
+        class CountingPattern:
+            def __init__(self, pattern):
+                self.pattern = pattern
+
+            def finditer(self, content, *args):
+                scans.append(len(content) - (args[0] if args else 0))
+                return self.pattern.finditer(content, *args)
+
+        content = make_transcript(2 * 1024 * 1024)
+        headers = len(list(sections.HEADER_PATTERN.finditer(content)))
+        scans = []
+        for name in ("HEADER_PATTERN", "BLANK_TERMINATOR", "DASH_TERMINATOR"):
+            monkeypatch.setattr(sections, name, CountingPattern(getattr(sections, name)))
+
+        evaluation.extract_review_sections(content)
+
+        # One header sweep and at most one sweep per terminator kind, however many headers
+        assert headers > 1000
+        assert len(scans) <= 3
+        assert sum(scans) <= 3 * len(content)
+
+
+class TestRedactionEngine:
+    """Tests for the fused, memoized redaction engine."""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("content", [
+        "key sk-abcdefghijklmnopqrstuvwxyz here",
+        "sk-ant-api03-abc-def",
+        "OPENAI_API_KEY=sk-proj-123",
+        "api_key: hunter2",
+        "PASSWORD = hunter2",
+        "secret:xyz",
+        "token=abcdefghijklmnopqrstuvwxyz",
+    ])
+    def test_redacts_each_pattern(self, content):
+        """Every sensitive pattern is still caught by the fused alternation."""
+        from core.redaction import RedactionEngine, SENSITIVE_PATTERNS
+        import re
+
+        redacted = RedactionEngine().redact(content)
+        assert "[REDACTED]" in redacted
+        assert not any(re.search(p, redacted, re.IGNORECASE) for p in SENSITIVE_PATTERNS)
+
+    @pytest.mark.unit
+    def test_overlapping_secrets_fully_redacted(self):
+        """A match that swallows the start of another still leaves no secret behind."""
+        from core.redaction import RedactionEngine
+
+        redacted = RedactionEngine().redact('TOKEN = api_keyABCDEFGHIJ0123456789api_key\n = "hunter2"')
+        assert "hunter2" not in redacted
+
+    @pytest.mark.unit
+    def test_prefilter_and_memo(self):
+        """Clean text skips the regex; repeated text is served from the memo."""
+        from core.redaction import RedactionEngine
+
+        engine = RedactionEngine()
+        assert engine.redact("just ordinary output") == "just ordinary output"
+        engine.redact("password=hunter2")
+        engine.redact("password=hunter2")
+
+        assert engine.stats['prefilter_skips'] == 1
+        assert engine.stats['scans'] == 1
+        assert engine.stats['cache_hits'] == 1
+
+    @pytest.mark.unit
+    def test_memo_is_size_bounded(self):
+        """The memo evicts oldest entries beyond its character budget."""
+        from core.redaction import RedactionEngine
+
+        engine = RedactionEngine(max_cache_chars=100)
+        for i in range(20):
+            engine.redact(f"entry number {i} " * 2)
+        assert engine._cache_chars <= 100
+
+    @pytest.mark.unit
+    def test_trace_item_redacted_once(self, sample_otel_trace, monkeypatch):
+        """The trace summary JSON is not re-redacted after its fields were."""
+        spans = sample_otel_trace["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        spans[0]["attributes"][1]["value"]["stringValue"] = "BREAKER\npassword=hunter2\n"
+        seen = []
+        real = evaluation.redact_content
+        monkeypatch.setattr(evaluation, "redact_content", lambda c: seen.append(c) or real(c))
+
+        item = evaluation.create_trace_level_item(sample_otel_trace)
+
+        assert "hunter2" not in item.input
+        assert "hunter2" not in item.metadata["breaker_review"]
+        assert item.input not in seen
+
+
+class TestOtlpStream:
+    """Tests for the streaming OTLP/JSON span loader."""
+
+    @staticmethod
+    def span_ids(records):
+        return [r.span["spanId"] for r in records]
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("chunk_size", [1, 7, 1 << 20])
+    def test_single_object(self, sample_otel_trace, sample_otel_trace_file, chunk_size):
+        """A single OTLP object streams every span with its resource and scope."""
+        from core.ingestion import iter_otlp_spans
+
+        records = list(iter_otlp_spans(sample_otel_trace_file, chunk_size=chunk_size))
+
+        assert self.span_ids(records) == ["span-0", "span-1", "span-2", "span-3"]
+        resource = sample_otel_trace["resourceSpans"][0]["resource"]
+        assert all(r.resource == resource for r in records)
+
+    @pytest.mark.unit
+    def test_array_and_ndjson(self, sample_otel_trace, temp_dir):
+        """JSON arrays and newline-delimited objects are both accepted."""
+        import json
+        from core.ingestion import iter_otlp_spans
+
+        array_file = temp_dir / "array.json"
+        array_file.write_text(json.dumps([sample_otel_trace, sample_otel_trace]))
+        ndjson_file = temp_dir / "trace.ndjson"
+        ndjson_file.write_text(json.dumps(sample_otel_trace) + "\n" + json.dumps(sample_otel_trace) + "\n")
+
+        assert len(list(iter_otlp_spans(array_file, chunk_size=5))) == 8
+        assert len(list(iter_otlp_spans(ndjson_file, chunk_size=5))) == 8
+
+    @pytest.mark.unit
+    def test_resource_after_spans(self):
+        """Spans seen before their resource and scope still get them attached."""
+        import io
+        from core.ingestion import iter_otlp_spans
+
+        data = ('{"resourceSpans": [{"scopeSpans": [{"spans": [{"spanId": "a"}], "scope": {"name": "s"}}],'
+                ' "resource": {"attributes": []}}]}')
+        records = list(iter_otlp_spans(io.BytesIO(data.encode("utf-8")), chunk_size=3))
+
+        assert self.span_ids(records) == ["a"]
+        assert records[0].scope == {"name": "s"}
+        assert records[0].resource == {"attributes": []}
+
+    @pytest.mark.unit
+    def test_resource_without_spans(self, sample_otel_trace, temp_dir):
+        """Metadata on a resource with no spans reaches the streamed index as it does from_trace."""
+        import json
+        from core.ingestion import iter_otlp_spans
+
+        sample_otel_trace["resourceSpans"].insert(0, {
+            "resource": {"attributes": [
+                {"key": "metadata.skill", "value": {"stringValue": "dev-collaboration"}},
+                {"key": "metadata.user_prompt", "value": {"stringValue": "Overridden later"}},
+            ]},
+            "scopeSpans": [],
+        })
+        trace_file = temp_dir / "trace.json"
+        trace_file.write_text(json.dumps(sample_otel_trace))
+
+        assert len(list(iter_otlp_spans(trace_file))) == 4
+        records = list(iter_otlp_spans(trace_file, empty_resources=True))
+        assert [r.span is None for r in records] == [True, False, False, False, False]
+
+        streamed = evaluation.load_trace_index(trace_file)
+        parsed = SpanIndex.from_trace(sample_otel_trace)
+        assert streamed.resource_metadata == parsed.resource_metadata
+        assert streamed.resource_metadata == {"skill": "dev-collaboration",
+                                              "user_prompt": "Write a parser", "all_approved": True}
+        assert len(streamed) == len(parsed) == 4
+
+    @pytest.mark.unit
+    def test_invalid_json_raises(self, temp_dir):
+        """Malformed input fails with a ValueError."""
+        from core.ingestion import iter_otlp_spans
+
+        bad_file = temp_dir / "bad.json"
+        bad_file.write_text('{"resourceSpans": [{"scopeSpans": [')
+        with pytest.raises(ValueError):
+            list(iter_otlp_spans(bad_file))
+
+    @pytest.mark.unit
+    def test_prepare_trace_from_path(self, sample_otel_trace, sample_otel_trace_file):
+        """Preparing from a file path gives the same items as the parsed dict."""
+        from core.eval_pack import EvalPack, IngestionConfig
+        pack = EvalPack(name="p", description="", version="1.0",
+                        ingestion=IngestionConfig(type="generic_otel"), pipeline=[])
+
+        from_dict = evaluation.prepare_trace(sample_otel_trace).items_for(pack)
+        from_path = evaluation.prepare_trace(sample_otel_trace_file).items_for(pack)
+
+        assert [i.model_dump() for i in from_dict] == [i.model_dump() for i in from_path]
+
+    @pytest.mark.unit
+    def test_generic_ingester_streams_files(self, sample_otel_trace, sample_otel_trace_file):
+        """GenericOtelIngester gives the same items for a path as for a string."""
+        import json
+        from core.ingestion.generic_otel_ingester import GenericOtelIngester
+
+        config = {"input_field": "attributes.content", "output_field": "attributes.content"}
+        ingester = GenericOtelIngester()
+        from_path = ingester.ingest(sample_otel_trace_file, config)
+        from_text = ingester.ingest(json.dumps(sample_otel_trace), config)
+
+        assert [i.model_dump() for i in from_path] == [i.model_dump() for i in from_text]
+
+    @pytest.mark.unit
+    def test_generic_ingester_accepts_list(self, sample_otel_trace):
+        """A list of parsed trace objects gives the same items as the JSON array text."""
+        import json
+        from core.ingestion.generic_otel_ingester import GenericOtelIngester
+
+        config = {"input_field": "attributes.content", "output_field": "attributes.content"}
+        ingester = GenericOtelIngester()
+        from_list = ingester.ingest([sample_otel_trace], config)
+        from_text = ingester.ingest(json.dumps([sample_otel_trace]), config)
+
+        assert len(from_list) == 1
+        assert [i.model_dump() for i in from_list] == [i.model_dump() for i in from_text]
+
+
+class TestGenericOtelParsing:
+    """Tests for GenericOtelIngester's ndjson / concatenated JSON parsing."""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("content,expected", [
+        ('{"a": 1}\n{"b": 2}\n', [{"a": 1}, {"b": 2}]),
+        ('{\n "a": 1\n}\n{\n "b": 2\n}', [{"a": 1}, {"b": 2}]),
+        ('{"a": 1}{"b": 2}', [{"a": 1}, {"b": 2}]),
+        ('{"a": 1}\n{\n "b": 2\n}\n{"c": 3}', [{"a": 1}, {"b": 2}, {"c": 3}]),
+        ('{"a": 1}\ntrailing junk\n{"b": 2}', [{"a": 1}]),
+        ('[{"a": 1}, {"b": 2}]', [{"a": 1}, {"b": 2}]),
+        ('  \n ', []),
+    ])
+    def test_parse_layouts(self, content, expected):
+        """Line-delimited, pretty-printed and concatenated input all decode."""
+        from core.ingestion.generic_otel_ingester import GenericOtelIngester
+        assert GenericOtelIngester()._parse_json_input(content) == expected
+
+    @pytest.mark.unit
+    def test_invalid_input_raises(self):
+        """Input with no decodable object still raises."""
+        import json
+        from core.ingestion.generic_otel_ingester import GenericOtelIngester
+        with pytest.raises(json.JSONDecodeError):
+            GenericOtelIngester()._parse_json_input("not json")
+
+
+class TestBatchEvaluation:
+    """Tests for directory-scale batch evaluation (core.batch)."""
+
+    @staticmethod
+    def write_traces(temp_dir, trace, count):
+        import json
+        trace_dir = temp_dir / "traces"
+        trace_dir.mkdir()
+        for i in range(count):
+            (trace_dir / f"skill_{i}.json").write_text(json.dumps(trace))
+        return trace_dir
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("jobs", [1, 2])
+    def test_writes_report_per_trace_and_pack(self, sample_otel_trace, temp_dir, fake_scorer, jobs):
+        """Every (trace, pack) pair gets JSON Lines and Markdown reports."""
+        from core.batch import discover_traces, run_batch
+        from core.data_models import EvaluationBatch
+
+        scorer = fake_scorer()
+        trace_dir = self.write_traces(temp_dir, sample_otel_trace, 3)
+        pack = write_pack(temp_dir)
+        out_dir = temp_dir / "evals"
+
+        summary = run_batch(discover_traces([trace_dir]), [pack], jobs=jobs,
+                            output_dir=out_dir, timestamp="20260101_000000")
+
+        assert summary.failures == []
+        assert summary.traces == 3
+        assert summary.evaluations == 3
+        assert summary.items == 12
+        assert summary.scores.count == 12
+        assert summary.scores.summary()['p50'] == 1.0
+        assert len(scorer.calls) == 12
+        assert sorted(p.name for p in out_dir.iterdir()) == sorted(
+            f"test_pack_skill_{i}_20260101_000000.{ext}" for i in range(3) for ext in ("jsonl", "md")
+        )
+        report = EvaluationBatch.from_jsonl(out_dir / "test_pack_skill_0_20260101_000000.jsonl")
+        assert len(report.items) == 4
+        assert report.summary_stats['total_items'] == 4
+
+    @pytest.mark.unit
+    def test_bad_trace_is_reported_not_fatal(self, sample_otel_trace, temp_dir, fake_scorer):
+        """A trace that fails to parse is recorded and the rest still run."""
+        from core.batch import discover_traces, run_batch
+
+        fake_scorer()
+        trace_dir = self.write_traces(temp_dir, sample_otel_trace, 2)
+        (trace_dir / "broken.json").write_text('{"resourceSpans": [{"scopeSpans": [{"spans": [')
+
+        summary = run_batch(discover_traces([trace_dir]), [write_pack(temp_dir)], jobs=1,
+                            output_dir=temp_dir / "evals")
+
+        assert summary.evaluations == 2
+        assert len(summary.failures) == 1
+        assert "broken.json" in summary.failures[0][0]
+
+    @pytest.mark.unit
+    def test_discovery_skips_non_traces(self, sample_otel_trace, temp_dir):
+        """Only OTLP traces are discovered; other JSON and the report directory are skipped."""
+        import json
+        from core.batch import discover_traces
+
+        trace_dir = self.write_traces(temp_dir, sample_otel_trace, 2)
+        (trace_dir / "pack.json").write_text(json.dumps({"name": "p", "pipeline": []}))
+        (trace_dir / "notes.json").write_text("not json at all")
+        out_dir = trace_dir / "evals"
+        out_dir.mkdir()
+        (out_dir / "report.json").write_text(json.dumps(sample_otel_trace))
+
+        found = discover_traces([trace_dir], exclude=[out_dir])
+
+        assert [p.name for p in found] == ["skill_0.json", "skill_1.json"]
+        # A file named explicitly is taken as given
+        assert discover_traces([trace_dir / "pack.json"]) == [trace_dir / "pack.json"]
+
+    @pytest.mark.unit
+    def test_report_error_is_not_fatal(self, sample_otel_trace, temp_dir, fake_scorer):
+        """An exception while reporting one pair is recorded and the other pairs still run."""
+        from core.batch import discover_traces, run_batch
+
+        fake_scorer()
+        trace_dir = self.write_traces(temp_dir, sample_otel_trace, 3)
+        reported = []
+
+        def progress(trace_path, pack_path, results, error):
+            reported.append(trace_path.name)
+            if trace_path.name == "skill_1.json":
+                raise RuntimeError("progress display broke")
+
+        summary = run_batch(discover_traces([trace_dir]), [write_pack(temp_dir)], jobs=1,
+                            output_dir=temp_dir / "evals", progress=progress)
+
+        assert sorted(reported) == ["skill_0.json", "skill_1.json", "skill_2.json"]
+        assert summary.evaluations == 3
+        assert len(summary.failures) == 1
+        assert "skill_1.json" in summary.failures[0][0]
+        assert "progress display broke" in summary.failures[0][1]
+
+    @pytest.mark.unit
+    def test_resolve_pack_names(self):
+        """Pack names resolve against examples/eval_packs."""
+        from core.batch import resolve_pack_paths
+
+        assert resolve_pack_paths(["approval_chain"]) == [
+            str(evaluation.DEFAULT_PACK_DIR / "approval_chain.yaml")
+        ]
+        assert len(resolve_pack_paths(["all"])) == len(list(evaluation.DEFAULT_PACK_DIR.glob("*.yaml")))
+        with pytest.raises(FileNotFoundError):
+            resolve_pack_paths(["no_such_pack"])
+
+
+class TestResultCache:
+    """Tests for the content-addressed judge result cache."""
+
+    @pytest.mark.unit
+    def test_unchanged_trace_is_not_rejudged(self, sample_otel_trace, temp_dir, fake_scorer):
+        """A second run with the same trace, pack and stage reuses stored results."""
+        from core.result_cache import ResultCache
+
+        scorer = fake_scorer(fail_ids={"span_2"})
+        cache = ResultCache(temp_dir / "cache")
+        pack = write_pack(temp_dir)
+
+        first = run_evaluation_batch(sample_otel_trace, pack, cache=cache)
+        second = run_evaluation_batch(sample_otel_trace, pack, cache=cache)
+
+        assert len(scorer.calls) == 4
+        assert first.summary_stats['cache'] == {'hits': 0, 'misses': 1}
+        assert second.summary_stats['cache'] == {'hits': 1, 'misses': 0}
+        assert [i.model_dump() for i in first.items] == [i.model_dump() for i in second.items]
+
+    @pytest.mark.unit
+    def test_streamed_file_shares_dict_entries(self, sample_otel_trace, sample_otel_trace_file,
+                                               temp_dir, fake_scorer):
+        """The trace hash covers content, not how the trace was loaded."""
+        from core.result_cache import ResultCache
+
+        scorer = fake_scorer()
+        cache = ResultCache(temp_dir / "cache")
+        pack = write_pack(temp_dir)
+
+        run_evaluation_batch(sample_otel_trace, pack, cache=cache)
+        run_evaluation_batch(sample_otel_trace_file, pack, cache=cache)
+
+        assert len(scorer.calls) == 4
+
+    @pytest.mark.unit
+    def test_changes_invalidate(self, sample_otel_trace, temp_dir, fake_scorer):
+        """Changing the trace or the stage config misses the cache."""
+        from core.result_cache import ResultCache
+
+        scorer = fake_scorer()
+        cache = ResultCache(temp_dir / "cache")
+        run_evaluation_batch(sample_otel_trace, write_pack(temp_dir), cache=cache)
+
+        spans = sample_otel_trace["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        spans[0]["attributes"][1]["value"]["stringValue"] = "Drafted the artifact v2.0"
+        run_evaluation_batch(sample_otel_trace, write_pack(temp_dir), cache=cache)
+        assert len(scorer.calls) == 8
+
+        run_evaluation_batch(sample_otel_trace, write_pack(temp_dir, stage_extra="      model: gpt-4o-mini"),
+                             cache=cache)
+        assert len(scorer.calls) == 12
+
+    @pytest.mark.unit
+    def test_force_rejudges(self, sample_otel_trace, temp_dir, fake_scorer):
+        """force ignores stored results and overwrites them."""
+        from core.result_cache import ResultCache
+
+        scorer = fake_scorer()
+        cache = ResultCache(temp_dir / "cache")
+        pack = write_pack(temp_dir)
+        run_evaluation_batch(sample_otel_trace, pack, cache=cache)
+        run_evaluation_batch(sample_otel_trace, pack, cache=cache, force=True)
+
+        assert len(scorer.calls) == 8
+
+    @pytest.mark.unit
+    def test_judge_errors_are_not_cached(self, sample_otel_trace, temp_dir, monkeypatch):
+        """Results carrying a judge error are retried on the next run."""
+        from core.result_cache import ResultCache
+
+        calls = []
+
+        class ErroringScorer:
+            def score(self, item, config):
+                calls.append(item.id)
+                return ScorerResult(scorer_name='fake', numeric_score=0.0, passed=False,
+                                    raw_response={'error': 'timeout'})
+
+        monkeypatch.setattr(evaluation, "create_scorer", lambda stage: ErroringScorer())
+        cache = ResultCache(temp_dir / "cache")
+        pack = write_pack(temp_dir)
+        run_evaluation_batch(sample_otel_trace, pack, cache=cache)
+        run_evaluation_batch(sample_otel_trace, pack, cache=cache)
+
+        assert len(calls) == 8
+
+    @pytest.mark.unit
+    def test_size_and_age_eviction(self, temp_dir):
+        """Entries beyond the byte budget or the max age are evicted."""
+        import os
+        from core.result_cache import ResultCache
+
+        cache = ResultCache(temp_dir / "cache", max_bytes=250)
+        for i in range(5):
+            cache.put(f"key{i}", {"payload": "x" * 80})
+        assert cache.get("key0") is None
+        assert cache.get("key4") is not None
+        assert cache.stats['evictions'] >= 2
+
+        aged = ResultCache(temp_dir / "cache", max_age_seconds=60)
+        old = (temp_dir / "cache" / "key4.json")
+        os.utime(old, (0, 0))
+        assert aged.get("key4") is None
+        assert not old.exists()
+
+    @pytest.mark.unit
+    def test_batch_uses_cache(self, sample_otel_trace_file, temp_dir, fake_scorer):
+        """Re-running a batch over unchanged traces makes no judge calls."""
+        from core.batch import run_batch
+        from core.result_cache import ResultCache
+
+        scorer = fake_scorer()
+        cache = ResultCache(temp_dir / "cache")
+        pack = write_pack(temp_dir)
+        run_batch([sample_otel_trace_file], [pack], jobs=1, output_dir=temp_dir / "evals", cache=cache)
+        summary = run_batch([sample_otel_trace_file], [pack], jobs=1, output_dir=temp_dir / "evals",
+                            cache=cache)
+
+        assert len(scorer.calls) == 4
+        assert (summary.cache_hits, summary.cache_misses) == (1, 0)
+
+
+class TestStreamingStats:
+    """Tests for mergeable summary statistics (core.stats)."""
+
+    @staticmethod
+    def exact_quantile(values, q):
+        ordered = sorted(values)
+        position = q * (len(ordered) - 1)
+        low = int(position)
+        high = min(low + 1, len(ordered) - 1)
+        return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+
+    @pytest.mark.unit
+    def test_small_streams_are_exact(self):
+        """Below the compression size every score keeps its own centroid."""
+        from core.stats import ScoreStats
+
+        values = [0.9, 0.1, 0.5, 0.7, 0.3, 1.0, 0.0]
+        stats = ScoreStats().extend(values)
+
+        for q in (0, 0.25, 0.5, 0.9, 0.99, 1):
+            assert stats.quantile(q) == pytest.approx(self.exact_quantile(values, q))
+        assert stats.summary()['min'] == 0.0
+        assert stats.summary()['max'] == 1.0
+
+    @pytest.mark.unit
+    def test_large_stream_quantiles_are_close(self):
+        """Quantiles over 100k scores stay within a small rank error of exact."""
+        import random
+        from core.stats import ScoreStats
+
+        rng = random.Random(7)
+        values = [rng.betavariate(2, 5) for _ in range(100_000)]
+        stats = ScoreStats().extend(values)
+
+        ordered = sorted(values)
+        for q in (0.01, 0.1, 0.5, 0.9, 0.99, 0.999):
+            estimate = stats.quantile(q)
+            rank = sum(1 for v in ordered if v <= estimate) / len(ordered)
+            assert abs(rank - q) < 0.005, (q, rank)
+        assert len(stats.digest.centroids()) < 1000
+        assert stats.mean == pytest.approx(sum(values) / len(values))
+
+    @pytest.mark.unit
+    def test_merge_matches_single_stream(self):
+        """Digests built by separate workers merge to the same summary."""
+        import random
+        from core.stats import ScoreStats
+
+        rng = random.Random(11)
+        values = [rng.random() for _ in range(20_000)]
+        whole = ScoreStats(bins=[0, 0.5, 1.0]).extend(values)
+        merged = ScoreStats(bins=[0, 0.5, 1.0])
+        for start in range(0, len(values), 5_000):
+            merged.merge(ScoreStats(bins=[0, 0.5, 1.0]).extend(values[start:start + 5_000]))
+
+        assert merged.count == whole.count
+        assert merged.histogram == whole.histogram
+        for q in (0.1, 0.5, 0.9, 0.99):
+            assert merged.quantile(q) == pytest.approx(whole.quantile(q), abs=0.01)
+
+    @pytest.mark.unit
+    def test_state_round_trips_through_json(self):
+        """to_dict() state survives JSON and keeps merging."""
+        import json
+        from core.stats import ScoreStats
+
+        stats = ScoreStats(bins=[0, 0.5, 1.0]).extend(i / 1000 for i in range(1000))
+        restored = ScoreStats.from_dict(json.loads(json.dumps(stats.to_dict())))
+
+        assert restored.summary() == stats.summary()
+        assert restored.histogram == stats.histogram
+        restored.merge(ScoreStats().extend([2.0]))
+        assert restored.summary()['max'] == 2.0
+
+    @pytest.mark.unit
+    def test_batch_summary_reports_quantiles(self, sample_otel_trace_file, temp_dir, fake_scorer):
+        """Pack summaries keep their fields and add score quantiles with mergeable state."""
+        fake_scorer(fail_ids={"span_0"})
+        batch = evaluation.run_evaluation_batch(sample_otel_trace_file, write_pack(temp_dir))
+
+        stats = batch.summary_stats
+        assert (stats['total_items'], stats['passed'], stats['failed']) == (4, 3, 1)
+        assert stats['average_score'] == 0.75
+        assert {'count', 'mean', 'min', 'max', 'p50', 'p90', 'p99', 'state'} <= set(stats['scores'])
+        assert stats['scores']['count'] == 4
+        assert stats['scores']['min'] == 0.0
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("on_fail", ["continue", "stop"])
+    def test_stats_fed_as_scores_commit(self, sample_otel_trace, temp_dir, fake_scorer, monkeypatch,
+                                        on_fail):
+        """RunStats is fed as each score is committed, and matches a pass over the finished items."""
+        from core.stats import RunStats
+
+        scorer = fake_scorer(fail_ids={"span_1"})
+        added = []
+        real_add_score = RunStats.add_score
+        monkeypatch.setattr(RunStats, "add_score",
+                            lambda self, score: added.append(len(scorer.calls)) or real_add_score(self, score))
+
+        pack = evaluation.load_eval_pack(write_pack(temp_dir, on_fail=on_fail))
+        items = evaluation.prepare_trace(sample_otel_trace).items_for(pack)
+        batch = evaluation.evaluate_pack(pack, "pack.yaml", items, lambda stage: scorer)
+
+        # Each score was added right after its call, before the next item was scored
+        assert added == list(range(1, len(scorer.calls) + 1))
+        assert batch.summary_stats == evaluation.calculate_summary(batch.items, pack)
+        assert batch.summary_stats["total_items"] == 4
+        assert batch.summary_stats["failed"] == (1 if on_fail == "continue" else 3)
+
+    @pytest.mark.unit
+    def test_results_summary_distribution(self):
+        """EvaluationResults per-scorer stats keep the histogram and add quantiles."""
+        from core.data_models import EvaluationItem, EvaluationResults
+
+        scores = [0.1, 0.5, 0.9, 1.0]
+        results = EvaluationResults(
+            items=[EvaluationItem(input="x", scores=[
+                ScorerResult(scorer_name="llm_judge", numeric_score=s, passed=s > 0.5) for s in scores
+            ])],
+            config={},
+        )
+        results.calculate_summary_stats()
+
+        stats = results.summary_stats["llm_judge"]
+        assert (stats["passed"], stats["failed"], stats["accuracy"]) == (2, 2, 0.5)
+        assert stats["average_score"] == pytest.approx(0.625)
+        assert stats["p50_score"] == pytest.approx(0.7)
+        assert stats["score_distribution"] == {
+            "0.0-0.2": 1, "0.2-0.4": 0, "0.4-0.6": 1, "0.6-0.8": 0, "0.8-1.0": 2,
+        }
+
+
+class TestPreparedItems:
+    """Tests for the dataclass item used on the evaluation hot path."""
+
+    @pytest.mark.unit
+    def test_pack_items_are_fresh_prepared_items(self, sample_otel_trace, temp_dir):
+        """Each pack gets its own unscored PreparedItems."""
+        from core.data_models import PreparedItem
+        from core.eval_pack.loader import load_eval_pack
+
+        prepared = evaluation.prepare_trace(sample_otel_trace)
+        pack = load_eval_pack(write_pack(temp_dir))
+        first, second = prepared.items_for(pack), prepared.items_for(pack)
+
+        assert all(isinstance(item, PreparedItem) for item in first)
+        assert not hasattr(first[0], '__dict__')
+        first[0].scores.append(ScorerResult(scorer_name='fake'))
+        first[0].metadata['extra'] = True
+        assert second[0].scores == []
+        assert 'extra' not in second[0].metadata
+
+    @pytest.mark.unit
+    def test_batch_serializes_like_evaluation_items(self, sample_otel_trace, temp_dir, fake_scorer):
+        """Reports dump PreparedItems exactly as EvaluationItems and load back as models."""
+        from core.data_models import EvaluationBatch, EvaluationItem
+
+        fake_scorer()
+        batch = run_evaluation_batch(sample_otel_trace, write_pack(temp_dir))
+
+        dumped = batch.model_dump()
+        assert [item['id'] for item in dumped['items']] == [item.id for item in batch.items]
+        loaded = EvaluationBatch.model_validate(dumped)
+        assert all(isinstance(item, EvaluationItem) for item in loaded.items)
+        assert loaded.model_dump() == dumped
+        assert [dict(item.metadata) for item in loaded.items] == [dict(item.metadata) for item in batch.items]
+
+    @pytest.mark.unit
+    def test_blank_span_content_is_skipped(self, sample_otel_trace, temp_dir):
+        """Spans whose content is only whitespace produce no item."""
+        from core.eval_pack.loader import load_eval_pack
+
+        span = sample_otel_trace['resourceSpans'][0]['scopeSpans'][0]['spans'][0]
+        for attribute in span['attributes']:
+            if attribute['key'] == 'content':
+                attribute['value'] = {'stringValue': '   '}
+
+        items = evaluation.prepare_trace(sample_otel_trace).items_for(
+            load_eval_pack(write_pack(temp_dir)))
+
+        assert [item.id for item in items] == ['span_1', 'span_2', 'span_3']
+
+
+class TestStreamingReports:
+    """Tests for item-by-item report writing (core.reports)."""
+
+    @pytest.mark.unit
+    def test_items_reported_as_they_finish(self, sample_otel_trace, temp_dir, fake_scorer):
+        """on_item sees each item once, in order, right after its last stage scores it."""
+        scorer = fake_scorer()
+        seen = []
+
+        def on_item(item):
+            # Nothing after this item has been judged yet
+            seen.append((item.id, len(item.scores), len(scorer.calls)))
+
+        run_evaluation_batch(sample_otel_trace, write_pack(temp_dir), on_item=on_item)
+
+        assert seen == [(f"span_{i}", 1, i + 1) for i in range(4)]
+
+    @pytest.mark.unit
+    def test_multi_stage_and_stop_report_every_item(self, sample_otel_trace, temp_dir, fake_scorer):
+        """Items are reported after the final stage, and all are reported when a stage stops."""
+        scorer = fake_scorer(fail_ids={"span_1"})
+        pack = write_pack(temp_dir, on_fail="stop")
+        with open(pack, "a") as f:
+            f.write('  - name: "second"\n    scorer: "llm_judge"\n    config: {}\n')
+        seen = []
+
+        batch = run_evaluation_batch(sample_otel_trace, pack, on_item=lambda item: seen.append(item.id))
+
+        assert seen == ["span_0", "span_1", "span_2", "span_3"]
+        assert len(scorer.calls) == 2
+        assert [len(item.scores) for item in batch.items] == [1, 1, 0, 0]
+
+    @pytest.mark.unit
+    def test_jsonl_report_streams_and_round_trips(self, sample_otel_trace, temp_dir, fake_scorer):
+        """The JSON Lines report grows per item and ends with a summary record."""
+        import json
+        from core.data_models import EvaluationBatch
+        from core.reports import ReportWriter
+
+        scorer = fake_scorer()
+        jsonl = temp_dir / "report.jsonl"
+        lines_seen = []
+        original_score = scorer.score
+
+        def score(item, config):
+            lines_seen.append(len(jsonl.read_text().splitlines()))
+            return original_score(item, config)
+
+        scorer.score = score
+        with ReportWriter("Test Pack", jsonl=jsonl, markdown=temp_dir / "report.md") as writer:
+            batch = run_evaluation_batch(sample_otel_trace, write_pack(temp_dir),
+                                         on_item=writer.write_item)
+            writer.write_summary(batch.summary_stats)
+
+        # The shared trace context is written once, ahead of the first item
+        assert lines_seen == [0, 2, 3, 4]
+        records = [json.loads(line) for line in jsonl.read_text().splitlines()]
+        assert [r["record"] for r in records] == ["trace_context"] + ["item"] * 4 + ["summary"]
+        assert records[-1]["summary_stats"]["total_items"] == 4
+
+        loaded = EvaluationBatch.from_jsonl(jsonl)
+        assert loaded.eval_pack == "Test Pack"
+        assert loaded.model_dump() == batch.model_dump()
+
+    @pytest.mark.unit
+    def test_markdown_writer_matches_report_sections(self, sample_otel_trace, temp_dir, fake_scorer):
+        """The streamed Markdown has the same sections as to_markdown(), summary last."""
+        fake_scorer()
+        batch = run_evaluation_batch(sample_otel_trace, write_pack(temp_dir))
+        path = temp_dir / "report.md"
+        batch.write_markdown(path)
+
+        streamed = path.read_text()
+        assert streamed.startswith("# Evaluation Report: Test Pack\n\n## Item Details\n\n### span_0\n")
+        assert streamed.index("### span_3") < streamed.index("## Summary")
+        assert sorted(streamed.splitlines()) == sorted(batch.to_markdown().splitlines())
+
+    @pytest.mark.unit
+    def test_write_jsonl_to_open_file(self, sample_otel_trace, temp_dir, fake_scorer):
+        """Writers accept an open stream and leave it open."""
+        import io
+
+        fake_scorer()
+        batch = run_evaluation_batch(sample_otel_trace, write_pack(temp_dir))
+        buffer = io.StringIO()
+        batch.write_jsonl(buffer)
+
+        assert not buffer.closed
+        assert len(buffer.getvalue().splitlines()) == 6
+
+
+class TestTraceContext:
+    """Tests for trace-wide metadata shared by items (core.trace_context)."""
+
+    @pytest.mark.unit
+    def test_span_items_share_one_context(self, sample_otel_trace, temp_dir):
+        """Trace-wide values are stored once and read through every item's metadata."""
+        from core.eval_pack.loader import load_eval_pack
+        from core.trace_context import SharedMetadata
+
+        items = evaluation.prepare_trace(sample_otel_trace).items_for(load_eval_pack(write_pack(temp_dir)))
+
+        assert all(isinstance(item.metadata, SharedMetadata) for item in items)
+        assert items[0].metadata.context is items[3].metadata.context
+        assert 'FAILURE SCENARIO 1' in items[2].metadata['breaker_review']
+        assert 'breaker_review' not in items[0].metadata.own
+        assert items[0].metadata['span_name'] == 'drafter.turn'
+
+    @pytest.mark.unit
+    def test_context_is_read_only(self, sample_otel_trace, temp_dir):
+        """Writing an item's metadata never changes what the other items see."""
+        from core.eval_pack.loader import load_eval_pack
+
+        items = evaluation.prepare_trace(sample_otel_trace).items_for(load_eval_pack(write_pack(temp_dir)))
+        items[0].metadata['breaker_review'] = 'overridden'
+
+        assert items[0].metadata['breaker_review'] == 'overridden'
+        assert items[1].metadata['breaker_review'] != 'overridden'
+        with pytest.raises(TypeError):
+            items[1].metadata.context.values['change_log'] = 'x'
+
+    @pytest.mark.unit
+    def test_pickled_items_keep_sharing(self, sample_otel_trace, temp_dir):
+        """Items sent to worker processes still share one context."""
+        import pickle
+        from core.eval_pack.loader import load_eval_pack
+
+        items = evaluation.prepare_trace(sample_otel_trace).items_for(load_eval_pack(write_pack(temp_dir)))
+        restored = pickle.loads(pickle.dumps(items))
+
+        assert restored[0].metadata.context is restored[1].metadata.context
+        assert dict(restored[2].metadata) == dict(items[2].metadata)
+
+    @pytest.mark.unit
+    def test_trace_report_writes_trace_summary_once(self, sample_otel_trace, temp_dir, fake_scorer):
+        """A trace-level report carries the summary as the input only, and context once."""
+        import json
+
+        fake_scorer()
+        batch = run_evaluation_batch(sample_otel_trace, write_pack(temp_dir, mode="trace"))
+        dumped = batch.model_dump()
+
+        item = batch.items[0]
+        assert item.metadata['otel_trace'] == json.loads(item.input)
+        assert dumped['items'][0]['metadata'] == {}
+        assert 'otel_trace' not in dumped['trace_context']
+        assert dumped['trace_context']['all_approved'] is True
+        assert json.dumps(dumped).count('Drafted the artifact v1.0') == 1
+
+    @pytest.mark.unit
+    def test_batch_without_context_round_trips(self, sample_otel_trace, temp_dir):
+        """A batch built from items alone still dumps and reloads their shared metadata."""
+        from core.data_models import EvaluationBatch
+        from core.eval_pack.loader import load_eval_pack
+
+        items = evaluation.prepare_trace(sample_otel_trace).items_for(load_eval_pack(write_pack(temp_dir)))
+        batch = EvaluationBatch(eval_pack="Test Pack", items=items)
+        loaded = EvaluationBatch.model_validate(batch.model_dump())
+
+        assert 'FAILURE SCENARIO 1' in batch.trace_context['breaker_review']
+        assert [dict(item.metadata) for item in loaded.items] == [dict(item.metadata) for item in items]
+
+    @pytest.mark.unit
+    def test_items_from_other_traces_keep_their_context(self, sample_otel_trace, temp_dir):
+        """Items backed by a different context than the batch's dump all their metadata."""
+        import json
+        from core.data_models import EvaluationBatch
+        from core.eval_pack.loader import load_eval_pack
+
+        pack = load_eval_pack(write_pack(temp_dir))
+        first = evaluation.prepare_trace(sample_otel_trace).items_for(pack)
+        other_trace = json.loads(json.dumps(sample_otel_trace).replace("FAILURE SCENARIO 1", "FAILURE SCENARIO 9"))
+        second = evaluation.prepare_trace(other_trace).items_for(pack)
+
+        batch = EvaluationBatch(eval_pack="Test Pack", items=first[:1] + second[:1])
+        loaded = EvaluationBatch.model_validate(batch.model_dump())
+
+        assert 'FAILURE SCENARIO 1' in loaded.items[0].metadata['breaker_review']
+        assert 'FAILURE SCENARIO 9' in loaded.items[1].metadata['breaker_review']
+
+
+class TestRunInstrumentation:
+    """Tests for per-phase run timings and the self-trace (core.instrumentation)."""
+
+    @pytest.mark.unit
+    def test_phase_timings_in_summary(self, sample_otel_trace, temp_dir, fake_scorer):
+        """run_evaluation_batch reports wall and CPU time for each phase it went through."""
+        fake_scorer()
+        batch = run_evaluation_batch(sample_otel_trace, write_pack(temp_dir))
+
+        timings = batch.summary_stats['timings']
+        phases = timings['phases']
+        for name in ('load_pack', 'prepare_trace', 'extract_items', 'redaction',
+                     'sections', 'stage:judge', 'summary'):
+            assert phases[name]['calls'] >= 1
+            assert phases[name]['wall_seconds'] >= 0
+        assert phases['redaction']['calls'] == 1  # One phase per trace, not per span
+        assert timings['wall_seconds'] >= phases['stage:judge']['wall_seconds']
+
+    @pytest.mark.unit
+    def test_phases_are_noops_outside_a_run(self):
+        """Code timed with phase() costs nothing when no run is being timed."""
+        from core.instrumentation import RunTimings, phase
+
+        timings = RunTimings()
+        with phase('redaction'):
+            pass
+        with timings.activate():
+            with phase('redaction'):
+                pass
+
+        assert timings.summary()['phases']['redaction']['calls'] == 1
+
+    @pytest.mark.unit
+    def test_judge_totals(self):
+        """Judge latency, retries and tokens are summed per run; replays and other scorers add nothing."""
+        from core.data_models import PreparedItem
+        from core.stats import RunStats
+
+        def item(latency, attempts):
+            timings = {'render_seconds': 0.001, 'latency_seconds': latency, 'attempts': attempts,
+                       'prompt_tokens': 100, 'completion_tokens': 20, 'total_tokens': 120}
+            return PreparedItem(input='x', scores=[
+                ScorerResult(scorer_name='llm_judge', numeric_score=1.0, passed=True, timings=timings),
+                ScorerResult(scorer_name='exact_match', numeric_score=1.0, passed=True),
+            ])
+
+        first, second = RunStats(), RunStats()
+        first.add_item(item(0.5, 1))
+        second.add_item(item(1.5, 3))
+        judge = first.merge(second).summary()['timings']['judge']
+
+        assert judge['calls'] == 2
+        assert judge['attempts'] == 4
+        assert judge['retries'] == 2
+        assert judge['total_tokens'] == 240
+        assert judge['latency']['max'] == 1.5
+        assert 'timings' not in RunStats().summary()
+
+    @pytest.mark.unit
+    def test_result_cache_replays_carry_no_timings(self, sample_otel_trace, temp_dir, monkeypatch):
+        """Cached results made no judge call, so they report no latency."""
+        from core.result_cache import ResultCache
+
+        def timed_scorer(stage):
+            scorer = FakeScorer()
+            score = scorer.score
+            def with_timings(item, config):
+                result = score(item, config)
+                result.timings = {'render_seconds': 0.0, 'latency_seconds': 0.2, 'attempts': 1}
+                return result
+            scorer.score = with_timings
+            return scorer
+
+        monkeypatch.setattr(evaluation, "create_scorer", timed_scorer)
+        cache = ResultCache(temp_dir / "results.sqlite")
+        pack_path = write_pack(temp_dir)
+        first = run_evaluation_batch(sample_otel_trace, pack_path, cache=cache)
+        second = run_evaluation_batch(sample_otel_trace, pack_path, cache=cache)
+
+        assert first.summary_stats['timings']['judge']['calls'] == 4
+        assert all(not score.timings for item in second.items for score in item.scores)
+        assert 'judge' not in second.summary_stats['timings']
+
+    @pytest.mark.unit
+    def test_self_trace_is_readable_otlp(self, sample_otel_trace, temp_dir, fake_scorer):
+        """The run's own trace is OTLP/JSON with phase spans under one root span."""
+        fake_scorer()
+        trace_path = temp_dir / "self_trace.json"
+        run_evaluation_batch(sample_otel_trace, write_pack(temp_dir), self_trace=trace_path)
+
+        index = evaluation.load_trace_index(trace_path)
+        spans = {span['name']: span for span in index.spans}
+        root = spans['lake_merritt.evaluation']
+        stage = index.by_name['stage:judge'][0]
+
+        assert {'load_pack', 'prepare_trace', 'extract_items', 'stage:judge', 'summary'} <= set(spans)
+        assert 'redaction' not in spans
+        assert all(span.get('parentSpanId') == root['spanId']
+                   for name, span in spans.items() if name != 'lake_merritt.evaluation')
+        assert index.attributes[stage]['lake_merritt.scorer'] == 'llm_judge'
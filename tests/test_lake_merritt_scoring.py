@@ -0,0 +1,1093 @@
+"""
+Tests for Lake Merritt scorers (core.scoring).
+
+The OpenAI client is replaced with an in-process fake, so no API key or
+network access is needed.
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Import from the lake_merritt package in corpbot_agent_evals
+import sys
+REPO_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(REPO_ROOT / "corpbot_agent_evals" / "lake_merritt"))
+
+from core.data_models import EvaluationItem
+
+
+class FakeCompletions:
+    """Stands in for client.chat.completions; returns a fixed judge verdict."""
+
+    def __init__(self, score=0.9):
+        self.score = score
+        self.requests = []
+
+    def create(self, **kwargs):
+        self.requests.append(kwargs)
+        content = json.dumps({"score": self.score, "reasoning": "looks right"})
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+@pytest.fixture
+def judge(monkeypatch):
+    """An LLMJudgeScorer wired to a FakeCompletions client."""
+    from core.scoring.llm_judge import LLMJudgeScorer
+
+    def build(**kwargs):
+        monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+        scorer = LLMJudgeScorer(**kwargs)
+        completions = FakeCompletions()
+        scorer.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+        return scorer, completions
+
+    return build
+
+
+def make_item(item_id="item_0", text="Drafted the parser"):
+    return EvaluationItem(id=item_id, input=text, metadata={})
+
+
+class TestResponseCache:
+    """Tests for the opt-in SQLite judge response cache."""
+
+    @pytest.mark.unit
+    def test_off_by_default(self, judge):
+        """Without a cache every score makes an API call."""
+        scorer, completions = judge()
+        scorer.score(make_item(), {})
+        scorer.score(make_item(), {})
+
+        assert len(completions.requests) == 2
+
+    @pytest.mark.unit
+    def test_identical_request_hits(self, judge, temp_dir):
+        """An identical request is answered from the cache."""
+        scorer, completions = judge()
+        config = {"response_cache": {"path": str(temp_dir / "judge.sqlite")}}
+
+        first = scorer.score(make_item(), config)
+        second = scorer.score(make_item("item_1"), config)
+        third = scorer.score(make_item(text="Something else"), config)
+
+        assert len(completions.requests) == 2
+        assert first.details == {"response_cache": "miss"}
+        assert second.details == {"response_cache": "hit"}
+        assert third.details == {"response_cache": "miss"}
+        assert second.numeric_score == first.numeric_score
+
+    @pytest.mark.unit
+    def test_cache_persists_across_scorers(self, judge, temp_dir):
+        """Responses survive in the database file for later runs."""
+        from core.scoring.response_cache import ResponseCache
+
+        path = temp_dir / "judge.sqlite"
+        scorer, _ = judge(response_cache=ResponseCache(path))
+        scorer.score(make_item(), {})
+
+        scorer, completions = judge(response_cache=ResponseCache(path))
+        result = scorer.score(make_item(), {})
+
+        assert completions.requests == []
+        assert result.details == {"response_cache": "hit"}
+
+    @pytest.mark.unit
+    def test_ttl_expiry(self, temp_dir):
+        """Rows older than the TTL are misses."""
+        from core.scoring.response_cache import ResponseCache
+
+        cache = ResponseCache(temp_dir / "judge.sqlite", ttl_seconds=-1)
+        cache.put("k", {"score": 1.0})
+
+        assert cache.get("k") is None
+        assert cache.stats["misses"] == 1
+
+    @pytest.mark.unit
+    def test_lru_eviction_by_bytes(self, temp_dir):
+        """The least recently used rows are evicted beyond max_bytes."""
+        from core.scoring.response_cache import ResponseCache
+
+        cache = ResponseCache(temp_dir / "judge.sqlite", max_bytes=100)
+        cache.put("a", {"reasoning": "x" * 30})
+        cache.put("b", {"reasoning": "x" * 30})
+        assert cache.get("a") is not None  # a is now more recently used than b
+        cache.put("c", {"reasoning": "x" * 30})
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("c") is not None
+
+    @pytest.mark.unit
+    def test_failed_calls_not_cached(self, judge, temp_dir):
+        """API failures are retried on the next request."""
+        scorer, completions = judge()
+        config = {"response_cache": {"path": str(temp_dir / "judge.sqlite")}}
+        completions.create = lambda **kwargs: (_ for _ in ()).throw(ValueError("bad json"))
+
+        result = scorer.score(make_item(), config)
+        assert "failed" in result.reasoning
+
+        assert scorer._response_cache_for(config).stats["stores"] == 0
+
+    @pytest.mark.unit
+    def test_summary_reports_hits(self, sample_otel_trace, temp_dir, judge, monkeypatch):
+        """Batch summary_stats carry the response cache hit/miss counts."""
+        from core import evaluation
+
+        scorer, completions = judge()
+        monkeypatch.setattr(evaluation, "create_scorer", lambda stage: scorer)
+        pack = temp_dir / "pack.yaml"
+        pack.write_text(f"""
+name: "Cached Pack"
+ingestion:
+  type: "generic_otel"
+  config:
+    evaluation_mode: "span"
+pipeline:
+  - name: "judge"
+    scorer: "llm_judge"
+    config:
+      user_prompt_template: "Is this fine?"
+      response_cache:
+        path: "{temp_dir / 'judge.sqlite'}"
+""")
+        batch = evaluation.run_evaluation_batch(sample_otel_trace, str(pack))
+
+        assert len(completions.requests) == 1
+        assert batch.summary_stats["response_cache"] == {"hits": 3, "misses": 1}
+
+
+class StubOpenAIServer:
+    """
+    Local stand-in for the OpenAI files and batches endpoints.
+
+    Batches finish on the second status poll. Each request is judged with
+    score 0.9, except prompts containing FAIL_REQUEST, which get a per-line
+    error, and prompts containing LOW, which score 0.1.
+    """
+
+    def __init__(self, final_status="completed"):
+        self.final_status = final_status
+        self.files = {}
+        self.batches = {}
+        self.uploaded_lines = []
+        self.polls = 0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def send_json(self, payload, status=200):
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                if self.path == "/v1/files":
+                    self.send_json(stub.upload(body, self.headers["Content-Type"]))
+                elif self.path == "/v1/batches":
+                    self.send_json(stub.create_batch(json.loads(body)))
+                elif self.path.endswith("/cancel"):
+                    batch = stub.batches[self.path.split("/")[3]]
+                    batch["status"] = "cancelled"
+                    self.send_json(batch)
+                else:
+                    self.send_json({"error": {"message": "not found"}}, 404)
+
+            def do_GET(self):
+                parts = self.path.split("/")
+                if self.path.startswith("/v1/batches/"):
+                    self.send_json(stub.poll(parts[3]))
+                elif self.path.startswith("/v1/files/") and self.path.endswith("/content"):
+                    content = stub.files[parts[3]].encode("utf-8")
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/octet-stream")
+                    self.send_header("Content-Length", str(len(content)))
+                    self.end_headers()
+                    self.wfile.write(content)
+                else:
+                    self.send_json({"error": {"message": "not found"}}, 404)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True)
+        self.thread.start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}/v1"
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def upload(self, body, content_type):
+        boundary = content_type.split("boundary=")[1].encode("utf-8")
+        for part in body.split(b"--" + boundary):
+            if b'name="file"' in part:
+                content = part.split(b"\r\n\r\n", 1)[1].rsplit(b"\r\n", 1)[0].decode("utf-8")
+        file_id = f"file-{len(self.files)}"
+        self.files[file_id] = content
+        self.uploaded_lines.extend(json.loads(line) for line in content.splitlines() if line)
+        return {"id": file_id, "object": "file", "bytes": len(content), "created_at": 0,
+                "filename": "batch.jsonl", "purpose": "batch", "status": "processed"}
+
+    def create_batch(self, params):
+        batch_id = f"batch-{len(self.batches)}"
+        self.batches[batch_id] = {
+            "id": batch_id, "object": "batch", "endpoint": params["endpoint"],
+            "input_file_id": params["input_file_id"], "completion_window": params["completion_window"],
+            "status": "validating", "created_at": 0,
+        }
+        return self.batches[batch_id]
+
+    def poll(self, batch_id):
+        self.polls += 1
+        batch = self.batches[batch_id]
+        if batch["status"] == "validating":
+            batch["status"] = "in_progress"
+        elif batch["status"] == "in_progress":
+            batch["status"] = self.final_status
+            if self.final_status == "completed":
+                self.finish(batch)
+        return batch
+
+    def finish(self, batch):
+        outputs, errors = [], []
+        for line in self.files[batch["input_file_id"]].splitlines():
+            request = json.loads(line)
+            prompt = request["body"]["messages"][1]["content"]
+            if "FAIL_REQUEST" in prompt:
+                errors.append({"custom_id": request["custom_id"], "response": None,
+                               "error": {"code": "invalid_request", "message": "rejected by stub"}})
+                continue
+            verdict = {"score": 0.1 if "LOW" in prompt else 0.9, "reasoning": f"judged {prompt}"}
+            outputs.append({"custom_id": request["custom_id"], "error": None, "response": {
+                "status_code": 200,
+                "body": {"choices": [{"message": {"role": "assistant", "content": json.dumps(verdict)}}]},
+            }})
+        batch["output_file_id"] = f"file-{len(self.files)}"
+        self.files[batch["output_file_id"]] = "\n".join(json.dumps(o) for o in outputs)
+        if errors:
+            batch["error_file_id"] = f"file-{len(self.files)}"
+            self.files[batch["error_file_id"]] = "\n".join(json.dumps(e) for e in errors)
+
+
+@pytest.fixture
+def batch_judge(monkeypatch):
+    """An LLMJudgeScorer whose client talks to a StubOpenAIServer."""
+    from openai import OpenAI
+    from core.scoring.llm_judge import LLMJudgeScorer
+
+    servers = []
+
+    def build(**server_kwargs):
+        server = StubOpenAIServer(**server_kwargs)
+        servers.append(server)
+        monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+        scorer = LLMJudgeScorer()
+        scorer.client = OpenAI(api_key="sk-test", base_url=server.base_url, max_retries=0)
+        return scorer, server
+
+    yield build
+    for server in servers:
+        server.close()
+
+
+BATCH_CONFIG = {"judge_mode": "batch", "batch_poll_seconds": 0, "threshold": 0.5}
+
+
+class TestBatchJudge:
+    """Tests for the Batch API judge mode."""
+
+    @pytest.mark.unit
+    def test_results_map_back_to_items(self, batch_judge):
+        """Every item gets the verdict for its own request, in item order."""
+        scorer, server = batch_judge()
+        items = [make_item("a", "first"), make_item("b", "LOW second"), make_item("c", "first")]
+
+        results = scorer.score_batch(items, BATCH_CONFIG)
+
+        assert [r.passed for r in results] == [True, False, True]
+        assert results[1].reasoning == "judged LOW second"
+        # Identical requests are sent once
+        assert len(server.uploaded_lines) == 2
+        assert server.uploaded_lines[0]["url"] == "/v1/chat/completions"
+        assert server.polls == 2
+
+    @pytest.mark.unit
+    def test_per_request_errors(self, batch_judge):
+        """A failed line only fails its own item."""
+        scorer, _ = batch_judge()
+        items = [make_item("a", "fine"), make_item("b", "FAIL_REQUEST please")]
+
+        results = scorer.score_batch(items, BATCH_CONFIG)
+
+        assert results[0].passed
+        assert not results[1].passed
+        assert "rejected by stub" in results[1].reasoning
+        assert results[1].raw_response["error"]
+
+    @pytest.mark.unit
+    def test_failed_batch_fails_all_items(self, batch_judge):
+        """A batch that does not complete yields error results, not exceptions."""
+        scorer, _ = batch_judge(final_status="expired")
+
+        results = scorer.score_batch([make_item("a"), make_item("b", "other")], BATCH_CONFIG)
+
+        assert all("expired" in r.reasoning for r in results)
+
+    @pytest.mark.unit
+    def test_pipeline_stage_uses_batch(self, sample_otel_trace, temp_dir, batch_judge, monkeypatch):
+        """A stage with judge_mode: batch scores through one batch job."""
+        from core import evaluation
+
+        scorer, server = batch_judge()
+        monkeypatch.setattr(evaluation, "create_scorer", lambda stage: scorer)
+        pack = temp_dir / "pack.yaml"
+        pack.write_text("""
+name: "Batch Pack"
+ingestion:
+  type: "generic_otel"
+  config:
+    evaluation_mode: "span"
+pipeline:
+  - name: "judge"
+    scorer: "llm_judge"
+    config:
+      judge_mode: "batch"
+      batch_poll_seconds: 0
+      threshold: 0.5
+""")
+        batch = evaluation.run_evaluation_batch(sample_otel_trace, str(pack))
+
+        assert len(server.batches) == 1
+        assert len(server.uploaded_lines) == 4
+        assert batch.summary_stats["status"] == "PASS"
+
+
+class TestTemplateRendering:
+    """Tests for compiled-template reuse and on-demand render context."""
+
+    @pytest.mark.unit
+    def test_template_compiled_once(self, judge, monkeypatch):
+        scorer, completions = judge()
+        parses = []
+        parse = scorer.jinja_env.parse
+        monkeypatch.setattr(scorer.jinja_env, "parse", lambda source: parses.append(source) or parse(source))
+        config = {"user_prompt_template": "Judge: {{ input }}"}
+
+        for i in range(5):
+            scorer.score(make_item(f"item_{i}", f"text {i}"), config)
+
+        assert parses == ["Judge: {{ input }}"]
+        assert completions.requests[4]["messages"][1]["content"] == "Judge: text 4"
+
+    @pytest.mark.unit
+    def test_only_referenced_variables_built(self, judge):
+        scorer, _ = judge()
+
+        _, variables = scorer._compile_template("{{ change_log }} / {{ metadata.user_prompt }}")
+
+        assert variables == {"change_log", "metadata"}
+
+    @pytest.mark.unit
+    def test_shortcuts_and_defaults(self, judge):
+        scorer, _ = judge()
+        item = EvaluationItem(id="t", input="x", metadata={"change_log": "added parser"})
+
+        rendered = scorer._render_template(
+            "{{ id }}|{{ change_log }}|{{ breaker_review }}|{{ otel_trace | tojson }}", item)
+
+        assert rendered == "t|added parser|No breaker review found|[]"
+
+    @pytest.mark.unit
+    def test_shared_trace_context_resolves(self, judge):
+        """Shortcuts and `metadata` read through to an item's shared trace context."""
+        from core.data_models import PreparedItem
+        from core.trace_context import TraceContext
+
+        scorer, _ = judge()
+        context = TraceContext({"change_log": "added parser", "approvals": ["cc"]})
+        item = PreparedItem(id="t", input="x", metadata=context.metadata({"span_name": "cc.turn"}))
+
+        rendered = scorer._render_template("{{ change_log }}|{{ metadata | tojson }}", item)
+
+        shortcut, metadata = rendered.split("|", 1)
+        assert shortcut == "added parser"
+        assert json.loads(metadata) == {"span_name": "cc.turn", "change_log": "added parser",
+                                        "approvals": ["cc"]}
+
+
+class TestSerialization:
+    """Tests for compact and tabular prompt serialization."""
+
+    SPANS = [{"name": "a", "agent": "cc", "startTime": "1"}, {"name": "b", "agent": "codex"}]
+
+    @pytest.mark.unit
+    def test_formats_round_trip(self):
+        from core.serialization import serialize
+
+        assert json.loads(serialize(self.SPANS, "indent")) == self.SPANS
+        assert json.loads(serialize(self.SPANS, "compact")) == self.SPANS
+        assert " " not in serialize(self.SPANS, "compact")
+        assert json.loads(serialize(self.SPANS, "table")) == {
+            "columns": ["name", "agent", "startTime"],
+            "rows": [["a", "cc", "1"], ["b", "codex", None]],
+        }
+        assert serialize({"k": [1, 2]}, "table") == '{"k":[1,2]}'
+
+    @pytest.mark.unit
+    def test_unknown_format_rejected(self):
+        from core.serialization import serialize
+
+        with pytest.raises(ValueError, match="Unknown serialization"):
+            serialize(self.SPANS, "yaml")
+
+    @pytest.mark.unit
+    def test_tojson_follows_stage_format(self, judge):
+        scorer, completions = judge()
+        item = EvaluationItem(id="t", input="x", metadata={"otel_trace": self.SPANS})
+
+        result = scorer.score(item, {"user_prompt_template": "{{ otel_trace | tojson }}",
+                                     "serialization": "compact"})
+
+        assert completions.requests[0]["messages"][1]["content"] == serialize_compact(self.SPANS)
+        size = result.details["serialization"]
+        assert size["format"] == "compact"
+        assert size["chars"] < size["indent_chars"]
+
+    @pytest.mark.unit
+    def test_pack_serialization_and_savings(self, sample_otel_trace, temp_dir, judge, monkeypatch):
+        """A pack-level format applies to the trace input and the summary reports savings."""
+        from core import evaluation
+
+        scorer, completions = judge()
+        monkeypatch.setattr(evaluation, "create_scorer", lambda stage: scorer)
+        pack = temp_dir / "pack.yaml"
+        pack.write_text("""
+name: "Table Pack"
+ingestion:
+  type: "generic_otel"
+  config:
+    evaluation_mode: "trace"
+    serialization: "table"
+pipeline:
+  - name: "judge"
+    scorer: "llm_judge"
+    config:
+      user_prompt_template: "{{ input }} {{ otel_trace | tojson }}"
+""")
+        batch = evaluation.run_evaluation_batch(sample_otel_trace, str(pack))
+
+        sent = completions.requests[0]["messages"][1]["content"]
+        assert sent.startswith('{"columns":["name","spanId","startTime","endTime","agent","content"]')
+        savings = batch.summary_stats["serialization"]
+        assert savings["format"] == "table"
+        assert savings["saved_chars"] == savings["indent_chars"] - savings["chars"] > 0
+        assert savings["saved_tokens_estimate"] > 0
+
+
+    @pytest.mark.unit
+    def test_input_tally_uses_item_flag(self, judge, monkeypatch):
+        """Rendering a trace-level input tallies it without serializing the trace again."""
+        from core.scoring import llm_judge
+        from core.serialization import SerializationTally
+
+        scorer, _ = judge()
+        item = EvaluationItem(id="t", input=serialize_compact(self.SPANS),
+                              metadata={"otel_trace": self.SPANS}, input_serialization="compact")
+        calls = []
+        monkeypatch.setattr(llm_judge, "serialize", lambda *args: calls.append(args))
+
+        tally = SerializationTally("compact")
+        assert scorer._render_template("{{ input }}", item, tally) == item.input
+        assert calls == []
+        assert tally.details()["chars"] == len(item.input)
+
+        # A plain item whose input happens to match is not tallied
+        plain = EvaluationItem(id="p", input=item.input, metadata={"otel_trace": self.SPANS})
+        tally = SerializationTally("compact")
+        scorer._render_template("{{ input }}", plain, tally)
+        assert tally.details() == {}
+
+
+def serialize_compact(value):
+    return json.dumps(value, separators=(",", ":"))
+
+
+TIMELINE = [
+    {"name": "drafter.turn", "agent": "drafter", "startTime": "100", "endTime": "150", "content": "v1"},
+    {"name": "reviewer.review", "agent": "reviewer", "startTime": "200", "endTime": "250",
+     "content": "APPROVE", "tokens": "40"},
+    {"name": "breaker.review", "agent": "breaker", "startTime": "210", "endTime": "290", "tokens": 60},
+    {"name": "drafter.revision", "agent": "drafter", "startTime": "300", "endTime": "350", "tokens": "n/a"},
+]
+
+
+def make_timeline_item(timeline=TIMELINE, **metadata):
+    return EvaluationItem(id="trace_evaluation", input=json.dumps(timeline),
+                          metadata={"otel_trace": timeline, **metadata})
+
+
+class TestRuleBasedScorers:
+    """Tests for the deterministic rule scorers and the LLM precheck."""
+
+    @pytest.mark.unit
+    def test_timestamp_order(self):
+        from core.scoring.rule_based import TimestampOrderScorer
+
+        scorer = TimestampOrderScorer()
+        phases = {"before": {"name": "review"}, "after": {"name": "revision"}}
+
+        assert scorer.score(make_timeline_item(), {}).passed
+        assert scorer.score(make_timeline_item(), phases).passed
+        late = [dict(span) for span in TIMELINE]
+        late[2]["endTime"] = "320"
+        result = scorer.score(make_timeline_item(late), phases)
+        assert not result.passed
+        assert result.details["determined"]
+        assert "'breaker.review' ended after 'drafter.revision'" in result.reasoning
+        missing = scorer.score(make_timeline_item(), {"before": {"name": "review"}, "after": {"name": "deploy"}})
+        assert not missing.passed
+        assert not missing.details["determined"]
+
+    @pytest.mark.unit
+    def test_attribute_aggregate(self):
+        from core.scoring.rule_based import AttributeAggregateScorer
+
+        scorer = AttributeAggregateScorer()
+
+        result = scorer.score(make_timeline_item(), {"field": "tokens", "max": 100})
+        assert result.passed
+        assert result.details["value"] == 100.0
+        assert result.details["values"] == 2
+        assert not scorer.score(make_timeline_item(), {"field": "tokens", "op": "mean", "min": 60}).passed
+        assert not scorer.score(make_timeline_item(), {"field": "cost"}).details["determined"]
+        with pytest.raises(ValueError, match="Unknown aggregate op"):
+            scorer.score(make_timeline_item(), {"field": "tokens", "op": "median"})
+
+    @pytest.mark.unit
+    def test_metadata_assertion(self):
+        from core.scoring.rule_based import MetadataAssertionScorer
+
+        scorer = MetadataAssertionScorer()
+        item = make_timeline_item(all_approved=True, data_quality={"status": "ok"})
+
+        assert scorer.score(item, {"field": "all_approved"}).passed
+        assert scorer.score(item, {"field": "metadata.data_quality.status", "equals": "ok"}).passed
+        assert not scorer.score(item, {"field": "data_quality.status", "in": ["partial"]}).passed
+        assert not scorer.score(item, {"field": "approvals"}).details["determined"]
+
+    @pytest.mark.unit
+    def test_regex_presence(self):
+        from core.scoring.rule_based import RegexPresenceScorer
+
+        scorer = RegexPresenceScorer()
+        item = make_timeline_item()
+
+        assert scorer.score(item, {"pattern": "approve"}).passed
+        assert not scorer.score(item, {"pattern": "approve", "case_sensitive": True}).passed
+        assert scorer.score(item, {"pattern": "REQUEST_CHANGES", "field": "otel_trace", "expect": "absent"}).passed
+
+    @pytest.mark.unit
+    def test_rule_stage_in_pipeline(self, sample_otel_trace, temp_dir):
+        """Rule scorers run from pack YAML without an API key."""
+        from core import evaluation
+
+        pack = temp_dir / "pack.yaml"
+        pack.write_text("""
+name: "Rule Pack"
+ingestion:
+  type: "generic_otel"
+  config:
+    evaluation_mode: "trace"
+pipeline:
+  - name: "ordered"
+    scorer: "timestamp_order"
+  - name: "approved"
+    scorer: "metadata_assertion"
+    config:
+      field: "all_approved"
+""")
+        batch = evaluation.run_evaluation_batch(sample_otel_trace, str(pack))
+
+        assert batch.summary_stats["status"] == "PASS"
+        assert [s.scorer_name for s in batch.items[0].scores] == ["timestamp_order", "metadata_assertion"]
+
+    @pytest.mark.unit
+    def test_precheck_skips_llm(self, judge):
+        from core.scoring.rule_based import PrecheckScorer
+
+        scorer, completions = judge()
+        precheck = PrecheckScorer({"scorer": "metadata_assertion", "config": {"field": "all_approved"},
+                                   "skip_llm_on": ["pass"]}, lambda: scorer)
+
+        decided = precheck.score(make_timeline_item(all_approved=True), {})
+        judged = precheck.score(make_timeline_item(all_approved=False), {})
+
+        assert decided.passed and decided.details["precheck"]
+        assert judged.scorer_name == "llm_judge"
+        assert len(completions.requests) == 1
+
+    @pytest.mark.unit
+    def test_review_timing_precheck_only_short_circuits_fails(self, judge):
+        """The shipped review_timing precheck fails misordered traces but leaves passes to the judge."""
+        import yaml
+        from core import evaluation
+        from core.scoring.rule_based import PrecheckScorer
+
+        pack = yaml.safe_load((evaluation.DEFAULT_PACK_DIR / "review_timing.yaml").read_text())
+        scorer, completions = judge()
+        precheck = PrecheckScorer(pack["pipeline"][0]["config"]["precheck"], lambda: scorer)
+        late_review = [dict(span) for span in TIMELINE]
+        late_review[3]["startTime"] = "260"
+
+        judged = precheck.score(make_timeline_item(), {})
+        decided = precheck.score(make_timeline_item(late_review), {})
+
+        assert judged.scorer_name == "llm_judge"
+        assert not decided.passed and decided.details["precheck"]
+        assert "'breaker.review' ended after 'drafter.revision' started" in decided.reasoning
+        assert len(completions.requests) == 1
+
+    @pytest.mark.unit
+    def test_precheck_never_builds_judge_when_decided(self, sample_otel_trace, temp_dir, monkeypatch):
+        from core import evaluation
+
+        monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+        pack = temp_dir / "pack.yaml"
+        pack.write_text("""
+name: "Prechecked Pack"
+ingestion:
+  type: "generic_otel"
+  config:
+    evaluation_mode: "trace"
+pipeline:
+  - name: "judge"
+    scorer: "llm_judge"
+    config:
+      precheck:
+        scorer: "regex_presence"
+        config: {pattern: "BREAKER REVIEW"}
+""")
+        batch = evaluation.run_evaluation_batch(sample_otel_trace, str(pack))
+
+        assert batch.items[0].scores[0].scorer_name == "regex_presence"
+        assert batch.summary_stats["status"] == "PASS"
+
+    @pytest.mark.unit
+    def test_invalid_precheck(self):
+        from core.scoring.rule_based import PrecheckScorer
+
+        with pytest.raises(ValueError, match="Invalid precheck"):
+            PrecheckScorer({"scorer": "llm_judge"}, lambda: None)
+
+
+class TestScorerRegistry:
+    """Tests for scorer registration, entry points and lazy imports."""
+
+    @pytest.fixture
+    def registry(self, monkeypatch):
+        from core.scoring import registry
+        monkeypatch.setattr(registry, "_registry", dict(registry._registry))
+        return registry
+
+    @pytest.mark.unit
+    def test_decorated_scorer_runs_from_pack(self, registry, sample_otel_trace, temp_dir):
+        from core import evaluation
+        from core.data_models import ScorerResult
+
+        @registry.register_scorer("always_pass")
+        class AlwaysPass:
+            def score(self, item, config):
+                return ScorerResult(scorer_name="always_pass", numeric_score=1.0, passed=True)
+
+        pack = temp_dir / "pack.yaml"
+        pack.write_text("""
+name: "Plugin Pack"
+ingestion:
+  type: "generic_otel"
+  config:
+    evaluation_mode: "trace"
+pipeline:
+  - name: "plugin"
+    scorer: "always_pass"
+""")
+        batch = evaluation.run_evaluation_batch(sample_otel_trace, str(pack))
+
+        assert batch.items[0].scores[0].scorer_name == "always_pass"
+        assert "always_pass" in registry.available_scorers()
+
+    @pytest.mark.unit
+    def test_entry_point_scorer(self, registry, monkeypatch):
+        from importlib.metadata import EntryPoint
+
+        entry_point = EntryPoint(name="pattern_check", group=registry.ENTRY_POINT_GROUP,
+                                 value="core.scoring.rule_based:RegexPresenceScorer")
+        monkeypatch.setattr(registry, "_entry_points", lambda: [entry_point])
+
+        assert "pattern_check" in registry.available_scorers()
+        assert registry.get_scorer_class("pattern_check").__name__ == "RegexPresenceScorer"
+
+    @pytest.mark.unit
+    def test_duplicate_and_unknown_names(self, registry, monkeypatch):
+        monkeypatch.setattr(registry, "_entry_points", lambda: [])
+
+        with pytest.raises(ValueError, match="already registered"):
+            registry.register_scorer("regex_presence")(type("Other", (), {}))
+        with pytest.raises(ValueError, match="Unknown scorer: nope"):
+            registry.get_scorer_class("nope")
+
+    @pytest.mark.unit
+    def test_engine_import_skips_openai(self):
+        """Importing the engine and running rule scorers does not load the judge's SDKs."""
+        import subprocess
+
+        code = ("import sys; import core.evaluation; "
+                "from core.scoring.registry import get_scorer_class; get_scorer_class('timestamp_order'); "
+                "print(sorted(m for m in ('openai', 'tenacity', 'jinja2') if m in sys.modules))")
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                             cwd=REPO_ROOT / "corpbot_agent_evals" / "lake_merritt")
+
+        assert out.stdout.strip() == "[]"
+
+
+def make_trace_item(span_count=200, content_chars=500):
+    """A trace-level item like evaluation.create_trace_level_item builds."""
+    trace = [{
+        "name": f"step_{i}",
+        "spanId": f"span{i:04d}",
+        "startTime": str(1000 + i),
+        "endTime": str(1001 + i),
+        "agent": "cc" if i % 3 else "codex",
+        "content": (f"span {i} " + "x" * content_chars)[:content_chars],
+    } for i in range(span_count)]
+    return EvaluationItem(id="trace_summary", input=json.dumps(trace, indent=2),
+                          metadata={"otel_trace": trace}, input_serialization="indent")
+
+
+class TestPromptBudget:
+    """Tests for token budgeting and trace compaction of judge prompts."""
+
+    @pytest.mark.unit
+    def test_repeated_content_is_referenced(self):
+        from core.scoring.prompt_budget import COMPACTION_LEVELS, compact_trace
+
+        trace = [
+            {"name": "a", "spanId": "s1", "agent": "cc", "content": "same output"},
+            {"name": "b", "spanId": "s2", "agent": "cc", "content": "same output"},
+        ]
+
+        compacted = compact_trace(trace, COMPACTION_LEVELS[0])
+
+        assert compacted[0]["content"] == "same output"
+        assert compacted[1]["content"] == "[same as span s1]"
+        assert trace[1]["content"] == "same output"
+
+    @pytest.mark.unit
+    def test_timestamps_and_agents_kept_at_every_level(self):
+        from core.scoring.prompt_budget import iter_compactions
+
+        trace = make_trace_item(span_count=40).metadata["otel_trace"]
+
+        for compacted in iter_compactions(trace):
+            assert compacted[0] == trace[0]
+            assert compacted[-1] == trace[-1]
+            assert compacted[0]["startTime"] == trace[0]["startTime"]
+            assert compacted[-1]["endTime"] == trace[-1]["endTime"]
+            assert {entry["agent"] for entry in compacted} == {"cc", "codex"}
+            assert all(entry["startTime"] and entry["endTime"] for entry in compacted)
+
+    @pytest.mark.unit
+    def test_merged_runs_cover_their_spans(self):
+        from core.scoring.prompt_budget import merge_agent_runs
+
+        spans = [
+            {"name": "read", "spanId": "1", "startTime": "1", "endTime": "2", "agent": "cc", "content": ""},
+            {"name": "read", "spanId": "2", "startTime": "3", "endTime": "4", "agent": "cc", "content": ""},
+            {"name": "review", "spanId": "3", "startTime": "5", "endTime": "6", "agent": "codex", "content": ""},
+        ]
+
+        merged = merge_agent_runs(spans)
+
+        assert merged[0] == {"name": "read (x2)", "startTime": "1", "endTime": "4", "agent": "cc",
+                             "content": "", "spanCount": 2}
+        assert merged[1] == spans[2]
+
+    @pytest.mark.unit
+    def test_large_trace_is_compacted_and_judged(self, judge):
+        """An over-budget trace prompt is compacted to fit and still sent to the judge."""
+        scorer, completions = judge()
+        item = make_trace_item()
+        config = {"user_prompt_template": "{{ otel_trace | tojson }}", "max_prompt_tokens": 8000}
+
+        result = scorer.score(item, config)
+
+        assert result.passed
+        assert len(completions.requests) == 1
+        compaction = result.details["compaction"]
+        assert compaction["original_tokens"] > 8000 >= compaction["prompt_tokens"]
+        assert compaction["spans"] == 200
+        sent = completions.requests[0]["messages"][1]["content"]
+        assert item.metadata["otel_trace"][0]["content"] in sent
+        assert '"startTime": "1199"' in sent
+        # The scored item itself is not modified
+        assert len(json.loads(item.input)) == 200
+
+    @pytest.mark.unit
+    def test_input_template_is_compacted_too(self, judge):
+        scorer, completions = judge()
+
+        result = scorer.score(make_trace_item(), {"max_prompt_tokens": 8000})
+
+        assert result.details["compaction"]["prompt_tokens"] <= 8000
+        assert len(completions.requests) == 1
+
+    @pytest.mark.unit
+    def test_input_compacted_when_stage_overrides_format(self, judge):
+        """A stage format other than the input's still compacts the input, in the input's format."""
+        scorer, completions = judge()
+
+        result = scorer.score(make_trace_item(), {"max_prompt_tokens": 8000, "serialization": "compact"})
+
+        assert result.details["compaction"]["prompt_tokens"] <= 8000
+        sent = completions.requests[0]["messages"][1]["content"]
+        assert len(json.loads(sent)) < 200
+        assert sent.startswith("[\n  {")
+
+    @pytest.mark.unit
+    def test_small_prompt_is_not_compacted(self, judge):
+        scorer, _ = judge()
+
+        result = scorer.score(make_trace_item(span_count=3), {"user_prompt_template": "{{ otel_trace | tojson }}"})
+
+        assert "compaction" not in result.details
+
+    @pytest.mark.unit
+    def test_fails_when_still_over_budget(self, judge):
+        scorer, completions = judge()
+
+        result = scorer.score(make_trace_item(), {"max_prompt_tokens": 50})
+
+        assert not result.passed
+        assert result.raw_response["error"] == "prompt_too_large"
+        assert result.details["compaction"]["level"] == 5
+        assert completions.requests == []
+
+
+class FakeClock:
+    """Deterministic clock whose sleep advances time."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+class TestRateLimiter:
+    """Tests for the shared RPM/TPM token-bucket limiter."""
+
+    @staticmethod
+    def limiter(clock, **kwargs):
+        from core.scoring.rate_limiter import RateLimiter
+        kwargs.setdefault("headroom", 1.0)
+        kwargs.setdefault("state_file", None)
+        return RateLimiter(clock=clock.time, sleep=clock.sleep, **kwargs)
+
+    @pytest.mark.unit
+    def test_paces_requests_per_minute(self):
+        """A full minute of requests passes at once; the next waits for a refill."""
+        clock = FakeClock()
+        limiter = self.limiter(clock, requests_per_minute=60)
+
+        waits = [limiter.acquire() for _ in range(61)]
+
+        assert waits[:60] == [0.0] * 60
+        assert waits[60] == pytest.approx(1.0)
+
+    @pytest.mark.unit
+    def test_paces_tokens_per_minute(self):
+        """Token budget is enforced alongside requests."""
+        clock = FakeClock()
+        limiter = self.limiter(clock, requests_per_minute=1000, tokens_per_minute=6000)
+
+        assert limiter.acquire(tokens=6000) == 0.0
+        assert limiter.acquire(tokens=600) == pytest.approx(6.0)
+
+    @pytest.mark.unit
+    def test_settle_refunds_overestimates(self):
+        """Real usage below the estimate returns tokens to the bucket."""
+        clock = FakeClock()
+        limiter = self.limiter(clock, tokens_per_minute=1000)
+
+        limiter.acquire(tokens=1000)
+        limiter.settle(estimated_tokens=1000, actual_tokens=400)
+
+        assert limiter.acquire(tokens=600) == 0.0
+
+    @pytest.mark.unit
+    def test_retry_after_pauses_callers(self):
+        """penalize() blocks the next acquire for the Retry-After period."""
+        clock = FakeClock()
+        limiter = self.limiter(clock, requests_per_minute=6000)
+
+        limiter.penalize(5.0)
+
+        assert limiter.acquire() >= 5.0
+
+    @pytest.mark.unit
+    def test_state_file_shared_between_limiters(self, temp_dir):
+        """Limiters on one state file (as in separate processes) share the budget."""
+        clock = FakeClock()
+        state_file = temp_dir / "rate_limit.json"
+        first = self.limiter(clock, requests_per_minute=60, state_file=state_file)
+        second = self.limiter(clock, requests_per_minute=60, state_file=state_file)
+
+        for _ in range(60):
+            first.acquire()
+
+        assert second.acquire() == pytest.approx(1.0)
+
+    @pytest.mark.unit
+    def test_state_file_across_processes(self, temp_dir):
+        """Processes drawing from one state file never exceed its budget together."""
+        import multiprocessing
+
+        state_file = temp_dir / "rate_limit.json"
+        ctx = multiprocessing.get_context("fork")
+        with ctx.Pool(3) as pool:
+            granted = pool.starmap(_acquire_without_waiting, [(str(state_file), 10)] * 3)
+
+        # 30 attempts against a budget of 20 per minute (plus any refill while running)
+        assert 20 <= sum(granted) <= 22
+
+    @pytest.mark.unit
+    def test_judge_honors_retry_after(self, judge, monkeypatch):
+        """A 429 pauses the shared limiter and retries after Retry-After, not a backoff guess."""
+        import openai
+        from core.scoring import rate_limiter
+
+        monkeypatch.setattr(rate_limiter, "_shared_limiters", {})
+        scorer, completions = judge()
+        real_create = completions.create
+        calls = []
+
+        def flaky_create(**kwargs):
+            calls.append(kwargs)
+            if len(calls) == 1:
+                response = SimpleNamespace(status_code=429, headers={"retry-after": "0.01"}, request=None)
+                raise openai.RateLimitError("slow down", response=response, body=None)
+            return real_create(**kwargs)
+
+        completions.create = flaky_create
+        config = {"rate_limit": {"requests_per_minute": 6000, "state_file": None}}
+
+        result = scorer.score(make_item(), config)
+
+        assert result.passed
+        assert len(calls) == 2
+        limiter = rate_limiter.shared_rate_limiter(config["rate_limit"])
+        assert limiter.stats["penalties"] == 1
+        assert limiter.stats["acquired"] == 2
+
+
+class TestJudgeInstrumentation:
+    """Tests for per-call judge timings, retries and token usage (ScorerResult.timings)."""
+
+    @pytest.mark.unit
+    def test_records_latency_retries_and_usage(self, judge, monkeypatch):
+        """Each call reports its latency, attempts and the token usage the API returned."""
+        import openai
+        from core.scoring import rate_limiter
+
+        monkeypatch.setattr(rate_limiter, "_shared_limiters", {})
+        scorer, completions = judge()
+        real_create = completions.create
+        calls = []
+
+        def flaky_create(**kwargs):
+            calls.append(kwargs)
+            if len(calls) == 1:
+                response = SimpleNamespace(status_code=429, headers={"retry-after": "0.01"}, request=None)
+                raise openai.RateLimitError("slow down", response=response, body=None)
+            response = real_create(**kwargs)
+            response.usage = SimpleNamespace(prompt_tokens=120, completion_tokens=30, total_tokens=150)
+            return response
+
+        completions.create = flaky_create
+        result = scorer.score(make_item(), {"rate_limit": {"requests_per_minute": 6000, "state_file": None}})
+
+        timings = result.timings
+        assert timings["attempts"] == 2
+        assert timings["latency_seconds"] >= 0.01
+        assert timings["render_seconds"] >= 0
+        assert (timings["prompt_tokens"], timings["completion_tokens"], timings["total_tokens"]) == (120, 30, 150)
+        assert result.details == {}
+
+    @pytest.mark.unit
+    def test_cache_hits_make_no_call(self, judge, temp_dir):
+        """A cached response reports rendering only."""
+        scorer, _ = judge()
+        config = {"response_cache": {"path": str(temp_dir / "judge.sqlite")}}
+
+        scorer.score(make_item(), config)
+        hit = scorer.score(make_item(), config)
+
+        assert "render_seconds" in hit.timings
+        assert "latency_seconds" not in hit.timings
+
+    @pytest.mark.unit
+    def test_failed_calls_keep_their_attempts(self, judge, monkeypatch):
+        """Calls that fail after retries still report how many attempts they made."""
+        import openai
+        from core.scoring import llm_judge
+
+        scorer, completions = judge()
+
+        def failing_create(**kwargs):
+            raise openai.APIConnectionError(request=None)
+
+        completions.create = failing_create
+        monkeypatch.setattr(llm_judge.LLMJudgeScorer._call_api_with_retry.retry, "wait",
+                            lambda retry_state: 0)
+        result = scorer.score(make_item(), {})
+
+        assert not result.passed
+        assert result.timings["attempts"] == llm_judge.MAX_RETRIES
+
+
+class _WouldWait(Exception):
+    pass
+
+
+def _raise_would_wait(seconds):
+    raise _WouldWait()
+
+
+def _acquire_without_waiting(state_file, count):
+    """Pool worker: try `count` acquires on a 20 RPM limiter; return how many were granted."""
+    from core.scoring.rate_limiter import RateLimiter
+
+    limiter = RateLimiter(requests_per_minute=20, headroom=1.0, state_file=state_file,
+                          sleep=_raise_would_wait)
+    granted = 0
+    for _ in range(count):
+        try:
+            limiter.acquire()
+            granted += 1
+        except _WouldWait:
+            pass
+    return granted